@@ -0,0 +1 @@
+"""Benchmarks reproducibles de los caminos calientes (ver benchmarks/run.py)."""
@@ -0,0 +1,273 @@
+"""Benchmarks reproducibles del solver, las trayectorias y el render.
+
+Casos: escenario base, las tres misiones del modo juego, barridos de dt_sim,
+dt_delay y dtheta_deg, salvas de N atacantes (en bloque y como bucle de llamadas
+sueltas), la lectura en flujo de escenarios (registros completos y planos) y el coste
+por frame (blitting) de animate_rich con backend Agg.
+Cada caso se repite varias veces y se guarda la mediana (y el mínimo) en JSON;
+con --compare se contrasta contra un JSON guardado y se marcan las regresiones.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run -o bench.json
+    python -m benchmarks.run --compare bench.json [--threshold 0.15] [-k solve/]
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import argparse
+import copy
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from misiles.core.physics import deg2rad
+from misiles.core.springs import Spring
+from misiles.core.trajectories import defender_trajectory, generate_trajectory
+from misiles.core.intercept import solve_intercept_continuous, solve_intercept_enumeration
+from misiles.core.salvo import solve_salvo_launches
+from misiles.solve import attacker_launch, intercept_params, load_scenario_file, solve_scenario
+from misiles.ui.game_mode import MISSIONS
+from misiles.ui.params import Scenario, parse_scenario_lines
+from misiles.ui.viz_rich import TrajData, prepare_animation
+
+SWEEPS = {
+    'dt_sim': (0.02, 0.01, 0.005),
+    'dt_delay': (0.1, 0.05, 0.025),
+    'dtheta_deg': (1.0, 0.5, 0.25),
+}
+RENDER_FRAMES = 60  # frames muestreados (equiespaciados) por medición de render
+LOAD_RECORDS = 1000  # líneas JSONL por medición de lectura de escenarios
+SALVO_SIZES = (10, 50, 200)  # atacantes por salva (frente al bucle de llamadas sueltas)
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], Any]
+    per: int = 1  # operaciones por llamada (los tiempos se dan por operación)
+    teardown: Optional[Callable[[], None]] = None
+
+
+def _attacker(scen: Scenario):
+    sp = scen.attacker.spring
+    v0_a = Spring(k=sp.k, x=sp.x, m=sp.m).v0
+    theta_a = deg2rad(scen.attacker.theta_deg or 45.0)
+    return generate_trajectory(scen.attacker.x0, scen.attacker.y0, v0_a, theta_a,
+                               dt=scen.globals.dt_sim, g=scen.globals.g)
+
+
+def _v0d_max(scen: Scenario) -> float:
+    sp = scen.defender.spring
+    return Spring(k=sp.k, x=sp.x, m=sp.m).v0_max
+
+
+def _salvo_launches(scen: Scenario, n: int):
+    # atacantes repartidos de forma determinista alrededor del atacante base
+    rng = np.random.default_rng(n)
+    return [attacker_launch(scen, {'x0': scen.attacker.x0 + dx, 'theta_deg': th, 'spring_x': sx})
+            for dx, th, sx in zip(rng.uniform(-30, 30, n), rng.uniform(25, 70, n),
+                                  rng.uniform(0.4, 0.6, n))]
+
+
+def _solve_each(launches, params, v0d_max: float) -> None:
+    for ls in launches:
+        traj = generate_trajectory(ls.x0, ls.y0, ls.v0, ls.theta, dt=params.dt_attacker, g=params.g)
+        solve_intercept_enumeration((traj.t, traj.x, traj.y), params, v0d_max)
+
+
+def _mission_scenario(base: Scenario, mission: Dict[str, Any]) -> Scenario:
+    scen = copy.deepcopy(base)
+    scen.defender.x0 = mission['def_x0']
+    return scen
+
+
+def _render_case(scen: Scenario) -> Case:
+    res = solve_scenario(scen)
+    traj_a, sol = res.trajectory, res.solution
+    attacker = TrajData(traj_a.t, traj_a.x, traj_a.y)
+    defender = None
+    impact = None
+    if sol is not None:
+        traj_d = defender_trajectory(scen.defender.x0, scen.defender.y0, sol.v0_d, sol.theta_d,
+                                     sol.delay, sol.impact_time, scen.globals.dt_sim, scen.globals.g)
+        defender = TrajData(traj_d.t, traj_d.x, traj_d.y)
+        impact = sol.impact_point
+    scene = prepare_animation(attacker, defender, impact, title='benchmark')
+    picks = np.linspace(0, scene.frames - 1, min(RENDER_FRAMES, scene.frames)).astype(int)
+
+    def run():
+        # Lo mismo que hace FuncAnimation (blit=True) en cada frame
+        for i in picks:
+            scene.blit_frame(int(i))
+
+    return Case('render/frame', run, per=len(picks), teardown=lambda: plt.close(scene.fig))
+
+
+def build_cases(scen: Scenario) -> Iterator[Case]:
+    """Casos en orden estable; se construyen de forma perezosa para poder filtrarlos."""
+    params = intercept_params(scen)
+    v0d_max = _v0d_max(scen)
+    traj = _attacker(scen)
+    txy = (traj.t, traj.x, traj.y)
+
+    yield Case('trajectory/baseline', lambda: _attacker(scen))
+    yield Case('solve/baseline', lambda: solve_intercept_enumeration(txy, params, v0d_max))
+    yield Case('solve/baseline_python',
+               lambda: solve_intercept_enumeration(txy, params, v0d_max, backend='python'))
+    launch = attacker_launch(scen)
+    yield Case('solve/continuous', lambda: solve_intercept_continuous(launch, params, v0d_max))
+    yield Case('scenario/baseline', lambda: solve_scenario(scen))
+
+    for k, m in enumerate(MISSIONS, start=1):
+        mscen = _mission_scenario(scen, m)
+        yield Case(f'scenario/mission{k}', lambda mscen=mscen, att=m['att']: solve_scenario(mscen, att))
+
+    for field, values in SWEEPS.items():
+        for v in values:
+            sscen = copy.deepcopy(scen)
+            setattr(sscen.globals, field, v)
+            yield Case(f'sweep/{field}={v:g}', lambda sscen=sscen: solve_scenario(sscen))
+
+    for n in SALVO_SIZES:
+        launches = _salvo_launches(scen, n)
+        yield Case(f'salvo/{n}', lambda launches=launches: solve_salvo_launches(launches, params, v0d_max),
+                   per=n)
+        yield Case(f'salvo/{n}_loop', lambda launches=launches: _solve_each(launches, params, v0d_max),
+                   per=n)
+
+    full = [json.dumps(asdict(scen))] * LOAD_RECORDS
+    flat = [json.dumps({'x0': 0.01 * i, 'theta_deg': 45.0}) for i in range(LOAD_RECORDS)]
+    yield Case('load/full', lambda: sum(1 for _ in parse_scenario_lines(full)), per=LOAD_RECORDS)
+    yield Case('load/flat', lambda: sum(1 for _ in parse_scenario_lines(flat, base=scen)),
+               per=LOAD_RECORDS)
+
+    yield Case('render/setup', lambda: plt.close(_render_setup(scen)))
+    yield _render_case(scen)
+
+
+def _render_setup(scen: Scenario):
+    traj = _attacker(scen)
+    return prepare_animation(TrajData(traj.t, traj.x, traj.y), None, None).fig
+
+
+def time_case(case: Case, repeat: int, min_time: float) -> Dict[str, Any]:
+    """Mide `repeat` veces; cada muestra agrupa llamadas hasta superar min_time segundos."""
+    case.run()  # calentamiento
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            case.run()
+        dt = time.perf_counter() - t0
+        if dt >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if dt <= 0 else max(2, min(10, int(min_time / dt) + 1))
+    samples = [dt / (number * case.per)]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            case.run()
+        samples.append((time.perf_counter() - t0) / (number * case.per))
+    if case.teardown is not None:
+        case.teardown()
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'mean': statistics.fmean(samples),
+        'repeat': repeat,
+        'number': number,
+        'per': case.per,
+    }
+
+
+def run_suite(scen: Scenario, repeat: int = 5, min_time: float = 0.05,
+              pattern: Optional[str] = None, verbose: bool = True) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in build_cases(scen):
+        if pattern and pattern not in case.name:
+            if case.teardown is not None:
+                case.teardown()
+            continue
+        results[case.name] = r = time_case(case, repeat, min_time)
+        if verbose:
+            print(f"{case.name:<28} {_fmt(r['median']):>10}  (min {_fmt(r['min'])})", flush=True)
+    return {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'min_time': min_time,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.15) -> List[str]:
+    """Imprime la comparación de medianas y devuelve los casos más lentos que base*(1+threshold)."""
+    regressions = []
+    base = baseline['results']
+    print(f"{'caso':<28} {'base':>10} {'actual':>10} {'ratio':>7}")
+    for name, r in current['results'].items():
+        if name not in base:
+            print(f"{name:<28} {'-':>10} {_fmt(r['median']):>10} {'nuevo':>7}")
+            continue
+        ratio = r['median'] / base[name]['median'] if base[name]['median'] > 0 else float('inf')
+        flag = ''
+        if ratio > 1.0 + threshold:
+            flag = '  REGRESIÓN'
+            regressions.append(name)
+        print(f"{name:<28} {_fmt(base[name]['median']):>10} {_fmt(r['median']):>10} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog='python -m benchmarks.run',
+                                 description='Benchmarks del solver, las trayectorias y el render.')
+    ap.add_argument('-o', '--out', help='guardar resultados en este JSON')
+    ap.add_argument('--compare', metavar='BASE', help='JSON de referencia con el que comparar')
+    ap.add_argument('--threshold', type=float, default=0.15,
+                    help='margen relativo antes de marcar regresión (0.15 = +15%%)')
+    ap.add_argument('--scenario', help='escenario (JSON); por defecto el baseline')
+    ap.add_argument('--repeat', type=int, default=5, help='muestras por caso')
+    ap.add_argument('--min-time', type=float, default=0.05, help='segundos mínimos por muestra')
+    ap.add_argument('-k', dest='pattern', help='ejecutar sólo los casos que contengan este texto')
+    args = ap.parse_args(argv)
+
+    scen = load_scenario_file(args.scenario) if args.scenario else load_scenario_file()
+    current = run_suite(scen, repeat=args.repeat, min_time=args.min_time, pattern=args.pattern)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"-> {args.out}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresión(es): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Barrido por lotes de configuraciones del atacante contra un defensor.
+
+Lee un fichero JSONL o CSV con una configuración por línea (claves x0, y0, theta_deg,
+spring_x, mass y opcionalmente id), reparte los casos en bloques sobre un
+ProcessPoolExecutor y escribe una fila de resultado por caso, en el orden de entrada.
+
+Uso:
+    python -m misiles.batch casos.jsonl -o resultados.csv [--scenario esc.json] [--workers N] [--salvo]
+                            [--cache DIR]
+"""
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import collections
+import csv
+import json
+import os
+import time
+
+from .cache import ResultCache
+from .core.intercept import InterceptSolution
+from .core.physics import rad2deg
+from .core.salvo import solve_salvo_launches
+from .solve import (BASELINE_PATH, attacker_launch, defender_v0_max, intercept_params,
+                    load_scenario_file, solve_scenario)
+from .ui.params import Scenario
+
+CASE_KEYS = ('x0', 'y0', 'theta_deg', 'spring_x', 'mass')
+RESULT_FIELDS = ('id',) + CASE_KEYS + (
+    'v0_a', 'v0d_max', 'intercept', 'theta_d_deg', 'delay', 'v0_d',
+    'impact_time', 'impact_x', 'impact_y', 'error', 'failure',
+)
+
+
+@dataclass
+class BatchReport:
+    cases: int
+    intercepts: int
+    failures: int
+    seconds: float
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.cases / self.seconds if self.seconds > 0 else float('inf')
+
+
+def read_cases(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Itera las configuraciones del atacante de un fichero .jsonl o .csv.
+
+    Los valores se convierten a número al resolver cada caso (_case_row), de modo que
+    una línea mal formada acaba como fallo de ese caso y no detiene el lote.
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            for row in csv.DictReader(f):
+                case: Dict[str, Any] = {'id': row.get('id', '')}
+                for k in CASE_KEYS:
+                    if row.get(k) not in (None, ''):
+                        case[k] = row[k]
+                yield case
+        else:
+            for n, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    case = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {'_error': f"línea {n}: JSON inválido ({e})"}
+                    continue
+                if not isinstance(case, dict):
+                    yield {'_error': f"línea {n}: se esperaba un objeto JSON"}
+                    continue
+                yield case
+
+
+def _case_row(case: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, float]]]:
+    """Fila de resultado inicial y parámetros del atacante del caso.
+
+    Si el caso no es válido (valor no numérico, línea ilegible) los parámetros son None
+    y el motivo queda en row['failure'].
+    """
+    row: Dict[str, Any] = dict.fromkeys(RESULT_FIELDS, None)
+    row['id'] = case.get('id')
+    row['intercept'] = False
+    row['failure'] = case.get('_error', '')
+    if row['failure']:
+        return row, None
+    overrides: Dict[str, float] = {}
+    for k in CASE_KEYS:
+        if case.get(k) is None:
+            continue
+        try:
+            overrides[k] = float(case[k])
+        except (TypeError, ValueError):
+            row[k] = case[k]
+            row['failure'] = f"{k} no numérico: {case[k]!r}"
+            return row, None
+    row.update(overrides)
+    return row, overrides
+
+
+def _fill_solution(row: Dict[str, Any], sol: Optional[InterceptSolution]) -> None:
+    if sol is not None:
+        row.update(intercept=True, theta_d_deg=rad2deg(sol.theta_d), delay=sol.delay,
+                   v0_d=sol.v0_d, impact_time=sol.impact_time,
+                   impact_x=sol.impact_point[0], impact_y=sol.impact_point[1], error=sol.error)
+
+
+def solve_case(scen: Scenario, case: Dict[str, Any],
+               cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """Resuelve un caso y devuelve su fila de resultado (los fallos quedan en 'failure')."""
+    row, overrides = _case_row(case)
+    if overrides is None:
+        return row
+    try:
+        res = solve_scenario(scen, overrides, cache=cache)
+    except (ValueError, ZeroDivisionError, OverflowError) as e:
+        row['failure'] = str(e)
+        return row
+    row['v0_a'] = res.v0_a
+    row['v0d_max'] = res.v0d_max
+    _fill_solution(row, res.solution)
+    return row
+
+
+# cada bloque devuelve sus filas y los aciertos/fallos de caché de ese bloque
+_ChunkResult = Tuple[List[Dict[str, Any]], int, int]
+
+
+def _solve_chunk(scen: Scenario, cases: List[Dict[str, Any]],
+                 cache: Optional[ResultCache] = None) -> _ChunkResult:
+    if cache is None:
+        return [solve_case(scen, c) for c in cases], 0, 0
+    hits, misses = cache.hits, cache.misses
+    rows = [solve_case(scen, c, cache) for c in cases]
+    return rows, cache.hits - hits, cache.misses - misses
+
+
+def _solve_chunk_salvo(scen: Scenario, cases: List[Dict[str, Any]],
+                       cache: Optional[ResultCache] = None) -> _ChunkResult:
+    """Como _solve_chunk, pero resolviendo el bloque entero como una salva (misiles.core.salvo).
+
+    La salva se resuelve siempre en bloque: no usa la caché.
+    """
+    rows, launches, valid = [], [], []
+    v0d_max = defender_v0_max(scen)
+    for c in cases:
+        row, overrides = _case_row(c)
+        rows.append(row)
+        if overrides is None:
+            continue
+        try:
+            launch = attacker_launch(scen, overrides)
+        except (ValueError, ZeroDivisionError) as e:
+            row['failure'] = str(e)
+            continue
+        row['v0_a'] = launch.v0
+        row['v0d_max'] = v0d_max
+        launches.append(launch)
+        valid.append(row)
+    if launches:
+        table = solve_salvo_launches(launches, intercept_params(scen), v0d_max)
+        for row, sol in zip(valid, table.solutions):
+            _fill_solution(row, sol)
+    return rows, 0, 0
+
+
+def _chunks(it: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(it)
+    while True:
+        block = list(islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+class _RowWriter:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._f = open(self.path, 'w', encoding='utf-8', newline='')
+        self._csv = None
+        if self.path.suffix.lower() == '.csv':
+            self._csv = csv.DictWriter(self._f, fieldnames=RESULT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._f.write(json.dumps(row) + '\n')
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def run_batch(cases: Iterable[Dict[str, Any]], out_path: str | Path,
+              scen: Optional[Scenario] = None, workers: Optional[int] = None,
+              chunk_size: int = 64, salvo: bool = False,
+              cache: Optional[ResultCache] = None) -> BatchReport:
+    """Resuelve todos los casos y escribe una fila por caso en out_path (.csv o .jsonl).
+
+    Los casos se envían en bloques de chunk_size con a lo sumo 2 * workers bloques en
+    vuelo, de modo que la entrada se consume en flujo. workers=0 resuelve en el proceso.
+    Con salvo=True cada bloque se resuelve de una vez como una salva. Con `cache` cada
+    caso se busca primero en la caché en disco (compartida entre procesos).
+    """
+    solve_chunk = _solve_chunk_salvo if salvo else _solve_chunk
+    if scen is None:
+        scen = load_scenario_file(BASELINE_PATH)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    writer = _RowWriter(out_path)
+    n = n_ok = n_fail = n_hit = n_miss = 0
+
+    def emit(result: _ChunkResult) -> None:
+        nonlocal n, n_ok, n_fail, n_hit, n_miss
+        rows, hits, misses = result
+        n_hit += hits
+        n_miss += misses
+        for row in rows:
+            writer.write(row)
+            n += 1
+            n_ok += bool(row['intercept'])
+            n_fail += bool(row['failure'])
+
+    t0 = time.perf_counter()
+    try:
+        if workers <= 0:
+            for block in _chunks(cases, chunk_size):
+                emit(solve_chunk(scen, block, cache))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                pending: collections.deque[Future] = collections.deque()
+                for block in _chunks(cases, chunk_size):
+                    pending.append(ex.submit(solve_chunk, scen, block, cache))
+                    if len(pending) >= 2 * workers:
+                        emit(pending.popleft().result())
+                while pending:
+                    emit(pending.popleft().result())
+    finally:
+        writer.close()
+    return BatchReport(cases=n, intercepts=n_ok, failures=n_fail, seconds=time.perf_counter() - t0,
+                       cache_hits=n_hit, cache_misses=n_miss)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog='python -m misiles.batch',
+                                 description='Barrido por lotes de configuraciones del atacante.')
+    ap.add_argument('cases', help='fichero de casos (.jsonl o .csv)')
+    ap.add_argument('-o', '--out', required=True, help='fichero de resultados (.csv o .jsonl)')
+    ap.add_argument('--scenario', default=str(BASELINE_PATH), help='escenario base (JSON)')
+    ap.add_argument('--workers', type=int, default=None, help='procesos (0 = sin pool)')
+    ap.add_argument('--chunk-size', type=int, default=64, help='casos por tarea')
+    ap.add_argument('--salvo', action='store_true',
+                    help='resolver cada bloque como una salva vectorizada')
+    ap.add_argument('--cache', metavar='DIR', help='caché en disco de resultados (no con --salvo)')
+    args = ap.parse_args(argv)
+    if args.cache and args.salvo:
+        ap.error('--cache no se aplica con --salvo')
+
+    cache = ResultCache(args.cache) if args.cache else None
+    rep = run_batch(read_cases(args.cases), args.out, scen=load_scenario_file(args.scenario),
+                    workers=args.workers, chunk_size=args.chunk_size, salvo=args.salvo, cache=cache)
+    print(f"{rep.cases} casos en {rep.seconds:.2f} s ({rep.throughput:.1f} casos/s); "
+          f"{rep.intercepts} con intercepción, {rep.failures} con error -> {args.out}")
+    if cache is not None:
+        total = rep.cache_hits + rep.cache_misses
+        rate = rep.cache_hits / total if total else 0.0
+        print(f"caché: {rep.cache_hits} aciertos, {rep.cache_misses} fallos ({100 * rate:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Caché persistente en disco de resultados de solve_scenario, direccionada por contenido.
+
+La clave es un hash (sha256) del escenario efectivo: los dataclasses Scenario/Globals de
+misiles.ui.params con los parámetros del atacante ya aplicados, serializados en JSON
+canónico. Cada entrada es un .npz con la solución (y opcionalmente la trayectoria del
+atacante); se escribe en un temporal del mismo directorio y se publica con os.replace,
+así que varios procesos pueden leer y escribir a la vez sin ver ficheros a medias.
+Al superar max_bytes se borran las entradas menos usadas (mtime, que se renueva en cada
+acierto).
+
+Uso:
+    python -m misiles.main --json --cache .cache_misiles
+    python -m misiles.batch casos.jsonl -o res.csv --cache .cache_misiles
+    python -m misiles.cache .cache_misiles [--clear]
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from .core.intercept import InterceptSolution
+from .core.trajectories import Trajectory
+from .ui.params import Scenario
+
+# subir al cambiar el formato de las entradas o el resultado del solver
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 << 20
+_SUFFIX = '.npz'
+_STALE_TMP_S = 3600.0  # temporales huérfanos (proceso muerto a mitad de escritura)
+
+
+@dataclass(frozen=True)
+class DiskCacheInfo:
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class CachedResult:
+    v0_a: float
+    v0d_max: float
+    solution: Optional[InterceptSolution]
+    trajectory: Optional[Trajectory]  # None si se guardó sin trayectoria
+
+
+def _canonical(value: Any) -> Any:
+    # enteros y floats iguales dan la misma clave (45 == 45.0); -0.0 pasa a 0.0
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value) + 0.0
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    raise TypeError(f"valor no serializable en la clave de caché: {value!r}")
+
+
+def scenario_key(scen: Scenario, attacker_params: Optional[Dict[str, Any]] = None,
+                 solver: Optional[str] = None) -> str:
+    """Hash hexadecimal del escenario efectivo (con los parámetros del atacante aplicados).
+
+    solver distingue resultados de otros solvers (None = el barrido por defecto).
+    """
+    if attacker_params:
+        from .solve import apply_attacker_overrides
+        scen = copy.deepcopy(scen)
+        apply_attacker_overrides(scen, attacker_params)
+    payload = {'version': CACHE_VERSION, 'scenario': _canonical(asdict(scen))}
+    if solver is not None:
+        payload['solver'] = solver
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Directorio de entradas .npz con desalojo LRU por tamaño total.
+
+    Los contadores (hits, misses, ...) son de este proceso; entries y bytes se leen del disco.
+    El límite es aproximado: los bytes escritos por otros procesos se ven en el siguiente
+    recuento, que se hace cuando la estimación propia supera max_bytes.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 store_trajectories: bool = False):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes debe ser > 0")
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.store_trajectories = store_trajectories
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._approx_bytes: Optional[int] = None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.root / (key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        path = self.path(key)
+        try:
+            with np.load(path) as z:
+                v0 = z['v0']
+                sol_arr = z['solution']
+                traj = Trajectory(z['t'], z['x'], z['y']) if 't' in z.files else None
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # entrada dañada (o de otra versión): se descarta y se recalcula
+            self._unlink(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # uso reciente para el LRU
+        except OSError:
+            pass
+        self.hits += 1
+        sol = None
+        if sol_arr.size:
+            th, delay, v0d, t_imp, ix, iy, err = (float(v) for v in sol_arr)
+            sol = InterceptSolution(theta_d=th, delay=delay, v0_d=v0d, impact_time=t_imp,
+                                    impact_point=(ix, iy), error=err)
+        return CachedResult(v0_a=float(v0[0]), v0d_max=float(v0[1]), solution=sol, trajectory=traj)
+
+    def put(self, key: str, v0_a: float, v0d_max: float, solution: Optional[InterceptSolution],
+            trajectory: Optional[Trajectory] = None) -> None:
+        """Guarda la entrada; la trayectoria sólo si store_trajectories."""
+        arrays: Dict[str, np.ndarray] = {'v0': np.array([v0_a, v0d_max], dtype=np.float64)}
+        if solution is None:
+            arrays['solution'] = np.empty(0)
+        else:
+            s = solution
+            arrays['solution'] = np.array([s.theta_d, s.delay, s.v0_d, s.impact_time,
+                                           s.impact_point[0], s.impact_point[1], s.error],
+                                          dtype=np.float64)
+        if self.store_trajectories and trajectory is not None:
+            arrays.update(t=trajectory.t, x=trajectory.x, y=trajectory.y)
+
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=key[:16] + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            self._unlink(Path(tmp))
+            raise
+        self.writes += 1
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan()[1]
+        else:
+            self._approx_bytes += size
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """Borra las entradas más antiguas hasta quedar en target bytes (90% de max_bytes)."""
+        target = int(0.9 * self.max_bytes) if target is None else target
+        entries = []
+        now = time.time()
+        for e in os.scandir(self.root):
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                continue
+            if e.name.endswith(_SUFFIX):
+                entries.append((st.st_mtime, st.st_size, e.path))
+            elif e.name.endswith('.tmp') and now - st.st_mtime > _STALE_TMP_S:
+                self._unlink(Path(e.path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            if self._unlink(Path(path)):
+                removed += 1
+            total -= size  # si otro proceso ya la borró, tampoco cuenta
+        self.evictions += removed
+        self._approx_bytes = total
+        return removed
+
+    def clear(self) -> int:
+        return self.evict(target=0)
+
+    def _scan(self) -> Tuple[int, int]:
+        n = size = 0
+        for e in os.scandir(self.root):
+            if e.name.endswith(_SUFFIX):
+                try:
+                    size += e.stat().st_size
+                    n += 1
+                except FileNotFoundError:
+                    pass
+        return n, size
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def info(self) -> DiskCacheInfo:
+        entries, size = self._scan()
+        return DiskCacheInfo(self.hits, self.misses, self.writes, self.evictions,
+                             entries, size, self.max_bytes)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog='python -m misiles.cache',
+                                 description='Estado (o vaciado) de la caché de resultados.')
+    ap.add_argument('root', help='directorio de la caché')
+    ap.add_argument('--clear', action='store_true', help='borra todas las entradas')
+    args = ap.parse_args(argv)
+
+    cache = ResultCache(args.root)
+    if args.clear:
+        print(f"{cache.clear()} entradas borradas")
+    info = cache.info()
+    print(f"{info.entries} entradas, {info.bytes / 1024:.1f} KiB en {cache.root}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Solver de intercepción "anytime": grueso -> fino con un presupuesto de tiempo.
+
+Recorre la misma malla (t_a, retardo, theta) que solve_intercept_enumeration, primero
+submuestreada (un punto de cada 8 en cada eje, luego 4, 2 y 1) y cada nivel por bloques
+de muestras del atacante, mirando el reloj entre bloques. Al agotarse el presupuesto
+devuelve la mejor solución hallada hasta entonces con complete=False; la búsqueda puede
+continuar después (finish) o en un hilo aparte (refine) desde donde se quedó. Terminado
+el nivel completo, la solución es la del barrido exacto.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Tuple
+import threading
+import time
+
+import numpy as np
+
+from .intercept import (_TIE_TOL, InterceptParams, InterceptSolution, _delay_grid,
+                        _make_solution, _sweep_numpy, _theta_grid)
+
+# pasos de submuestreo de cada nivel (el último es la malla completa)
+_STRIDES = (8, 4, 2, 1)
+# tamaño inicial de bloque (elementos muestra x retardo x theta) y duración buscada de
+# cada bloque: las filas por bloque se ajustan con lo que tardó el anterior, porque la
+# poda por alcance hace que el coste real varíe mucho entre escenarios
+_BLOCK_ELEMS = 1 << 18
+_BLOCK_SECONDS = 0.004
+
+_Cand = Tuple[float, float, int, int, int, int]  # (error, retardo, orden, ia, id, ith)
+
+
+def _better(a: _Cand, b: Optional[_Cand]) -> bool:
+    # mismo criterio que _sweep_numpy: error, a igualdad retardo y orden de recorrido
+    return b is None or a[0] < b[0] - _TIE_TOL or (abs(a[0] - b[0]) <= _TIE_TOL and a[1:3] < b[1:3])
+
+
+class _Search:
+    """Estado reanudable de la búsqueda; `steps` avanza un bloque por iteración."""
+
+    def __init__(self, attacker_traj_txy, params: InterceptParams, v0d_max: float,
+                 on_complete: Optional[Callable[[Optional[InterceptSolution]], None]] = None):
+        self.t_a, self.x_a, self.y_a = (np.asarray(a, dtype=float) for a in attacker_traj_txy)
+        self.thetas = np.asarray(_theta_grid(params), dtype=float)
+        self.delays = np.asarray(_delay_grid(params), dtype=float)
+        self.params = params
+        self.v0d_max = v0d_max
+        self.on_complete = on_complete
+        self.best: Optional[_Cand] = None
+        self.levels_done = 0
+        self.done = False
+        self.lock = threading.Lock()
+        self.steps = self._run()
+
+    def _run(self) -> Iterator[None]:
+        n_d, n_th = self.delays.size, self.thetas.size
+        dx_all = self.x_a - self.params.xd0
+        for s in _STRIDES:
+            ia_full = np.arange(0, self.t_a.size, s)
+            delays, thetas = self.delays[::s], self.thetas[::s]
+            rows = max(1, _BLOCK_ELEMS // max(1, delays.size * thetas.size))
+            level_best: Optional[_Cand] = None
+            b = 0
+            while b < ia_full.size:
+                idx = ia_full[b:b + rows]
+                b += rows
+                t0 = time.perf_counter()
+                cand = _sweep_numpy(self.t_a[idx], self.x_a[idx], dx_all[idx], self.y_a[idx],
+                                    thetas, delays, self.params, self.v0d_max)
+                dt = time.perf_counter() - t0
+                rows = max(1, int(rows * min(4.0, max(0.25, _BLOCK_SECONDS / max(dt, 1e-6)))))
+                if cand is not None:
+                    # índices y orden de recorrido en la malla completa
+                    i, j, k = int(idx[cand[3]]), cand[4] * s, cand[5] * s
+                    cand = (cand[0], cand[1], (i * n_d + j) * n_th + k, i, j, k)
+                    if _better(cand, level_best):
+                        level_best = cand
+                    if _better(cand, self.best):
+                        self.best = cand
+                yield
+            self.levels_done += 1
+            if s == 1:
+                # la malla completa contiene las gruesas: su resultado es el exacto
+                self.best = level_best
+        self.done = True
+        if self.on_complete is not None:
+            self.on_complete(self.solution())
+
+    def solution(self) -> Optional[InterceptSolution]:
+        if self.best is None:
+            return None
+        _, _, _, i, j, k = self.best
+        return _make_solution(float(self.t_a[i]), float(self.x_a[i]), float(self.y_a[i]),
+                              float(self.delays[j]), float(self.thetas[k]), self.params)
+
+    def run_until(self, deadline: Optional[float], stop: Optional[Callable[[], bool]] = None) -> None:
+        with self.lock:
+            for _ in self.steps:
+                if deadline is not None and time.perf_counter() >= deadline and self.levels_done > 0:
+                    return
+                if stop is not None and stop():
+                    return
+
+
+@dataclass
+class AnytimeResult:
+    solution: Optional[InterceptSolution]
+    complete: bool  # True si se recorrió la malla completa (solución exacta)
+    levels: int     # niveles grueso -> fino terminados (de len(_STRIDES))
+    seconds: float
+    _search: Optional[_Search] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def _of(cls, search: _Search, seconds: float) -> 'AnytimeResult':
+        return cls(search.solution(), search.done, search.levels_done, seconds,
+                   None if search.done else search)
+
+    def finish(self, stop: Optional[Callable[[], bool]] = None) -> 'AnytimeResult':
+        """Completa la búsqueda en este hilo (desde donde se quedó) y devuelve el resultado exacto.
+
+        stop() se consulta entre bloques: si devuelve True se para y el resultado sigue
+        incompleto (se puede volver a llamar a finish para continuar).
+        """
+        if self._search is None:
+            return self
+        t0 = time.perf_counter()
+        self._search.run_until(None, stop)
+        return AnytimeResult._of(self._search, self.seconds + time.perf_counter() - t0)
+
+    def refine(self, callback: Callable[['AnytimeResult'], None]) -> Optional[threading.Thread]:
+        """Sigue buscando en un hilo aparte; callback(resultado) al terminar si la solución cambió.
+
+        callback se llama desde ese hilo. Devuelve el hilo, o None si ya estaba completo.
+        """
+        if self._search is None:
+            return None
+        before = self.solution
+
+        def run() -> None:
+            res = self.finish()
+            if res.solution != before:
+                callback(res)
+
+        th = threading.Thread(target=run, name='misiles-anytime', daemon=True)
+        th.start()
+        return th
+
+
+def solve_intercept_anytime(attacker_traj_txy: Tuple[list, list, list],
+                            params: InterceptParams,
+                            v0d_max: float,
+                            budget: Optional[float] = None,
+                            deadline: Optional[float] = None,
+                            on_complete: Optional[Callable[[Optional[InterceptSolution]], None]] = None
+                            ) -> AnytimeResult:
+    """Mejor intercepción hallada dentro del presupuesto (s) o antes de deadline (perf_counter).
+
+    Sin budget ni deadline recorre la malla completa (mismo resultado que el barrido
+    'numpy'). El nivel más grueso (1/512 de la malla) se termina siempre. on_complete
+    recibe la solución exacta cuando la búsqueda termina, en el hilo que la termine.
+    """
+    t0 = time.perf_counter()
+    if budget is not None:
+        deadline = t0 + budget if deadline is None else min(deadline, t0 + budget)
+    search = _Search(attacker_traj_txy, params, v0d_max, on_complete)
+    search.run_until(deadline)
+    return AnytimeResult._of(search, time.perf_counter() - t0)
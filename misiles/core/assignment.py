@@ -0,0 +1,66 @@
+"""Asignación lineal de coste mínimo (algoritmo húngaro con potenciales)."""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+
+def linear_assignment(cost) -> Tuple[np.ndarray, np.ndarray]:
+    """Empareja filas y columnas minimizando la suma de costes.
+
+    cost: matriz n x m de valores finitos. Devuelve (filas, columnas) con min(n, m)
+    parejas, ordenadas por fila. Camino aumentante más corto con potenciales (u, v),
+    O(min^2 max) con el bucle interno vectorizado sobre la dimensión mayor.
+    """
+    c = np.asarray(cost, dtype=float)
+    if c.ndim != 2:
+        raise ValueError("cost debe ser una matriz 2D")
+    if not np.isfinite(c).all():
+        raise ValueError("cost debe ser finito")
+    transposed = c.shape[0] > c.shape[1]
+    if transposed:
+        c = c.T
+    n, m = c.shape
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    # índices 1..n / 1..m; la columna 0 es ficticia (raíz del camino aumentante)
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # fila asignada a cada columna (0 = libre)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used
+            free[0] = False
+            cur = c[i0 - 1] - u[i0] - v[1:]
+            upd = free[1:] & (cur < minv[1:])
+            minv[1:][upd] = cur[upd]
+            way[1:][upd] = j0
+            j1 = int(np.argmin(np.where(free, minv, np.inf)))
+            delta = minv[j1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # invertir el camino aumentante
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(match[1:])
+    rows = match[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
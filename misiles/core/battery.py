@@ -0,0 +1,236 @@
+"""Baterías de defensores: matriz atacante x disparo y asignación óptima.
+
+Cada batería tiene su posición, su v0 máxima (resorte) y un tiempo de recarga R: entre dos
+disparos suyos pasan al menos R segundos, y sin recarga (R = None) tiene un solo disparo.
+Para la matriz de costes se usan ciclos: el disparo k sale con retardo en
+[delay_min + k R, delay_min + (k+1) R), como mucho uno por ciclo. Las columnas son pares
+(batería, disparo); todas las ventanas de una batería salen de un único barrido de la
+salva (solve_salvo_windows).
+
+La asignación se hace en tres pasos:
+  1. algoritmo húngaro (no voraz) sobre la matriz por ciclos: máximo número de
+     intercepciones y, entre esas, mínimo coste total;
+  2. dos disparos en ciclos contiguos pueden quedar a menos de R (0,95 s y 1,0 s con
+     R = 1): se recorren los de cada batería en orden y el que sale antes de recargar se
+     vuelve a resolver con retardo >= anterior + R, o se suelta si ya no intercepta;
+  3. los atacantes sin defensor se vuelven a asignar (húngaro) a los huecos libres de
+     cada batería, retardos a R o más de todos sus disparos, hasta que ninguno cabe.
+El plan final respeta siempre la recarga y es maximal: ningún atacante sin asignar tiene
+un disparo posible que la respete. No se garantiza el máximo global, que exigiría
+resolver a la vez la asignación y los retardos de cada batería.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import dataclasses
+import math
+import time
+
+import numpy as np
+
+from .assignment import linear_assignment
+from .intercept import InterceptParams, InterceptSolution, SolverStats
+from .physics import LaunchState
+from .salvo import generate_salvo, solve_salvo_windows
+
+# coste de un enfrentamiento a partir de su solución (menor es mejor)
+COSTS: Dict[str, Callable[[InterceptSolution], float]] = {
+    'impact_time': lambda s: s.impact_time,  # interceptar cuanto antes
+    'delay': lambda s: s.delay,
+    'v0_d': lambda s: s.v0_d,
+    'error': lambda s: s.error,
+}
+
+
+@dataclass(frozen=True)
+class Battery:
+    xd0: float
+    yd0: float
+    v0_max: float
+    reload_time: Optional[float] = None  # s entre disparos (None = un solo disparo)
+
+
+@dataclass
+class Engagement:
+    attacker: int
+    battery: int
+    shot: int  # número de disparo de la batería, en orden de salida
+    solution: InterceptSolution
+    cost: float
+
+
+@dataclass
+class BatteryPlan:
+    engagements: List[Engagement]   # ordenados por atacante
+    unassigned: List[int]           # atacantes sin defensor
+    columns: List[Tuple[int, int]]  # (batería, disparo) de cada columna de `cost`
+    cost: np.ndarray                # atacante x columna; inf = inviable
+    seconds: float = 0.0
+
+    @property
+    def feasible(self) -> np.ndarray:
+        """Matriz booleana atacante x batería: algún disparo de la batería intercepta."""
+        n_bat = 1 + max((b for b, _ in self.columns), default=-1)
+        out = np.zeros((self.cost.shape[0], n_bat), dtype=bool)
+        for col, (b, _) in enumerate(self.columns):
+            out[:, b] |= np.isfinite(self.cost[:, col])
+        return out
+
+    @property
+    def total_cost(self) -> float:
+        return float(sum(e.cost for e in self.engagements))
+
+
+def shot_windows(reload_time: Optional[float], delay_min: float, delay_max: float) -> List[Tuple[float, float]]:
+    """Ventanas de retardo [lo, hi) de cada disparo de una batería."""
+    if not reload_time or reload_time <= 0:
+        return [(delay_min, math.inf)]
+    n = max(1, int(math.floor((delay_max - delay_min) / reload_time + 1e-9)) + 1)
+    wins = [(delay_min + k * reload_time, delay_min + (k + 1) * reload_time) for k in range(n)]
+    wins[-1] = (wins[-1][0], math.inf)
+    return wins
+
+
+def free_windows(delays: Sequence[float], reload_time: Optional[float],
+                 delay_min: float) -> List[Tuple[float, float]]:
+    """Ventanas [lo, hi) de retardos a reload_time o más de todos los disparos `delays`."""
+    tol = 1e-9
+    if not reload_time or reload_time <= 0:
+        return [] if len(delays) else [(delay_min - tol, math.inf)]
+    wins = []
+    start = delay_min
+    for d in sorted(delays):
+        if d - reload_time >= start - tol:
+            wins.append((start - tol, d - reload_time + tol))
+        start = max(start, d + reload_time)
+    wins.append((start - tol, math.inf))
+    return wins
+
+
+def _match(mat: np.ndarray) -> List[Tuple[int, int]]:
+    """Parejas (fila, columna) viables de la asignación húngara sobre mat (inf = inviable)."""
+    ok = np.isfinite(mat)
+    if not ok.any():
+        return []
+    # las parejas inviables cuestan más que cualquier plan con una intercepción más
+    shifted = np.where(ok, mat - mat[ok].min(), 0.0)
+    big = min(mat.shape) * float(shifted.max()) + 1.0
+    rows, cols = linear_assignment(np.where(ok, shifted, big))
+    return [(a, c) for a, c in zip(rows.tolist(), cols.tolist()) if ok[a, c]]
+
+
+def _enforce_reload(engagements: List[Engagement], launches: Sequence[LaunchState],
+                    batteries: Sequence[Battery], params: InterceptParams,
+                    key: Callable[[InterceptSolution], float],
+                    stats: Optional[SolverStats] = None) -> List[Engagement]:
+    """Garantiza reload_time entre disparos consecutivos de cada batería.
+
+    Recorre los disparos de cada batería por retardo; el que sale antes de tiempo se vuelve
+    a resolver sólo con retardos >= anterior + R y, si no hay intercepción, se suelta
+    (su atacante queda para _fill_free_slots).
+    """
+    out: List[Engagement] = []
+    for b, bat in enumerate(batteries):
+        own = sorted((e for e in engagements if e.battery == b), key=lambda e: e.solution.delay)
+        p = dataclasses.replace(params, xd0=bat.xd0, yd0=bat.yd0)
+        ready = -math.inf  # primer retardo en que la batería vuelve a estar cargada
+        for e in own:
+            sol = e.solution
+            if sol.delay < ready - 1e-9:
+                salvo = generate_salvo([launches[e.attacker]], params.dt_attacker, params.g)
+                sol = solve_salvo_windows(salvo, p, bat.v0_max, [(ready, math.inf)], stats)[0][0]
+                if sol is None:
+                    continue
+            out.append(Engagement(e.attacker, b, e.shot, sol, float(key(sol))))
+            if bat.reload_time and bat.reload_time > 0:
+                ready = sol.delay + bat.reload_time
+    return out
+
+
+def _fill_free_slots(engagements: List[Engagement], launches: Sequence[LaunchState],
+                     batteries: Sequence[Battery], params: InterceptParams,
+                     key: Callable[[InterceptSolution], float],
+                     stats: Optional[SolverStats] = None) -> List[Engagement]:
+    """Asigna atacantes libres a los huecos libres de las baterías hasta que ninguno cabe.
+
+    En cada ronda cada hueco (free_windows) es una columna con un solo disparo, así que
+    los disparos nuevos quedan a R o más de los ya fijados y entre sí. La ronda en la que
+    ningún atacante libre tiene intercepción en ningún hueco es la comprobación final.
+    """
+    engagements = list(engagements)
+    while True:
+        taken = {e.attacker for e in engagements}
+        free = [a for a in range(len(launches)) if a not in taken]
+        if not free:
+            return engagements
+        salvo = generate_salvo([launches[a] for a in free], params.dt_attacker, params.g)
+        columns: List[int] = []
+        sols: List[List[Optional[InterceptSolution]]] = [[] for _ in free]
+        for b, bat in enumerate(batteries):
+            wins = free_windows([e.solution.delay for e in engagements if e.battery == b],
+                                bat.reload_time, params.delay_min)
+            if not wins:
+                continue
+            p = dataclasses.replace(params, xd0=bat.xd0, yd0=bat.yd0)
+            for i, row in enumerate(solve_salvo_windows(salvo, p, bat.v0_max, wins, stats)):
+                sols[i].extend(row)
+            columns.extend([b] * len(wins))
+        mat = np.array([[key(s) if s is not None else math.inf for s in row] for row in sols],
+                       dtype=float).reshape(len(free), len(columns))
+        pairs = _match(mat)
+        if not pairs:
+            return engagements
+        for i, col in pairs:
+            engagements.append(Engagement(free[i], columns[col], -1, sols[i][col], float(mat[i, col])))
+
+
+def _number_shots(engagements: List[Engagement]) -> List[Engagement]:
+    """Numera los disparos de cada batería por retardo y ordena por atacante."""
+    count: Dict[int, int] = {}
+    for e in sorted(engagements, key=lambda e: (e.battery, e.solution.delay)):
+        e.shot = count.get(e.battery, 0)
+        count[e.battery] = e.shot + 1
+    return sorted(engagements, key=lambda e: e.attacker)
+
+
+def cost_matrix(launches: Sequence[LaunchState], batteries: Sequence[Battery], params: InterceptParams,
+                cost: str = 'impact_time', stats: Optional[SolverStats] = None
+                ) -> Tuple[np.ndarray, List[Tuple[int, int]], List[List[Optional[InterceptSolution]]]]:
+    """Coste atacante x (batería, disparo) con inf donde no hay intercepción.
+
+    params da la malla de búsqueda; la posición del defensor se toma de cada batería.
+    Devuelve (coste, columnas, soluciones[atacante][columna]).
+    """
+    if cost not in COSTS:
+        raise ValueError(f"coste desconocido: {cost!r}")
+    key = COSTS[cost]
+    salvo = generate_salvo(launches, params.dt_attacker, params.g)
+    columns: List[Tuple[int, int]] = []
+    sols: List[List[Optional[InterceptSolution]]] = [[] for _ in launches]
+    for b, bat in enumerate(batteries):
+        p = dataclasses.replace(params, xd0=bat.xd0, yd0=bat.yd0)
+        wins = shot_windows(bat.reload_time, params.delay_min, params.delay_max)
+        per = solve_salvo_windows(salvo, p, bat.v0_max, wins, stats)
+        columns.extend((b, k) for k in range(len(wins)))
+        for a, row in enumerate(per):
+            sols[a].extend(row)
+    mat = np.array([[key(s) if s is not None else math.inf for s in row] for row in sols],
+                   dtype=float).reshape(len(launches), len(columns))
+    return mat, columns, sols
+
+
+def plan_battery(launches: Sequence[LaunchState], batteries: Sequence[Battery], params: InterceptParams,
+                 cost: str = 'impact_time', stats: Optional[SolverStats] = None) -> BatteryPlan:
+    """Asigna a cada atacante como mucho un disparo de una batería, respetando la recarga."""
+    t0 = time.perf_counter()
+    mat, columns, sols = cost_matrix(launches, batteries, params, cost, stats)
+    key = COSTS[cost]
+    engagements = [Engagement(a, columns[col][0], columns[col][1], sols[a][col], float(mat[a, col]))
+                   for a, col in _match(mat)]
+    engagements = _enforce_reload(engagements, launches, batteries, params, key, stats)
+    engagements = _fill_free_slots(engagements, launches, batteries, params, key, stats)
+    engagements = _number_shots(engagements)
+    assigned = {e.attacker for e in engagements}
+    return BatteryPlan(engagements=engagements,
+                       unassigned=[a for a in range(len(launches)) if a not in assigned],
+                       columns=columns, cost=mat, seconds=time.perf_counter() - t0)
@@ -0,0 +1,352 @@
+"""Vuelo con rozamiento cuadrático y viento: integrador RK4 por lotes con paso adaptativo.
+
+La aceleración es a = -k |v - w| (v - w) - g y, con w = (wind, 0) y k = rho Cd A / (2 m)
+(1/m). No hay forma cerrada, así que muchos proyectiles se integran a la vez sobre
+arrays NumPy: cada uno con su propio paso (duplicación de paso con extrapolación de
+Richardson), todos cayendo exactamente en la malla de salida k dt. El cruce con el
+suelo se localiza con Newton sobre la longitud del último paso, de modo que la última
+muestra queda en y = 0 salvo redondeo (como el corte de generate_trajectory).
+
+Con k = 0 el modelo es el vacío y generate_trajectory y el solver siguen usando la
+forma cerrada; el integrador sólo entra con rozamiento.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import math
+import time
+
+import numpy as np
+
+from .intercept import (InterceptParams, InterceptSolution, SolverStats, _TIE_TOL,
+                        _delay_grid, _theta_grid)
+from .physics import GRAVITY_DEFAULT
+from .trajectories import Trajectory
+
+# candidatos del barrido por niveles de velocidad que se refinan con el integrador
+_REFINE_MAX = 16
+_REFINE_ITERS = 4
+
+
+@dataclass(frozen=True)
+class DragModel:
+    """Rozamiento cuadrático con viento horizontal constante.
+
+    Para otros modelos basta con heredar y redefinir accel (sin la gravedad).
+    """
+    k: float = 0.0      # 1/m
+    wind: float = 0.0   # m/s, positivo hacia +x
+    rtol: float = 1e-9
+    atol: float = 1e-9
+    n_speeds: int = 24  # niveles de v0 del defensor en el solver
+
+    @classmethod
+    def from_body(cls, cd: float, area: float, mass: float, rho: float = 1.225, **kw) -> 'DragModel':
+        """Modelo a partir de coeficiente de arrastre, sección (m^2) y masa (kg)."""
+        return cls(k=0.5 * rho * cd * area / mass, **kw)
+
+    @property
+    def closed_form(self) -> bool:
+        """Sin rozamiento el viento no actúa y vale la forma cerrada."""
+        return self.k == 0
+
+    def accel(self, vx: np.ndarray, vy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        rx = vx - self.wind
+        c = -self.k * np.hypot(rx, vy)
+        return c * rx, c * vy
+
+
+@dataclass
+class DragFlight:
+    """Vuelos integrados por lotes: estado (x, y, vx, vy) en la malla k dt.
+
+    Fila p = proyectil; sólo las primeras size[p] columnas son válidas y la última
+    está en t_end[p] (el suelo si landed[p], si no el final de la malla).
+    """
+    dt: float
+    x: np.ndarray
+    y: np.ndarray
+    vx: np.ndarray
+    vy: np.ndarray
+    size: np.ndarray
+    t_end: np.ndarray
+    landed: np.ndarray
+
+    def trajectory(self, p: int) -> Trajectory:
+        n = int(self.size[p])
+        t = np.arange(n, dtype=np.float64) * self.dt
+        if n:
+            t[-1] = self.t_end[p]
+        return Trajectory(t, self.x[p, :n].copy(), self.y[p, :n].copy())
+
+    def position_at(self, p, tau) -> Tuple[np.ndarray, np.ndarray]:
+        """Posición de los proyectiles p en los tiempos tau (interpolación de Hermite).
+
+        p y tau se difunden entre sí; fuera de [0, t_end] devuelve NaN.
+        """
+        p, tau = np.broadcast_arrays(np.asarray(p, dtype=np.int64), np.asarray(tau, dtype=float))
+        size = self.size[p]
+        t_end = self.t_end[p]
+        k = np.clip(np.floor(tau / self.dt).astype(np.int64), 0, np.maximum(size - 2, 0))
+        t0 = k * self.dt
+        t1 = np.where(k + 2 == size, t_end, t0 + self.dt)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h = t1 - t0
+            s = (tau - t0) / h
+            s2 = s * s
+            s3 = s2 * s
+            h00, h10, h01, h11 = 2 * s3 - 3 * s2 + 1, s3 - 2 * s2 + s, 3 * s2 - 2 * s3, s3 - s2
+            x = (h00 * self.x[p, k] + h10 * h * self.vx[p, k]
+                 + h01 * self.x[p, k + 1] + h11 * h * self.vx[p, k + 1])
+            y = (h00 * self.y[p, k] + h10 * h * self.vy[p, k]
+                 + h01 * self.y[p, k + 1] + h11 * h * self.vy[p, k + 1])
+        bad = (size < 2) | (tau < 0) | (tau > t_end)
+        return np.where(bad, np.nan, x), np.where(bad, np.nan, y)
+
+
+def _rk4(model: DragModel, s: np.ndarray, h: np.ndarray, g: float) -> np.ndarray:
+    """Un paso RK4 de longitud h (por fila) sobre estados s = (x, y, vx, vy)."""
+    def f(u):
+        ax, ay = model.accel(u[:, 2], u[:, 3])
+        return np.stack((u[:, 2], u[:, 3], ax, ay - g), axis=1)
+    hh = h[:, None]
+    k1 = f(s)
+    k2 = f(s + 0.5 * hh * k1)
+    k3 = f(s + 0.5 * hh * k2)
+    k4 = f(s + hh * k3)
+    return s + hh / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def _step(model: DragModel, s: np.ndarray, h: np.ndarray, g: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Paso con duplicación: (estado extrapolado, error local estimado)."""
+    one = _rk4(model, s, h, g)
+    two = _rk4(model, _rk4(model, s, 0.5 * h, g), 0.5 * h, g)
+    diff = (two - one) / 15
+    return two + diff, diff
+
+
+def integrate(model: DragModel, x0, y0, vx0, vy0, dt: float, g: float = GRAVITY_DEFAULT,
+              t_max: float | None = None) -> DragFlight:
+    """Integra a la vez todos los lanzamientos (arrays difundibles) hasta el suelo o t_max.
+
+    Igual que generate_trajectory: muestras en k dt hasta ceil(t_max / dt) y, si el
+    proyectil cae antes, la primera muestra bajo el suelo se sustituye por el cruce.
+    """
+    if dt <= 0:
+        raise ValueError("dt debe ser > 0")
+    s = np.stack([np.array(a, dtype=np.float64).ravel()
+                  for a in np.broadcast_arrays(x0, y0, vx0, vy0)], axis=1)
+    n = s.shape[0]
+    k_max = math.inf if t_max is None else max(1, int(math.ceil(t_max / dt)))
+    alive = s[:, 1] >= 0
+    size = alive.astype(np.int64)
+    t_end = np.zeros(n)
+    cols = [np.where(alive[:, None], s, np.nan)]
+    h = np.full(n, dt)
+    h_min = dt * 1e-12
+    k = 0
+    while alive.any() and k < k_max:
+        k += 1
+        tk = k * dt
+        t = np.full(n, (k - 1) * dt)
+        col = np.full((n, 4), np.nan)
+        act = np.flatnonzero(alive)
+        while act.size:
+            left = tk - t[act]
+            hh = np.minimum(h[act], left)
+            s0 = s[act]
+            new, diff = _step(model, s0, hh, g)
+            scale = model.atol + model.rtol * np.maximum(np.abs(s0), np.abs(new))
+            err = np.max(np.abs(diff) / scale, axis=1)
+            ok = (err <= 1) | (hh <= h_min)
+            with np.errstate(divide='ignore'):
+                fac = np.clip(0.9 * err ** -0.2, 0.2, 5.0)
+            # un paso recortado por la malla no reduce el paso siguiente
+            h[act] = np.where(ok & (hh < h[act]), np.maximum(h[act], hh * fac), hh * fac)
+
+            down = ok & (new[:, 1] < 0)
+            if down.any():
+                e = act[down]
+                s_e, h_e = s0[down], hh[down]
+                y_a, y_b = s_e[:, 1], new[down, 1]
+                he = h_e * y_a / (y_a - y_b)
+                for _ in range(6):
+                    st, _ = _step(model, s_e, he, g)
+                    he = np.clip(he - st[:, 1] / np.minimum(st[:, 3], -1e-12), 0.0, h_e)
+                st, _ = _step(model, s_e, he, g)
+                st[:, 1] = 0.0
+                col[e] = st
+                size[e] = k + 1
+                t_end[e] = t[e] + he
+                alive[e] = False
+            up = ok & ~down
+            a = act[up]
+            s[a] = new[up]
+            # al agotar el tramo se fija t = tk exactamente
+            t[a] = np.where(hh[up] >= left[up], tk, t[a] + hh[up])
+            act = np.concatenate((a[t[a] < tk], act[~ok]))
+        col[alive] = s[alive]
+        size[alive] = k + 1
+        t_end[alive] = tk
+        cols.append(col)
+    out = np.stack(cols, axis=1)
+    return DragFlight(dt=dt, x=out[:, :, 0], y=out[:, :, 1], vx=out[:, :, 2], vy=out[:, :, 3],
+                      size=size, t_end=t_end, landed=~alive & (size > 0))
+
+
+def drag_trajectory(model: DragModel, x0: float, y0: float, v0: float, theta: float, dt: float,
+                    g: float = GRAVITY_DEFAULT, t_max: float | None = None) -> Trajectory:
+    """generate_trajectory con el modelo de rozamiento."""
+    flight = integrate(model, x0, y0, v0 * math.cos(theta), v0 * math.sin(theta), dt, g, t_max)
+    return flight.trajectory(0)
+
+
+def solve_intercept_drag(attacker_traj_txy: Tuple[list, list, list], params: InterceptParams,
+                         v0d_max: float, model: DragModel,
+                         stats: Optional[SolverStats] = None) -> Optional[InterceptSolution]:
+    """Barrido (t_a, retardo, theta) del solver con el defensor sometido a `model`.
+
+    Sin forma cerrada para v0d, se integran de una vez model.n_speeds velocidades por
+    ángulo (hasta v0d_max). Para cada ángulo y par (muestra, retardo) se busca por
+    bisección el par de niveles cuya x en tau encierra la del atacante (se asume x
+    monótona en v0) y se interpola linealmente v0d y la altura. Los candidatos se
+    refinan por secante con el integrador, de _REFINE_MAX en _REFINE_MAX y en orden de
+    error aproximado, hasta que un lote case x exactamente; el error devuelto es el
+    vertical |Ya - Yd| de ese vuelo, como en el caso sin rozamiento.
+
+    Coste: en el escenario base, entre 0,3 y 1 s por llamada (casi todo en integrar las
+    velocidades de cada ángulo), frente a unos 2 ms del barrido sin rozamiento.
+    """
+    t0 = time.perf_counter()
+    t_a = np.asarray(attacker_traj_txy[0], dtype=float)
+    x_a = np.asarray(attacker_traj_txy[1], dtype=float)
+    y_a = np.asarray(attacker_traj_txy[2], dtype=float)
+    thetas = np.asarray(_theta_grid(params), dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    if stats is not None:
+        stats._set_grid(t_a.size, delays.size, thetas.size)
+    n_d, n_th, n_v = delays.size, thetas.size, max(2, int(model.n_speeds))
+    if t_a.size == 0 or n_th == 0 or n_d == 0:
+        return None
+    ii, jj = np.nonzero((y_a[:, None] >= 0) & (t_a[:, None] - delays[None, :] > 0))
+    if ii.size == 0:
+        return None
+    tau = t_a[ii] - delays[jj]
+    dx = x_a[ii] - params.xd0
+    speeds = v0d_max * np.arange(1, n_v + 1) / n_v
+    th_p, v_p = (a.ravel() for a in np.meshgrid(thetas, speeds, indexing='ij'))
+    dt = min(params.dt_attacker, params.dt_delay)
+    flight = integrate(model, params.xd0, params.yd0, v_p * np.cos(th_p), v_p * np.sin(th_p),
+                       dt, params.g, t_max=float(tau.max()))
+    t1 = time.perf_counter()
+
+    found = []  # por theta: (error aprox., retardo, orden, par, theta, v_lo, v_hi, x_lo, x_hi)
+    for k in range(n_th):
+        sgn = 1.0 if math.cos(thetas[k]) > 0 else -1.0
+        sel = np.flatnonzero(dx * sgn > 0)
+        if stats is not None:
+            stats.candidates += sel.size
+        base = k * n_v
+
+        def along(level, idx):
+            xl, yl = flight.position_at(base + level, tau[idx])
+            xl = sgn * (xl - params.xd0)
+            return np.where(np.isnan(xl), -np.inf, xl), yl
+
+        # alcance con v0d_max y, después, bisección del primer nivel que llega a dx
+        target = sgn * dx
+        x_top, _ = along(n_v - 1, sel)
+        sel = sel[x_top >= target[sel]]
+        if sel.size == 0:
+            continue
+        lo = np.zeros(sel.size, dtype=np.int64)
+        hi = np.full(sel.size, n_v - 1)
+        while True:
+            open_ = lo < hi
+            if not open_.any():
+                break
+            mid = (lo + hi) // 2
+            xm, _ = along(mid, sel)
+            reach = xm >= target[sel]
+            hi = np.where(open_ & reach, mid, hi)
+            lo = np.where(open_ & ~reach, mid + 1, lo)
+        keep = hi > 0
+        sel, hi = sel[keep], hi[keep]
+        x_hi, y_hi = along(hi, sel)
+        x_lo, y_lo = along(hi - 1, sel)
+        ok = np.isfinite(x_lo) & (x_hi > x_lo)
+        sel, hi, x_hi, y_hi, x_lo, y_lo = sel[ok], hi[ok], x_hi[ok], y_hi[ok], x_lo[ok], y_lo[ok]
+        w = (target[sel] - x_lo) / (x_hi - x_lo)
+        err = np.abs(y_a[ii[sel]] - (y_lo + w * (y_hi - y_lo)))
+        acc = np.flatnonzero(err <= params.eps)
+        if acc.size:
+            q = sel[acc]
+            found.append((err[acc], delays[jj[q]], (ii[q] * n_d + jj[q]) * n_th + k, q,
+                          np.full(acc.size, k), speeds[hi[acc] - 1], speeds[hi[acc]],
+                          x_lo[acc], x_hi[acc]))
+    if stats is not None:
+        stats.add_time('setup', t1 - t0)
+    if not found:
+        if stats is not None:
+            stats.add_time('sweep', time.perf_counter() - t1)
+        return None
+
+    # refinar por secante los mejores candidatos aproximados, de _REFINE_MAX en _REFINE_MAX:
+    # si ninguno del lote casa x dentro de eps se pasa al siguiente lote
+    cols = [np.concatenate(c) for c in zip(*found)]
+    order = np.lexsort((cols[2], cols[1], cols[0]))
+    best = None
+    for s in range(0, order.size, _REFINE_MAX):
+        batch = [c[order[s:s + _REFINE_MAX]] for c in cols]
+        best = _refine_batch(batch, thetas, tau, dx, y_a[ii[batch[3]]], params, v0d_max, model, dt)
+        if best is not None:
+            break
+    if stats is not None:
+        stats.add_time('sweep', time.perf_counter() - t1)
+    if best is None:
+        return None
+    e, delay, th, v, q = best
+    i = int(ii[q])
+    return InterceptSolution(theta_d=th, delay=delay, v0_d=v,
+                             impact_time=float(t_a[i]), impact_point=(float(x_a[i]), float(y_a[i])),
+                             error=e)
+
+
+def _refine_batch(batch, thetas: np.ndarray, tau: np.ndarray, dx: np.ndarray, y_att: np.ndarray,
+                  params: InterceptParams, v0d_max: float, model: DragModel, dt: float
+                  ) -> Optional[Tuple[float, float, float, float, int]]:
+    """Secante (todos a la vez) sobre un lote de candidatos de solve_intercept_drag.
+
+    Devuelve (error, retardo, theta, v0d, par) del mejor que casa x dentro de eps, o None.
+    """
+    _, delay, order, q, kt, va, vb, xa_, xb_ = batch
+    th = thetas[kt]
+    sgn = np.where(np.cos(th) > 0, 1.0, -1.0)
+    target = sgn * dx[q]
+    rows = np.arange(q.size)
+    for it in range(_REFINE_ITERS + 1):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v = np.where(xb_ != xa_, vb + (target - xb_) * (vb - va) / (xb_ - xa_), vb)
+        v = np.clip(np.where(np.isfinite(v), v, vb), 0.0, v0d_max)
+        fl = integrate(model, params.xd0, params.yd0, v * np.cos(th), v * np.sin(th),
+                       dt, params.g, t_max=float(tau[q].max()))
+        xv, yv = fl.position_at(rows, tau[q])
+        xv = sgn * (xv - params.xd0)
+        if it == _REFINE_ITERS:
+            break
+        va, xa_, vb, xb_ = vb, xb_, v, np.where(np.isnan(xv), xb_, xv)
+    err = np.abs(y_att - yv)
+    best = None
+    for r in range(q.size):
+        e = float(err[r])
+        if not e <= params.eps or not abs(xv[r] - target[r]) <= 1e-6 * max(1.0, abs(target[r])):
+            continue
+        cand = (e, float(delay[r]), int(order[r]), r)
+        if best is None or cand[0] < best[0] - _TIE_TOL or (
+            abs(cand[0] - best[0]) <= _TIE_TOL and cand[1:3] < best[1:3]
+        ):
+            best = cand
+    if best is None:
+        return None
+    e, d, _, r = best
+    return e, d, float(th[r]), float(v[r]), int(q[r])
@@ -1,11 +1,19 @@
 """Solvers de intercepción (enfoque A: barrido de punto de encuentro).
 """
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, List, Tuple
+import dataclasses
 import math
+import time
 
-from .physics import position_at, GRAVITY_DEFAULT
+import numpy as np
+
+from .physics import LaunchState, flight_time, position_at, GRAVITY_DEFAULT
+from .reach import ReachEnvelope
+
+if TYPE_CHECKING:
+    from .drag import DragModel
 
 @dataclass
 class InterceptParams:
@@ -22,6 +30,70 @@ class InterceptParams:
     delay_max: float
     eps: float = 1.0
     g: float = GRAVITY_DEFAULT
+    # modo multirresolución (grueso -> fino)
+    adaptive: bool = False
+    coarse_factor: int = 4    # reducción de paso entre niveles
+    max_depth: int = 3        # niveles de refinamiento hasta la malla completa
+    stop_error: float = 1e-3  # parada temprana al hallar error <= stop_error (m)
+
+@dataclass
+class SolverStats:
+    """Contadores de un solve, rellenados in situ si se pasa al solver.
+
+    Con detailed=True los barridos uniformes ('numpy' y 'python') reparten toda la malla
+    entre pruned + rejected_sign + rejected_vmax + rejected_eps + accepted y guardan en
+    best_miss el menor error con v0d válida aunque supere eps.
+    """
+    candidates: int = 0   # candidatos (t_a, retardo, theta) evaluados
+    full_grid: int = 0    # tamaño de la malla uniforme completa
+    levels: int = 0       # niveles recorridos (modo adaptativo)
+    early_stop: bool = False
+    # dimensiones de la malla (muestras del atacante, retardos, ángulos)
+    n_samples: int = 0
+    n_delays: int = 0
+    n_thetas: int = 0
+    # desglose de descartes (sólo con detailed)
+    detailed: bool = False
+    pruned: int = 0         # fuera de la envolvente de alcance, Ya < 0 o tau <= 0
+    rejected_sign: int = 0  # v0d <= 0
+    rejected_vmax: int = 0  # v0d > v0d_max
+    rejected_eps: int = 0   # error > eps
+    accepted: int = 0       # error <= eps
+    best_miss: float = math.inf
+    phases: Dict[str, float] = field(default_factory=dict)  # segundos por fase
+
+    @property
+    def fraction(self) -> float:
+        return self.candidates / self.full_grid if self.full_grid else 0.0
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def merge(self, other: 'SolverStats') -> None:
+        """Acumula los contadores de un solve parcial (p. ej. un bloque en streaming)."""
+        self.candidates += other.candidates
+        self.full_grid += other.full_grid
+        self.levels = max(self.levels, other.levels)
+        self.n_samples += other.n_samples
+        self.n_delays = max(self.n_delays, other.n_delays)
+        self.n_thetas = max(self.n_thetas, other.n_thetas)
+        self.pruned += other.pruned
+        self.rejected_sign += other.rejected_sign
+        self.rejected_vmax += other.rejected_vmax
+        self.rejected_eps += other.rejected_eps
+        self.accepted += other.accepted
+        self.best_miss = min(self.best_miss, other.best_miss)
+        for phase, seconds in other.phases.items():
+            self.add_time(phase, seconds)
+
+    def _set_grid(self, n_samples: int, n_delays: int, n_thetas: int) -> None:
+        self.n_samples, self.n_delays, self.n_thetas = n_samples, n_delays, n_thetas
+        self.full_grid = n_samples * n_delays * n_thetas
+
+    def _close_breakdown(self) -> None:
+        # lo que no se evaluó ni se rechazó por un criterio explícito quedó podado
+        self.pruned = self.full_grid - (self.rejected_sign + self.rejected_vmax
+                                        + self.rejected_eps + self.accepted)
 
 @dataclass
 class InterceptSolution:
@@ -33,18 +105,15 @@ class InterceptSolution:
     error: float
 
 
-def solve_intercept_enumeration(attacker_traj_txy: Tuple[list, list, list],
-                                params: InterceptParams,
-                                v0d_max: float) -> Optional[InterceptSolution]:
-    """Barrido por candidato de tiempo del atacante, retardo y ángulo del defensor.
+# Tamaño máximo (en elementos) de cada bloque (t_a, retardo, theta) que se evalúa de una vez
+_CHUNK_ELEMS = 1 << 16
+# Tolerancia de empate en el error para desempatar por retardo
+_TIE_TOL = 1e-9
+# Holgura relativa de la envolvente para no descartar candidatos frontera por redondeo
+_REACH_MARGIN = 1e-9
 
-    attacker_traj_txy: (t_a, x_a, y_a) listas de igual longitud.
-    v0d_max: velocidad máxima posible del defensor por su resorte.
-    """
-    t_a, x_a, y_a = attacker_traj_txy
-    best: Optional[InterceptSolution] = None
 
-    # precomputar ángulos
+def _theta_grid(params: InterceptParams) -> List[float]:
     thetas: List[float] = []
     th = params.theta_min
     while th <= params.theta_max + 1e-12:
@@ -52,39 +121,636 @@ def solve_intercept_enumeration(attacker_traj_txy: Tuple[list, list, list],
         if abs(math.cos(th)) > 1e-3:
             thetas.append(th)
         th += params.dtheta
+    return thetas
+
 
-    # retardo grid
+def _delay_grid(params: InterceptParams) -> List[float]:
     delays: List[float] = []
     d = params.delay_min
     while d <= params.delay_max + 1e-12:
         delays.append(d)
         d += params.dt_delay
+    return delays
+
+
+def _envelope(params: InterceptParams, v0d_max: float) -> ReachEnvelope:
+    return ReachEnvelope(params.xd0, params.yd0, v0d_max * (1 + _REACH_MARGIN), params.g)
+
+
+def _make_solution(ta: float, Xa: float, Ya: float, delay: float, th: float,
+                   params: InterceptParams) -> InterceptSolution:
+    """Construye la solución con las mismas fórmulas que el barrido escalar."""
+    tau = ta - delay
+    v0d = (Xa - params.xd0) / (tau * math.cos(th))
+    Ypred = params.yd0 + v0d * math.sin(th) * tau - 0.5 * params.g * tau * tau
+    return InterceptSolution(theta_d=th, delay=delay, v0_d=v0d, impact_time=ta,
+                             impact_point=(Xa, Ya), error=abs(Ya - Ypred))
+
+
+def solve_intercept_enumeration(attacker_traj_txy: Tuple[list, list, list],
+                                params: InterceptParams,
+                                v0d_max: float,
+                                backend: str = 'numpy',
+                                stats: Optional[SolverStats] = None,
+                                model: Optional['DragModel'] = None) -> Optional[InterceptSolution]:
+    """Barrido por candidato de tiempo del atacante, retardo y ángulo del defensor.
+
+    attacker_traj_txy: (t_a, x_a, y_a) listas de igual longitud.
+    v0d_max: velocidad máxima posible del defensor por su resorte.
+    backend: 'numpy' (vectorizado por bloques) o 'python' (bucle de referencia).
+    stats: si se pasa, se rellena con los contadores del solve.
+    Con params.adaptive se usa la búsqueda multirresolución (siempre NumPy).
+    model: modelo físico del defensor (misiles.core.drag.DragModel); con rozamiento se
+    resuelve con el integrador (solve_intercept_drag) en lugar de la forma cerrada.
+    """
+    if model is not None and not model.closed_form:
+        from .drag import solve_intercept_drag
+        return solve_intercept_drag(attacker_traj_txy, params, v0d_max, model, stats)
+    if params.adaptive:
+        return _solve_enumeration_adaptive(attacker_traj_txy, params, v0d_max, stats)
+    if backend == 'numpy':
+        return _solve_enumeration_numpy(attacker_traj_txy, params, v0d_max, stats)
+    if backend != 'python':
+        raise ValueError(f"backend desconocido: {backend!r}")
+
+    t0 = time.perf_counter()
+    # floats de Python: indexar arrays elemento a elemento es lento en el bucle escalar
+    t_a, x_a, y_a = (np.asarray(a, dtype=float) for a in attacker_traj_txy)
+    best: Optional[InterceptSolution] = None
+    detailed = stats is not None and stats.detailed
+
+    # precomputar ángulos y retardos
+    thetas = _theta_grid(params)
+    delays = _delay_grid(params)
+    if stats is not None:
+        stats._set_grid(len(t_a), len(delays), len(thetas))
+
+    # envolvente de alcance: muestras y pares (muestra, retardo) imposibles, en bloque
+    env = _envelope(params, v0d_max)
+    tol = params.eps + _TIE_TOL
+    reach = env.contains(x_a, y_a, tol).tolist()
+    pair_ok = env.feasible_tau(x_a[:, None], y_a[:, None],
+                               t_a[:, None] - np.asarray(delays)[None, :], tol).tolist()
+    t_a, x_a, y_a = t_a.tolist(), x_a.tolist(), y_a.tolist()
+    n_sign = n_vmax = n_eps = n_ok = 0
+    best_miss = math.inf
+    t1 = time.perf_counter()
 
     for ia in range(0, len(t_a)):
         ta = t_a[ia]
         Xa = x_a[ia]
         Ya = y_a[ia]
-        if Ya < 0:
+        if Ya < 0 or not reach[ia]:
             continue
-        for delay in delays:
+        for idelay, delay in enumerate(delays):
             tau = ta - delay
-            if tau <= 0:
+            if tau <= 0 or not pair_ok[ia][idelay]:
                 continue
+            if stats is not None:
+                stats.candidates += len(thetas)
             for th in thetas:
                 # derivar v0d desde componente horizontal
                 v0d = (Xa - params.xd0) / (tau * math.cos(th))
                 if v0d <= 0 or not math.isfinite(v0d):
+                    if detailed:
+                        n_sign += 1
                     continue
                 if v0d > v0d_max:
+                    if detailed:
+                        n_vmax += 1
                     continue
                 # comprobar vertical
                 Ypred = params.yd0 + v0d * math.sin(th) * tau - 0.5 * params.g * tau * tau
                 err = abs(Ya - Ypred)
+                if detailed:
+                    best_miss = min(best_miss, err)
+                    if err > params.eps:
+                        n_eps += 1
+                    else:
+                        n_ok += 1
                 if err <= params.eps:
                     sol = InterceptSolution(theta_d=th, delay=delay, v0_d=v0d,
                                             impact_time=ta, impact_point=(Xa, Ya), error=err)
                     if best is None or sol.error < best.error or (
-                        abs(sol.error - best.error) <= 1e-9 and sol.delay < best.delay
+                        abs(sol.error - best.error) <= _TIE_TOL and sol.delay < best.delay
                     ):
                         best = sol
+    if stats is not None:
+        if detailed:
+            stats.rejected_sign += n_sign
+            stats.rejected_vmax += n_vmax
+            stats.rejected_eps += n_eps
+            stats.accepted += n_ok
+            stats.best_miss = min(stats.best_miss, best_miss)
+            stats._close_breakdown()
+        stats.add_time('setup', t1 - t0)
+        stats.add_time('sweep', time.perf_counter() - t1)
+    return best
+
+
+def _better(a: InterceptSolution, b: Optional[InterceptSolution]) -> bool:
+    """Criterio del barrido: menor error y, a igualdad (tolerancia), menor retardo."""
+    return b is None or a.error < b.error - _TIE_TOL or (
+        abs(a.error - b.error) <= _TIE_TOL and a.delay < b.delay
+    )
+
+
+def solve_intercept_streaming(chunks: Iterable,
+                              params: InterceptParams,
+                              v0d_max: float,
+                              until: str = 'best',
+                              target_error: Optional[float] = None,
+                              stats: Optional[SolverStats] = None) -> Optional[InterceptSolution]:
+    """Resuelve consumiendo la trayectoria del atacante por bloques (p. ej. iter_trajectory).
+
+    chunks: iterable de bloques (t, x, y) u objetos con atributos t, x, y, en orden temporal.
+    until='best': mismo criterio que el barrido completo; si target_error no es None se
+    detiene en cuanto la mejor solución tiene error <= target_error.
+    until='first': devuelve la intercepción más temprana (primera muestra del atacante con
+    solución, con error <= target_error si se indica) sin leer más bloques.
+    Cada bloque se resuelve con solve_intercept_enumeration según params.
+    """
+    if until not in ('best', 'first'):
+        raise ValueError(f"until desconocido: {until!r}")
+    if until == 'first' and target_error is not None:
+        params = dataclasses.replace(params, eps=min(params.eps, target_error))
+
+    def solve(txy) -> Optional[InterceptSolution]:
+        st = SolverStats(detailed=stats is not None and stats.detailed)
+        sol = solve_intercept_enumeration(txy, params, v0d_max, stats=st)
+        if stats is not None:
+            stats.merge(st)
+        return sol
+
+    best: Optional[InterceptSolution] = None
+    for chunk in chunks:
+        txy = (chunk.t, chunk.x, chunk.y) if hasattr(chunk, 't') else chunk
+        t_c, x_c, y_c = (np.asarray(a, dtype=float) for a in txy)
+        sol = solve((t_c, x_c, y_c))
+        if sol is None:
+            continue
+        if until == 'first':
+            # la existencia de solución es monótona en el prefijo: búsqueda binaria
+            lo, hi = 0, t_c.size - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if solve((t_c[:mid + 1], x_c[:mid + 1], y_c[:mid + 1])) is None:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if stats is not None:
+                stats.early_stop = True
+            return solve((t_c[lo:lo + 1], x_c[lo:lo + 1], y_c[lo:lo + 1]))
+        if _better(sol, best):
+            best = sol
+        if target_error is not None and best.error <= target_error:
+            if stats is not None:
+                stats.early_stop = True
+            break
     return best
+
+
+def _solve_enumeration_numpy(attacker_traj_txy: Tuple[list, list, list],
+                             params: InterceptParams,
+                             v0d_max: float,
+                             stats: Optional[SolverStats] = None) -> Optional[InterceptSolution]:
+    """Mismo barrido que el backend 'python', difundido con NumPy por bloques (ver _sweep_numpy)."""
+    t_a = np.asarray(attacker_traj_txy[0], dtype=float)
+    x_a = np.asarray(attacker_traj_txy[1], dtype=float)
+    y_a = np.asarray(attacker_traj_txy[2], dtype=float)
+    thetas = np.asarray(_theta_grid(params), dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    best = _sweep_numpy(t_a, x_a, x_a - params.xd0, y_a, thetas, delays, params, v0d_max, stats)
+    if best is None:
+        return None
+    _, _, _, i, j, k = best
+    return _make_solution(float(t_a[i]), float(x_a[i]), float(y_a[i]),
+                          float(delays[j]), float(thetas[k]), params)
+
+
+def _sweep_numpy(t_a: np.ndarray, x_a: np.ndarray, dx_all: np.ndarray, y_a: np.ndarray,
+                 thetas: np.ndarray, delays: np.ndarray,
+                 params: InterceptParams, v0d_max: float,
+                 stats: Optional[SolverStats] = None,
+                 lateral: Optional[np.ndarray] = None,
+                 feasible: Optional[list] = None) -> Optional[Tuple[float, float, int, int, int, int]]:
+    """Núcleo del barrido NumPy; devuelve (error, retardo, orden, ia, id, ith) o None.
+
+    Con v0d = dx / (tau cos th) la altura predicha queda yd0 + dx tan th - g tau^2/2,
+    así que el error sólo necesita un producto por elemento, y la cota v0d <= v0d_max
+    se reduce a |cos th| >= |dx| / (v0d_max tau). Los pares (muestra, retardo) con
+    tau <= 0 o con signo de dx incompatible con cos th se descartan antes de difundir.
+    x_a sólo se usa para la envolvente; dx_all es la distancia horizontal con signo.
+    lateral (opcional, por muestra) es un error fijo que se suma en cuadratura (3D).
+    Si se pasa la lista feasible, se le añaden por bloque todos los candidatos con
+    error <= eps como arrays (ia, id, ith, error), no sólo el mejor.
+    """
+    t0 = time.perf_counter()
+    detailed = stats is not None and stats.detailed
+    if stats is not None:
+        stats._set_grid(t_a.size, delays.size, thetas.size)
+    if t_a.size == 0 or thetas.size == 0 or delays.size == 0:
+        if detailed:
+            stats._close_breakdown()
+        return None
+
+    cos_th = np.cos(thetas)
+    tan_th = np.tan(thetas)
+    n_th = thetas.size
+    n_d = delays.size
+    # envolvente de alcance: descarta muestras inalcanzables con v0d_max
+    env = _envelope(params, v0d_max)
+    tol = params.eps + _TIE_TOL
+    reach = (y_a >= 0) & env.contains(x_a, y_a, tol)
+    if detailed:
+        # con dx == 0 no hay v0d > 0 para ningún ángulo
+        r0 = np.flatnonzero(reach & (dx_all == 0))
+        ok0 = env.feasible_tau(x_a[r0, None], y_a[r0, None], t_a[r0, None] - delays[None, :], tol)
+        stats.rejected_sign += int(np.count_nonzero(ok0)) * n_th
+
+    # mejor candidato: (error, retardo, orden de recorrido, ia, id, ith)
+    best: Optional[Tuple[float, float, int, int, int, int]] = None
+    t1 = time.perf_counter()
+
+    # v0d > 0 exige que dx y cos th tengan el mismo signo
+    for sign in (1.0, -1.0):
+        cols = np.flatnonzero(np.sign(cos_th) == sign)
+        rows = np.flatnonzero(reach & (dx_all * sign > 0))
+        if rows.size == 0 or (cols.size == 0 and not detailed):
+            continue
+        tau_grid = t_a[rows, None] - delays[None, :]
+        # ...y retardos cuyo tiempo de vuelo exigiría más de v0d_max (incluye tau <= 0)
+        ir, jd = np.nonzero(env.feasible_tau(x_a[rows, None], y_a[rows, None], tau_grid, tol))
+        if detailed:
+            stats.rejected_sign += ir.size * (n_th - cols.size)
+        if ir.size == 0 or cols.size == 0:
+            continue
+        tau = tau_grid[ir, jd]
+        ia = rows[ir]
+        dx = dx_all[ia]
+        c = y_a[ia] - params.yd0 + 0.5 * params.g * tau * tau
+        cos_min = np.abs(dx) / (v0d_max * tau)
+        abs_cos = np.abs(cos_th[cols])
+        tan_c = tan_th[cols]
+        lat = lateral[ia] if lateral is not None else None
+        if stats is not None:
+            stats.candidates += tau.size * cols.size
+
+        step = max(1, _CHUNK_ELEMS // cols.size)
+        for s in range(0, tau.size, step):
+            sl = slice(s, s + step)
+            err = np.multiply(dx[sl, None], tan_c[None, :])
+            np.subtract(c[sl, None], err, out=err)
+            np.abs(err, out=err)
+            if lat is not None:
+                np.hypot(err, lat[sl, None], out=err)
+            np.copyto(err, np.inf, where=abs_cos[None, :] < cos_min[sl, None])
+            m = float(err.min())
+            if detailed:
+                n_fin = int(np.count_nonzero(np.isfinite(err)))
+                n_ok = int(np.count_nonzero(err <= params.eps))
+                stats.rejected_vmax += err.size - n_fin
+                stats.rejected_eps += n_fin - n_ok
+                stats.accepted += n_ok
+                stats.best_miss = min(stats.best_miss, m)
+            if feasible is not None and m <= params.eps:
+                pi, ci = np.nonzero(err <= params.eps)
+                feasible.append((ia[sl][pi], jd[sl][pi], cols[ci], err[pi, ci]))
+            if not m <= params.eps or (best is not None and m > best[0] + _TIE_TOL):
+                continue
+            # empates dentro de la tolerancia: menor retardo y luego orden de recorrido
+            pi, ci = np.nonzero(err <= min(m + _TIE_TOL, params.eps))
+            p_ia = ia[sl][pi]
+            p_jd = jd[sl][pi]
+            p_th = cols[ci]
+            order = (p_ia * n_d + p_jd) * n_th + p_th
+            k = int(np.lexsort((order, delays[p_jd]))[0])
+            # el error mínimo del bloque decide; el candidato elegido hereda su error
+            cand = (m, float(delays[p_jd[k]]), int(order[k]),
+                    int(p_ia[k]), int(p_jd[k]), int(p_th[k]))
+            if best is None or cand[0] < best[0] - _TIE_TOL or (
+                abs(cand[0] - best[0]) <= _TIE_TOL and cand[1:3] < best[1:3]
+            ):
+                best = cand
+
+    if stats is not None:
+        if detailed:
+            stats._close_breakdown()
+        stats.add_time('setup', t1 - t0)
+        stats.add_time('sweep', time.perf_counter() - t1)
+    return best
+
+
+def _solve_enumeration_adaptive(attacker_traj_txy: Tuple[list, list, list],
+                                params: InterceptParams,
+                                v0d_max: float,
+                                stats: Optional[SolverStats] = None) -> Optional[InterceptSolution]:
+    """Búsqueda grueso -> fino sobre la misma malla (t_a, retardo, theta) del barrido.
+
+    La malla se parte en celdas de lado coarse_factor**max_depth índices y cada nivel
+    divide cada celda activa en coarse_factor**3 subceldas hasta llegar a celdas de un
+    solo punto. La esquina de cada celda se evalúa exactamente y se acota por abajo el
+    error alcanzable dentro de ella con las variaciones máximas de
+    err = |Ya - yd0 - dx tan th + g tau^2/2| y de v0d. Sólo se refinan las celdas cuya
+    cota no supera eps ni el mejor error ya hallado (ramificación y poda), y se para
+    en cuanto el mejor error <= params.stop_error.
+    """
+    t0 = time.perf_counter()
+    t_a = np.asarray(attacker_traj_txy[0], dtype=float)
+    x_a = np.asarray(attacker_traj_txy[1], dtype=float)
+    y_a = np.asarray(attacker_traj_txy[2], dtype=float)
+    thetas = np.asarray(_theta_grid(params), dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    dims = (t_a.size, delays.size, thetas.size)
+    if stats is not None:
+        stats._set_grid(*dims)
+    if 0 in dims:
+        return None
+    # envolvente de alcance: celdas sin ninguna muestra alcanzable no se refinan
+    reach = (y_a >= 0) & _envelope(params, v0d_max).contains(x_a, y_a, params.eps + _TIE_TOL)
+    if not reach.any():
+        return None
+    reach_cum = np.concatenate(([0], np.cumsum(reach)))
+
+    cos_th = np.cos(thetas)
+    tan_th = np.tan(thetas)
+    # variación máxima entre muestras consecutivas del atacante
+    if t_a.size > 1:
+        step_t = float(np.max(np.abs(np.diff(t_a))))
+        step_x = float(np.max(np.abs(np.diff(x_a))))
+        step_y = float(np.max(np.abs(np.diff(y_a))))
+    else:
+        step_t = step_x = step_y = 0.0
+    step_tau = max(step_t, params.dt_delay)
+
+    factor = max(2, int(params.coarse_factor))
+    stride = factor ** max(0, int(params.max_depth))
+    ii, jj, kk = (a.ravel() for a in np.meshgrid(np.arange(0, dims[0], stride),
+                                                 np.arange(0, dims[1], stride),
+                                                 np.arange(0, dims[2], stride),
+                                                 indexing='ij'))
+
+    # mejor candidato: (error, retardo, orden de recorrido, ia, id, ith)
+    best: Optional[Tuple[float, float, int, int, int, int]] = None
+    t1 = time.perf_counter()
+    if stats is not None:
+        stats.add_time('setup', t1 - t0)
+    while True:
+        if stats is not None:
+            stats.levels += 1
+            stats.candidates += ii.size
+        tau = t_a[ii] - delays[jj]
+        dx = x_a[ii] - params.xd0
+        tan = tan_th[kk]
+        err = np.abs(y_a[ii] - params.yd0 + 0.5 * params.g * tau * tau - dx * tan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v0d = dx / (tau * cos_th[kk])
+        ok = (y_a[ii] >= 0) & (tau > 0) & (v0d > 0) & (v0d <= v0d_max) & (err <= params.eps)
+        if ok.any():
+            idx = np.flatnonzero(ok)
+            m = float(err[idx].min())
+            ties = idx[err[idx] <= min(m + _TIE_TOL, params.eps)]
+            order = (ii[ties] * dims[1] + jj[ties]) * dims[2] + kk[ties]
+            k = int(np.lexsort((order, delays[jj[ties]]))[0])
+            t = ties[k]
+            cand = (m, float(delays[jj[t]]), int(order[k]), int(ii[t]), int(jj[t]), int(kk[t]))
+            if best is None or cand[0] < best[0] - _TIE_TOL or (
+                abs(cand[0] - best[0]) <= _TIE_TOL and cand[1:3] < best[1:3]
+            ):
+                best = cand
+        if best is not None and best[0] <= params.stop_error:
+            if stats is not None:
+                stats.early_stop = True
+            break
+        if stride == 1:
+            break
+
+        # cotas sobre la celda [i, i + stride) x [j, j + stride) x [k, k + stride)
+        h = stride - 1
+        h_tau = h * step_tau
+        k_hi = np.minimum(kk + h, dims[2] - 1)
+        # si la celda cruza th = ±90° tan no está acotada: no se poda
+        branch = np.sign(cos_th[kk]) == np.sign(cos_th[k_hi])
+        tan_hi = tan_th[k_hi]
+        tan_abs = np.maximum(np.abs(tan), np.abs(tan_hi))
+        slack = (np.abs(dx) * np.abs(tan_hi - tan)
+                 + h * (step_y + step_x * tan_abs)
+                 + params.g * (np.abs(tau) * h_tau + 0.5 * h_tau * h_tau))
+        lower = np.where(branch, err - slack, -np.inf)
+        dx_lo = np.maximum(np.abs(dx) - h * step_x, 0.0)
+        tau_hi = tau + h_tau
+        cos_hi = np.maximum(np.abs(cos_th[kk]), np.abs(cos_th[k_hi]))
+        cos_hi = np.where((thetas[kk] < 0) & (thetas[k_hi] > 0), 1.0, cos_hi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v_lo = np.where(branch & (tau_hi > 0), dx_lo / (tau_hi * cos_hi), 0.0)
+        bound = params.eps if best is None else min(params.eps, best[0] + _TIE_TOL)
+        has_reach = reach_cum[np.minimum(ii + stride, dims[0])] > reach_cum[ii]
+        active = np.flatnonzero((lower <= bound) & (v_lo <= v0d_max) & (tau_hi > 0) & has_reach)
+        if active.size == 0:
+            break
+
+        # subceldas de las celdas activas con el paso del siguiente nivel
+        nxt = max(1, stride // factor)
+        offsets = np.arange(0, stride, nxt)
+        ci, cj, ck = (a.ravel() for a in np.broadcast_arrays(
+            (ii[active, None] + offsets)[:, :, None, None],
+            (jj[active, None] + offsets)[:, None, :, None],
+            (kk[active, None] + offsets)[:, None, None, :]))
+        inside = (ci < dims[0]) & (cj < dims[1]) & (ck < dims[2])
+        ii, jj, kk = ci[inside], cj[inside], ck[inside]
+        stride = nxt
+
+    if stats is not None:
+        stats.add_time('sweep', time.perf_counter() - t1)
+    if best is None:
+        return None
+    _, _, _, i, j, k = best
+    return _make_solution(float(t_a[i]), float(x_a[i]), float(y_a[i]),
+                          float(delays[j]), float(thetas[k]), params)
+
+def required_launch(dx, dy, tau, g: float = GRAVITY_DEFAULT):
+    """Ángulo (rad) y velocidad de lanzamiento para alcanzar (dx, dy) justo en tau.
+
+    Despeja las dos ecuaciones balísticas de `position_at`:
+    dx = v0 cos(th) tau, dy = v0 sin(th) tau - g tau^2 / 2. Acepta escalares o arrays.
+    """
+    vx = np.divide(dx, tau)
+    vy = np.divide(dy, tau) + 0.5 * g * np.asarray(tau)
+    return np.arctan2(vy, vx), np.hypot(vx, vy)
+
+
+def solve_intercept_closed_form(attacker_traj_txy: Tuple[list, list, list],
+                                params: InterceptParams,
+                                v0d_max: float,
+                                stats: Optional[SolverStats] = None) -> Optional[InterceptSolution]:
+    """Resuelve theta_d y v0_d exactamente por cada (muestra, retardo), sin barrer ángulos.
+
+    Coste O(N_atacante x N_retardo), independiente de dtheta. Los límites de velocidad
+    y ángulo se aplican sobre la solución analítica; el error es nulo salvo redondeo,
+    así que el desempate efectivo es el menor retardo y luego la muestra más temprana.
+    """
+    t_a = np.asarray(attacker_traj_txy[0], dtype=float)
+    x_a = np.asarray(attacker_traj_txy[1], dtype=float)
+    y_a = np.asarray(attacker_traj_txy[2], dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    rows = np.flatnonzero((y_a >= 0) & _envelope(params, v0d_max).contains(x_a, y_a))
+    if stats is not None:
+        # aquí cada candidato es un par (muestra, retardo)
+        stats.n_samples, stats.n_delays = t_a.size, delays.size
+        stats.full_grid = t_a.size * delays.size
+        stats.candidates += rows.size * delays.size
+    if rows.size == 0 or delays.size == 0:
+        return None
+
+    # mejor candidato: (retardo, ia, id, theta)
+    best: Optional[Tuple[float, int, int, float]] = None
+    step = max(1, _CHUNK_ELEMS // delays.size)
+    for s in range(0, rows.size, step):
+        r = rows[s:s + step]
+        tau = t_a[r, None] - delays[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            th, v0 = required_launch(x_a[r, None] - params.xd0, y_a[r, None] - params.yd0,
+                                     tau, params.g)
+            ok = ((tau > 0) & (v0 > 0) & (v0 <= v0d_max)
+                  & (th >= params.theta_min) & (th <= params.theta_max)
+                  & (np.abs(np.cos(th)) > 1e-3))
+        if not ok.any():
+            continue
+        ii, jj = np.nonzero(ok)
+        # orden C: a igual retardo gana la muestra más temprana
+        k = int(np.argmin(delays[jj]))
+        if best is None or delays[jj[k]] < best[0]:
+            best = (float(delays[jj[k]]), int(r[ii[k]]), int(jj[k]), float(th[ii[k], jj[k]]))
+
+    if best is None:
+        return None
+    delay, i, _, th_d = best
+    return _make_solution(float(t_a[i]), float(x_a[i]), float(y_a[i]), delay, th_d, params)
+
+
+def _relative_motion(attacker: LaunchState, xd0: float, yd0: float, delay: float,
+                     vdx: float, vdy: float, g: float) -> Tuple[float, float, float, float]:
+    """(rx0, rvx, ry0, rvy) con atacante - defensor = (rx0 + rvx t, ry0 + rvy t) para t >= delay.
+
+    La gravedad actúa igual sobre los dos, así que la posición relativa es lineal en t.
+    """
+    vax = attacker.v0 * math.cos(attacker.theta)
+    vay = attacker.v0 * math.sin(attacker.theta)
+    return (attacker.x0 - xd0 + vdx * delay, vax - vdx,
+            attacker.y0 - yd0 + vdy * delay + 0.5 * g * delay * delay, vay - vdy - g * delay)
+
+
+def miss_distance(attacker: LaunchState, sol: InterceptSolution, params: InterceptParams) -> float:
+    """Distancia mínima real entre atacante y defensor con el disparo de `sol`.
+
+    A diferencia de sol.error (|Ya - Ypred| en una muestra), mide la máxima aproximación
+    de las dos parábolas entre el disparo y la llegada del atacante al suelo.
+    """
+    vdx = sol.v0_d * math.cos(sol.theta_d)
+    vdy = sol.v0_d * math.sin(sol.theta_d)
+    rx0, rvx, ry0, rvy = _relative_motion(attacker, params.xd0, params.yd0, sol.delay, vdx, vdy, params.g)
+    t_end = flight_time(attacker.v0, attacker.theta, attacker.y0, params.g)
+    v2 = rvx * rvx + rvy * rvy
+    t = -(rx0 * rvx + ry0 * rvy) / v2 if v2 > 0 else sol.delay
+    t = min(max(t, sol.delay), max(t_end, sol.delay))
+    return math.hypot(rx0 + rvx * t, ry0 + rvy * t)
+
+
+def _earliest_in_cone(attacker: LaunchState, params: InterceptParams, v_max: float,
+                      delay: float, lo: float, hi: float, th_lo: float, th_hi: float) -> float:
+    """Primer t en [lo, hi] con disparo exacto de velocidad <= v_max y ángulo en [th_lo, th_hi].
+
+    Con tau = t - delay, el disparo exacto es v = P(t) / tau, donde P(t) = (Px, Pw) es lineal
+    en t (ver _relative_motion con v_d = 0). Así |v| <= v_max es una desigualdad cuadrática
+    en t y el ángulo dentro del cono (apertura < pi) son dos lineales: todas se despejan
+    sin muestrear. Devuelve math.inf si no hay ninguno.
+    """
+    px0, pxv, pw0, pwv = _relative_motion(attacker, params.xd0, params.yd0, delay, 0.0, 0.0, params.g)
+    # ángulo: cruz(u(th_lo), P) >= 0 y cruz(P, u(th_hi)) >= 0
+    for c0, c1 in ((math.cos(th_lo) * pw0 - math.sin(th_lo) * px0,
+                    math.cos(th_lo) * pwv - math.sin(th_lo) * pxv),
+                   (math.sin(th_hi) * px0 - math.cos(th_hi) * pw0,
+                    math.sin(th_hi) * pxv - math.cos(th_hi) * pwv)):
+        if c1 > 0:
+            lo = max(lo, -c0 / c1)
+        elif c1 < 0:
+            hi = min(hi, -c0 / c1)
+        elif c0 < 0:
+            return math.inf
+    if lo > hi:
+        return math.inf
+    # velocidad: |P(t)|^2 - v_max^2 (t - delay)^2 <= 0
+    v2 = v_max * v_max
+    a = pxv * pxv + pwv * pwv - v2
+    b = 2.0 * (px0 * pxv + pw0 * pwv + v2 * delay)
+    c = px0 * px0 + pw0 * pw0 - v2 * delay * delay
+    if a == 0.0:
+        if b > 0:
+            hi = min(hi, -c / b)
+        elif b < 0:
+            lo = max(lo, -c / b)
+        elif c > 0:
+            return math.inf
+        return lo if lo <= hi else math.inf
+    disc = b * b - 4.0 * a * c
+    if disc < 0:
+        return lo if a < 0 else math.inf
+    # raíces estables (sin cancelación)
+    q = -0.5 * (b + math.copysign(math.sqrt(disc), b))
+    r1, r2 = sorted((q / a, c / q if q != 0 else q / a))
+    if a > 0:
+        t = max(lo, r1)
+        return t if t <= min(hi, r2) else math.inf
+    if lo <= r1:
+        return lo
+    t = max(lo, r2)
+    return t if t <= hi else math.inf
+
+
+def solve_intercept_continuous(attacker: LaunchState,
+                               params: InterceptParams,
+                               v0d_max: float,
+                               stats: Optional[SolverStats] = None) -> Optional[InterceptSolution]:
+    """Intercepción exacta en tiempo continuo (sin muestrear la trayectoria del atacante).
+
+    Para cada retardo de la malla, en orden creciente, despeja el primer instante de
+    encuentro con un disparo exacto que respete v0d_max y [theta_min, theta_max] (ver
+    _earliest_in_cone); el primer retardo con solución decide. No depende de dt_attacker,
+    dtheta ni eps, y el error devuelto es la distancia mínima real (miss_distance), nula
+    salvo redondeo. Mismo desempate que solve_intercept_closed_form: menor retardo y
+    luego el impacto más temprano.
+    """
+    t_end = flight_time(attacker.v0, attacker.theta, attacker.y0, params.g)
+    if attacker.y0 < 0 or not math.isfinite(t_end):
+        return None
+    v_max = v0d_max * (1 + _REACH_MARGIN)
+    # conos de apertura < pi (si el rango de ángulos es mayor se parte en dos)
+    cones = [(params.theta_min, params.theta_max)]
+    if params.theta_max - params.theta_min >= math.pi - 1e-9:
+        mid = 0.5 * (params.theta_min + params.theta_max)
+        cones = [(params.theta_min, mid), (mid, params.theta_max)]
+    delays = _delay_grid(params)
+    if stats is not None:
+        stats.n_delays = len(delays)
+        stats.full_grid = len(delays)
+    for delay in delays:
+        if stats is not None:
+            stats.candidates += 1
+        lo = max(delay, 0.0)
+        if lo > t_end:
+            break  # el atacante ya está en el suelo para este retardo y los siguientes
+        t = min(_earliest_in_cone(attacker, params, v_max, delay, lo, t_end, *cone) for cone in cones)
+        if not math.isfinite(t) or t <= delay:
+            continue
+        Xa, Ya = position_at(t, attacker.x0, attacker.y0, attacker.v0, attacker.theta, params.g)
+        tau = t - delay
+        th, v0d = required_launch(Xa - params.xd0, Ya - params.yd0, tau, params.g)
+        th, v0d = float(th), float(v0d)
+        if not v0d > 0:
+            continue
+        sol = InterceptSolution(theta_d=th, delay=delay, v0_d=min(v0d, v0d_max), impact_time=t,
+                                impact_point=(Xa, max(Ya, 0.0)), error=0.0)
+        sol.error = miss_distance(attacker, sol, params)
+        return sol
+    return None
+
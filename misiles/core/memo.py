@@ -0,0 +1,143 @@
+"""Memoización LRU de trayectorias y soluciones de intercepción.
+
+Las claves se forman con las entradas físicas cuantizadas (x0, y0, v0, theta, dt, g y
+los parámetros del defensor), de modo que volver a un estado ya probado es inmediato.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from typing import Any, Hashable, Optional, Tuple
+import threading
+
+from .physics import GRAVITY_DEFAULT
+from .trajectories import Trajectory, generate_trajectory
+from .intercept import InterceptParams, InterceptSolution, solve_intercept_enumeration
+from .anytime import AnytimeResult, solve_intercept_anytime
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """Diccionario acotado que descarta la entrada menos usada recientemente."""
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser > 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+class SolveMemo:
+    """Caché LRU delante de generate_trajectory y del solver de intercepción.
+
+    quantum: resolución absoluta con la que se comparan las entradas (m, s, rad, m/s).
+    Las trayectorias devueltas son compartidas y de sólo lectura. Es seguro usarla
+    desde varios hilos (p. ej. la interfaz y un hilo de cálculo): el cerrojo sólo protege
+    las consultas y altas en las LRU, y el cálculo se hace fuera, así que un hilo no
+    espera a que otro termine de resolver (si coinciden en la misma clave, ambos calculan).
+    """
+
+    def __init__(self, maxsize: int = 256, quantum: float = 1e-6):
+        if quantum <= 0:
+            raise ValueError("quantum debe ser > 0")
+        self.quantum = quantum
+        self.trajectories = LRUCache(maxsize)
+        self.solutions = LRUCache(maxsize)
+        self._lock = threading.RLock()
+
+    def _q(self, *values: Any) -> Tuple:
+        return tuple(round(v / self.quantum) if isinstance(v, float) else v for v in values)
+
+    def trajectory(self, x0: float, y0: float, v0: float, theta: float, dt: float,
+                   g: float = GRAVITY_DEFAULT) -> Trajectory:
+        key = self._q(float(x0), float(y0), float(v0), float(theta), float(dt), float(g))
+        with self._lock:
+            traj = self.trajectories.get(key)
+        if traj is None:
+            traj = generate_trajectory(x0, y0, v0, theta, dt, g)
+            for a in (traj.t, traj.x, traj.y):
+                a.flags.writeable = False
+            with self._lock:
+                self.trajectories.put(key, traj)
+        return traj
+
+    def solve(self, x0: float, y0: float, v0: float, theta: float,
+              params: InterceptParams, v0d_max: float) -> Tuple[Trajectory, Optional[InterceptSolution]]:
+        """Trayectoria del atacante (muestreada a params.dt_attacker) y su intercepción."""
+        key = self._q(float(x0), float(y0), float(v0), float(theta), float(v0d_max),
+                      *astuple(params))
+        traj = self.trajectory(x0, y0, v0, theta, params.dt_attacker, params.g)
+        with self._lock:
+            sol = self.solutions.get(key, _MISSING)
+        if sol is _MISSING:
+            sol = solve_intercept_enumeration((traj.t, traj.x, traj.y), params, v0d_max)
+            with self._lock:
+                self.solutions.put(key, sol)
+        return traj, sol
+
+    def solve_anytime(self, x0: float, y0: float, v0: float, theta: float,
+                      params: InterceptParams, v0d_max: float,
+                      budget: float) -> Tuple[Trajectory, AnytimeResult]:
+        """Como solve, pero con presupuesto (misiles.core.anytime).
+
+        Sólo se memoiza la solución exacta: si el resultado no está completo, se guarda
+        cuando alguien termine la búsqueda (finish o refine).
+        """
+        key = self._q(float(x0), float(y0), float(v0), float(theta), float(v0d_max),
+                      *astuple(params))
+        traj = self.trajectory(x0, y0, v0, theta, params.dt_attacker, params.g)
+        with self._lock:
+            sol = self.solutions.get(key, _MISSING)
+        if sol is not _MISSING:
+            return traj, AnytimeResult(sol, complete=True, levels=0, seconds=0.0)
+
+        def store(exact: Optional[InterceptSolution]) -> None:
+            with self._lock:
+                self.solutions.put(key, exact)
+
+        res = solve_intercept_anytime((traj.t, traj.x, traj.y), params, v0d_max,
+                                      budget=budget, on_complete=store)
+        return traj, res
@@ -0,0 +1,162 @@
+"""Conjunto de soluciones factibles y frente de Pareto sobre varios objetivos.
+
+Un único barrido de la malla (t_a, retardo, theta) de solve_intercept_enumeration
+recoge todos los candidatos con error <= eps (no sólo el mejor); sobre ellos se calcula
+el frente de Pareto de los objetivos elegidos, sin resolver una vez por objetivo.
+
+Objetivos (OBJECTIVES): error, delay, impact_time (antes es mejor), altitude (altura de
+intercepción, más alta es mejor) y v0_d (velocidad del defensor; la energía del resorte
+crece con v0_d^2, así que el frente es el mismo).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import csv
+import json
+import time
+
+import numpy as np
+
+from .intercept import (InterceptParams, InterceptSolution, SolverStats, _delay_grid,
+                        _sweep_numpy, _theta_grid)
+
+PARETO_FIELDS = ('theta_d', 'delay', 'v0_d', 'impact_time', 'impact_x', 'impact_y', 'error')
+
+# objetivo -> (columna, signo): se minimiza signo * columna
+OBJECTIVES: Dict[str, Tuple[str, float]] = {
+    'error': ('error', 1.0),
+    'delay': ('delay', 1.0),
+    'impact_time': ('impact_time', 1.0),
+    'altitude': ('impact_y', -1.0),
+    'v0_d': ('v0_d', 1.0),
+}
+
+
+@dataclass
+class SolutionTable:
+    """Soluciones en columnas (PARETO_FIELDS), ordenables y exportables a .csv o .jsonl."""
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return int(self.columns['delay'].size)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.columns[key]
+
+    def take(self, idx: np.ndarray) -> 'SolutionTable':
+        return SolutionTable({k: v[idx] for k, v in self.columns.items()})
+
+    def sort(self, *by: str, descending: bool = False) -> 'SolutionTable':
+        """Copia ordenada por los objetivos o columnas dados (el primero manda)."""
+        if not by:
+            raise ValueError("indique al menos una clave de orden")
+        keys = [self.columns[OBJECTIVES[k][0] if k in OBJECTIVES else k] for k in by]
+        order = np.lexsort(keys[::-1])
+        return self.take(order[::-1] if descending else order)
+
+    def solution(self, i: int) -> InterceptSolution:
+        c = {k: float(v[i]) for k, v in self.columns.items()}
+        return InterceptSolution(theta_d=c['theta_d'], delay=c['delay'], v0_d=c['v0_d'],
+                                 impact_time=c['impact_time'],
+                                 impact_point=(c['impact_x'], c['impact_y']), error=c['error'])
+
+    def solutions(self) -> List[InterceptSolution]:
+        return [self.solution(i) for i in range(len(self))]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Filas como diccionarios (p. ej. para csv.DictWriter)."""
+        cols = [(k, self.columns[k].tolist()) for k in PARETO_FIELDS]
+        return [{k: v[i] for k, v in cols} for i in range(len(self))]
+
+    def write(self, path: str | Path) -> None:
+        """Guarda una fila por solución en path (.csv o .jsonl)."""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            if path.suffix.lower() == '.csv':
+                w = csv.DictWriter(f, fieldnames=PARETO_FIELDS)
+                w.writeheader()
+                w.writerows(self.rows())
+            else:
+                for row in self.rows():
+                    f.write(json.dumps(row) + '\n')
+
+
+@dataclass
+class ParetoResult:
+    objectives: Tuple[str, ...]
+    feasible: SolutionTable  # todos los candidatos con error <= eps
+    front: SolutionTable     # no dominados, ordenados por el primer objetivo
+    seconds: float
+
+
+def pareto_front(costs: np.ndarray) -> np.ndarray:
+    """Índices de las filas no dominadas de costs (n x k, todo a minimizar), en orden
+    lexicográfico de los objetivos.
+
+    Con un orden en el que quien domina va siempre antes, la primera fila que queda es
+    del frente y se quitan de golpe todas las que ella domina (o iguala). Con dos
+    objetivos el orden es lexicográfico y basta un mínimo acumulado; con más se ordena
+    por la suma de los objetivos normalizados a [0, 1] (lexicográfico a igualdad), que
+    pone antes las filas del frente que más eliminan.
+    """
+    n, k = costs.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    keys = list(costs.T[::-1])
+    if k > 2:
+        lo, hi = costs.min(axis=0), costs.max(axis=0)
+        span = np.where(hi > lo, hi - lo, 1.0)
+        keys.append(((costs - lo) / span).sum(axis=1))
+    order = np.lexsort(keys)
+    c = costs[order]
+    if k == 1:
+        return order[:1]
+    if k == 2:
+        # estrictamente mejor en el segundo que todas las anteriores
+        prev = np.minimum.accumulate(np.concatenate(([np.inf], c[:-1, 1])))
+        return order[c[:, 1] < prev]
+    front = []
+    rest = np.arange(n)
+    while rest.size:
+        p = rest[0]
+        front.append(p)
+        rest = rest[1:][np.any(c[rest[1:]] < c[p], axis=1)]
+    idx = order[np.asarray(front, dtype=np.int64)]
+    return idx[np.lexsort(costs[idx].T[::-1])]
+
+
+def solve_intercept_pareto(attacker_traj_txy: Tuple[list, list, list],
+                           params: InterceptParams,
+                           v0d_max: float,
+                           objectives: Sequence[str] = ('error', 'delay'),
+                           stats: Optional[SolverStats] = None) -> ParetoResult:
+    """Todas las soluciones factibles de la malla y su frente de Pareto en `objectives`."""
+    objectives = tuple(objectives)
+    unknown = [o for o in objectives if o not in OBJECTIVES]
+    if unknown or not objectives:
+        raise ValueError(f"objetivos desconocidos: {unknown} (válidos: {', '.join(OBJECTIVES)})")
+    t0 = time.perf_counter()
+    t_a, x_a, y_a = (np.asarray(a, dtype=float) for a in attacker_traj_txy)
+    thetas = np.asarray(_theta_grid(params), dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    found: list = []
+    _sweep_numpy(t_a, x_a, x_a - params.xd0, y_a, thetas, delays, params, v0d_max, stats, feasible=found)
+
+    if found:
+        ia, jd, kt, err = (np.concatenate(parts) for parts in zip(*found))
+    else:
+        ia = jd = kt = np.empty(0, dtype=np.int64)
+        err = np.empty(0)
+    # mismas fórmulas que _make_solution, en bloque
+    tau = t_a[ia] - delays[jd]
+    th = thetas[kt]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v0d = (x_a[ia] - params.xd0) / (tau * np.cos(th))
+    feasible = SolutionTable({'theta_d': th, 'delay': delays[jd], 'v0_d': v0d,
+                              'impact_time': t_a[ia], 'impact_x': x_a[ia], 'impact_y': y_a[ia],
+                              'error': err})
+
+    costs = np.column_stack([OBJECTIVES[o][1] * feasible[OBJECTIVES[o][0]] for o in objectives])
+    front = feasible.take(pareto_front(costs))
+    return ParetoResult(objectives, feasible, front, time.perf_counter() - t0)
@@ -0,0 +1,63 @@
+"""Envolvente de alcance del defensor ("parábola de seguridad").
+
+Con velocidad de lanzamiento <= v_max desde (xd0, yd0), los puntos alcanzables cumplen
+    y <= yd0 + v_max^2 / (2 g) - g (x - xd0)^2 / (2 v_max^2)
+y, para llegar a (x, y) justo en el tiempo de vuelo tau, hace falta
+    (dx / tau)^2 + (dy / tau + g tau / 2)^2 <= v_max^2.
+Ambas son condiciones necesarias O(1) que los solvers usan para descartar muestras del
+atacante y retardos imposibles antes del barrido en ángulo.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+
+from .physics import GRAVITY_DEFAULT
+
+
+@dataclass(frozen=True)
+class ReachEnvelope:
+    xd0: float
+    yd0: float
+    v_max: float
+    g: float = GRAVITY_DEFAULT
+
+    def max_height(self, x):
+        """Altura máxima alcanzable en la abscisa x (escalar o array)."""
+        dx = np.asarray(x, dtype=float) - self.xd0
+        v2 = self.v_max * self.v_max
+        return self.yd0 + v2 / (2 * self.g) - self.g * dx * dx / (2 * v2)
+
+    def contains(self, x, y, tol: float = 0.0):
+        """True si algún punto de (x, [y - tol, y + tol]) es alcanzable."""
+        return np.asarray(y, dtype=float) - tol <= self.max_height(x)
+
+    def feasible_tau(self, x, y, tau, tol: float = 0.0):
+        """True si con tiempo de vuelo tau se puede llegar a (x, y') con |y' - y| <= tol.
+
+        Usa la menor componente vertical necesaria dentro de la banda de tolerancia,
+        así que es exacta respecto a v_max (los límites de ángulo no se consideran).
+        """
+        tau = np.asarray(tau, dtype=float)
+        dy = np.asarray(y, dtype=float) - self.yd0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vx = (np.asarray(x, dtype=float) - self.xd0) / tau
+            lo = (dy - tol) / tau + 0.5 * self.g * tau
+            hi = (dy + tol) / tau + 0.5 * self.g * tau
+            vy = np.where((lo <= 0) & (hi >= 0), 0.0, np.minimum(np.abs(lo), np.abs(hi)))
+            return (tau > 0) & (vx * vx + vy * vy <= self.v_max * self.v_max)
+
+    def flight_time_window(self, x, y):
+        """Tiempos de vuelo mínimo y máximo para llegar exactamente a (x, y) (NaN si no se alcanza).
+
+        Raíces de (g^2/4) T^2 + (g dy - v^2) T + (dx^2 + dy^2) = 0 con T = tau^2.
+        """
+        dx = np.asarray(x, dtype=float) - self.xd0
+        dy = np.asarray(y, dtype=float) - self.yd0
+        b = self.v_max * self.v_max - self.g * dy
+        disc = b * b - self.g * self.g * (dx * dx + dy * dy)
+        with np.errstate(invalid='ignore'):
+            root = np.sqrt(disc)
+            t_lo = np.sqrt(2 * (b - root)) / self.g
+            t_hi = np.sqrt(2 * (b + root)) / self.g
+        return t_lo, t_hi
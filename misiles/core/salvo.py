@@ -0,0 +1,311 @@
+"""Salvas: muchos atacantes contra un mismo defensor en un único barrido vectorizado.
+
+Las trayectorias de la salva se guardan concatenadas (t, x, y planos + `offsets` por
+atacante, como una matriz CSR) y se resuelven todas juntas sobre la misma malla
+(t_a, retardo, theta) que `solve_intercept_enumeration`: los bloques mezclan muestras
+de distintos atacantes y el mejor candidato se reduce por atacante, con el mismo
+criterio (menor error y, a igualdad, menor retardo).
+
+El coste sigue siendo lineal en el número de atacantes: cada par (muestra, retardo) es
+de un solo atacante y no se comparte trabajo entre ellos. La ganancia frente a N
+llamadas a solve_intercept_enumeration viene de no barrer los ángulos (ver
+_solve_grouped) y de hacer un solo barrido: en el escenario base, de 3 a 4 veces más
+rápido con 10 a 1000 atacantes (p. ej. 14 ms frente a 45 ms con 50; 0,24 s frente a
+0,90 s con 1000). `python -m benchmarks.run -k salvo/` lo mide.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
+import time
+
+import numpy as np
+
+from .intercept import (InterceptParams, InterceptSolution, SolverStats, _CHUNK_ELEMS, _TIE_TOL,
+                        _delay_grid, _envelope, _make_solution, _theta_grid)
+from .physics import GRAVITY_DEFAULT, LaunchState, flight_time
+from .trajectories import Trajectory
+
+SALVO_FIELDS = ('intercept', 'theta_d', 'delay', 'v0_d', 'impact_time', 'impact_x', 'impact_y', 'error')
+
+
+@dataclass
+class SalvoTrajectories:
+    """Trayectorias de N atacantes concatenadas; las del atacante i son [offsets[i], offsets[i+1])."""
+    t: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return self.offsets.size - 1
+
+    def __getitem__(self, i: int) -> Trajectory:
+        s = slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+        return Trajectory(self.t[s], self.x[s], self.y[s])
+
+    @property
+    def owner(self) -> np.ndarray:
+        """Índice de atacante de cada muestra."""
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+
+def generate_salvo(launches: Sequence[LaunchState], dt: float, g: float = GRAVITY_DEFAULT,
+                   t_max: float | None = None) -> SalvoTrajectories:
+    """Genera de una vez las trayectorias de todos los lanzamientos.
+
+    Cada trayectoria coincide muestra a muestra con generate_trajectory del mismo lanzamiento.
+    """
+    if dt <= 0:
+        raise ValueError("dt debe ser > 0")
+    n_att = len(launches)
+    # por atacante (N escalares): mismas operaciones que generate_trajectory
+    counts = np.empty(n_att, dtype=np.int64)
+    x0 = np.empty(n_att)
+    y0 = np.empty(n_att)
+    vx = np.empty(n_att)
+    vy = np.empty(n_att)
+    for i, ls in enumerate(launches):
+        tf = flight_time(ls.v0, ls.theta, ls.y0, g)
+        if t_max is not None:
+            tf = min(tf, t_max)
+        counts[i] = max(1, int(math.ceil(tf / dt))) + 1
+        x0[i], y0[i] = ls.x0, ls.y0
+        vx[i] = ls.v0 * math.cos(ls.theta)
+        vy[i] = ls.v0 * math.sin(ls.theta)
+
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    owner = np.repeat(np.arange(n_att), counts)
+    k = np.arange(offsets[-1], dtype=np.int64) - offsets[owner]
+    t = k.astype(np.float64) * dt
+    x = x0[owner] + vx[owner] * t
+    y = y0[owner] + vy[owner] * t - 0.5 * g * t * t
+
+    # corte al suelo: primera muestra con y < 0 de cada atacante
+    below = np.flatnonzero(y < 0)
+    if below.size:
+        att, first = np.unique(owner[below], return_index=True)
+        cut = below[first]
+        inner = cut[k[cut] > 0]
+        # interpolar linealmente en el último tramo, como generate_trajectory
+        prev = inner - 1
+        alpha = (0 - y[prev]) / (y[inner] - y[prev])
+        t[inner] = t[prev] + alpha * dt
+        x[inner] = x[prev] + alpha * (x[inner] - x[prev])
+        y[inner] = 0.0
+        # última muestra conservada por atacante (-1: sale ya bajo el suelo)
+        last = counts - 1
+        last[att] = np.where(k[cut] > 0, k[cut], -1)
+        keep = k <= last[owner]
+        counts = last + 1
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        t, x, y = t[keep], x[keep], y[keep]
+    return SalvoTrajectories(t, x, y, offsets)
+
+
+def _theta_runs(cos_th: np.ndarray) -> List[np.ndarray]:
+    """Tramos de índices consecutivos con el mismo signo de cos: en cada uno tan es creciente."""
+    cuts = np.flatnonzero(np.diff(np.sign(cos_th)) != 0) + 1
+    return np.split(np.arange(cos_th.size), cuts)
+
+
+def solve_salvo(salvo: SalvoTrajectories, params: InterceptParams, v0d_max: float,
+                stats: Optional[SolverStats] = None) -> List[Optional[InterceptSolution]]:
+    """Mejor intercepción de cada atacante de la salva (None si no la hay).
+
+    Da lo mismo que solve_intercept_enumeration con cada trayectoria (ver _solve_grouped).
+    """
+    return [row[0] for row in _solve_grouped(salvo, params, v0d_max, None, stats)]
+
+
+def solve_salvo_windows(salvo: SalvoTrajectories, params: InterceptParams, v0d_max: float,
+                        windows: Sequence[Tuple[float, float]],
+                        stats: Optional[SolverStats] = None) -> List[List[Optional[InterceptSolution]]]:
+    """Mejor intercepción de cada atacante con el retardo dentro de cada ventana [lo, hi).
+
+    Devuelve sols[atacante][ventana]; todas las ventanas salen del mismo barrido.
+    """
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    group = np.full(delays.size, -1, dtype=np.int64)
+    for w, (lo, hi) in enumerate(windows):
+        group[(group < 0) & (delays >= lo - 1e-12) & (delays < hi - 1e-12)] = w
+    return _solve_grouped(salvo, params, v0d_max, (group, len(windows)), stats)
+
+
+def _solve_grouped(salvo: SalvoTrajectories, params: InterceptParams, v0d_max: float,
+                   groups: Optional[Tuple[np.ndarray, int]],
+                   stats: Optional[SolverStats] = None) -> List[List[Optional[InterceptSolution]]]:
+    """Mejor intercepción por (atacante, grupo de retardos); groups = (grupo de cada retardo, n).
+
+    Da lo mismo que solve_intercept_enumeration con cada trayectoria, pero sin barrer
+    ángulos: para cada par (muestra, retardo) el error |c - dx tan th| es una V en tan th,
+    así que su mínimo en la malla está junto a tan th = c / dx (búsqueda binaria), y la
+    cota v0d <= v0d_max deja un intervalo contiguo de ángulos en cada tramo de signo de cos.
+    El coste pasa de O(pares x N_theta) a O(pares x log N_theta).
+    """
+    t0 = time.perf_counter()
+    t_a, x_a, y_a = salvo.t, salvo.x, salvo.y
+    n_att = len(salvo)
+    owner = salvo.owner
+    thetas = np.asarray(_theta_grid(params), dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    group, n_groups = groups if groups is not None else (np.zeros(delays.size, dtype=np.int64), 1)
+    # cada clave es un par (atacante, grupo)
+    n_keys = n_att * n_groups
+    if stats is not None:
+        stats._set_grid(t_a.size, delays.size, thetas.size)
+    sols: List[List[Optional[InterceptSolution]]] = [[None] * n_groups for _ in range(n_att)]
+    if t_a.size == 0 or thetas.size == 0 or delays.size == 0 or n_groups == 0:
+        return sols
+
+    cos_th = np.cos(thetas)
+    tan_th = np.tan(thetas)
+    abs_cos = np.abs(cos_th)
+    dx_all = x_a - params.xd0
+    n_th = thetas.size
+    n_d = delays.size
+    env = _envelope(params, v0d_max)
+    tol = params.eps + _TIE_TOL
+    reach = (y_a >= 0) & env.contains(x_a, y_a, tol)
+
+    # mejor candidato por atacante: error, retardo, orden de recorrido, (muestra, retardo, theta)
+    b_err = np.full(n_keys, np.inf)
+    b_delay = np.full(n_keys, np.inf)
+    b_order = np.full(n_keys, np.iinfo(np.int64).max)
+    b_idx = np.full((n_keys, 3), -1, dtype=np.int64)
+    t1 = time.perf_counter()
+
+    for run in _theta_runs(cos_th):
+        sign = float(np.sign(cos_th[run[0]]))
+        rows = np.flatnonzero(reach & (dx_all * sign > 0))
+        if rows.size == 0:
+            continue
+        tau_grid = t_a[rows, None] - delays[None, :]
+        ir, jd = np.nonzero(env.feasible_tau(x_a[rows, None], y_a[rows, None], tau_grid, tol)
+                            & (group >= 0)[None, :])
+        if ir.size == 0:
+            continue
+        tan_r = tan_th[run]
+        # |cos| sube hasta el pico y luego baja: los ángulos con |cos| >= cos_min son un intervalo
+        peak = int(np.argmax(abs_cos[run]))
+        rise = abs_cos[run[:peak + 1]]
+        fall = -abs_cos[run[peak:]]
+
+        for s in range(0, ir.size, _CHUNK_ELEMS):
+            sl = slice(s, s + _CHUNK_ELEMS)
+            tau = tau_grid[ir[sl], jd[sl]]
+            ia = rows[ir[sl]]
+            dx = dx_all[ia]
+            c = y_a[ia] - params.yd0 + 0.5 * params.g * tau * tau
+            cos_min = np.abs(dx) / (v0d_max * tau)
+            lo = np.searchsorted(rise, cos_min, side='left')
+            hi = peak + np.searchsorted(fall, -cos_min, side='right') - 1
+            ok = (lo <= peak) & (hi >= peak)
+            # vecinos del cruce c - dx tan th = 0, recortados al intervalo permitido
+            k0 = np.searchsorted(tan_r, c / dx)
+            row_min = np.full(tau.size, np.inf)
+            row_k = np.zeros(tau.size, dtype=np.int64)
+            for dk in (-1, 0, 1):
+                k = np.clip(k0 + dk, lo, np.maximum(hi, lo))
+                e = np.abs(c - dx * tan_r[np.minimum(k, tan_r.size - 1)])
+                take = ok & ((e < row_min) | ((e == row_min) & (k < row_k)))
+                row_min = np.where(take, e, row_min)
+                row_k = np.where(take, k, row_k)
+            if stats is not None:
+                stats.candidates += 3 * int(np.count_nonzero(ok))
+
+            o = owner[ia] * n_groups + group[jd[sl]]
+            # mínimo del bloque por clave; sólo siguen las que pueden mejorar su mejor
+            m_own = np.full(n_keys, np.inf)
+            np.minimum.at(m_own, o, row_min)
+            lim = np.minimum(m_own + _TIE_TOL, params.eps)
+            live = np.flatnonzero((row_min <= lim[o]) & (m_own[o] <= b_err[o] + _TIE_TOL))
+            if live.size == 0:
+                continue
+            # empates dentro de la tolerancia: el menor ángulo de cada fila que sigue empatado
+            k = row_k[live]
+            l_lo = lo[live]
+            l_dx, l_c, l_lim = dx[live], c[live], lim[o[live]]
+            while True:
+                step = (k > l_lo) & (np.abs(l_c - l_dx * tan_r[np.maximum(k - 1, 0)]) <= l_lim)
+                if not step.any():
+                    break
+                k = k - step
+            p_own = o[live]
+            p_ia = ia[live]
+            p_jd = jd[sl][live]
+            p_th = run[k]
+            p_delay = delays[p_jd]
+            order = (p_ia * n_d + p_jd) * n_th + p_th
+            # menor retardo y luego orden de recorrido
+            srt = np.lexsort((order, p_delay, p_own))
+            first = srt[np.unique(p_own[srt], return_index=True)[1]]
+            a = p_own[first]
+            # el error mínimo del bloque decide; el candidato elegido hereda su error
+            m = m_own[a]
+            better = (m < b_err[a] - _TIE_TOL) | (
+                (np.abs(m - b_err[a]) <= _TIE_TOL)
+                & ((p_delay[first] < b_delay[a])
+                   | ((p_delay[first] == b_delay[a]) & (order[first] < b_order[a]))))
+            a, first = a[better], first[better]
+            b_err[a] = m[better]
+            b_delay[a] = p_delay[first]
+            b_order[a] = order[first]
+            b_idx[a] = np.stack((p_ia[first], p_jd[first], p_th[first]), axis=1)
+
+    for a in np.flatnonzero(b_idx[:, 0] >= 0):
+        i, j, k = (int(v) for v in b_idx[a])
+        sols[a // n_groups][a % n_groups] = _make_solution(float(t_a[i]), float(x_a[i]), float(y_a[i]),
+                                 float(delays[j]), float(thetas[k]), params)
+    if stats is not None:
+        stats.add_time('setup', t1 - t0)
+        stats.add_time('sweep', time.perf_counter() - t1)
+    return sols
+
+
+@dataclass
+class SalvoTable:
+    """Resultados de una salva en columnas (una fila por atacante; NaN si no hay intercepción)."""
+    columns: Dict[str, np.ndarray]
+    solutions: List[Optional[InterceptSolution]]
+
+    @classmethod
+    def from_solutions(cls, solutions: List[Optional[InterceptSolution]]) -> 'SalvoTable':
+        n = len(solutions)
+        cols = {k: np.full(n, np.nan) for k in SALVO_FIELDS[1:]}
+        cols['intercept'] = np.zeros(n, dtype=bool)
+        for i, sol in enumerate(solutions):
+            if sol is None:
+                continue
+            cols['intercept'][i] = True
+            cols['theta_d'][i] = sol.theta_d
+            cols['delay'][i] = sol.delay
+            cols['v0_d'][i] = sol.v0_d
+            cols['impact_time'][i] = sol.impact_time
+            cols['impact_x'][i], cols['impact_y'][i] = sol.impact_point
+            cols['error'][i] = sol.error
+        return cls(columns={k: cols[k] for k in SALVO_FIELDS}, solutions=list(solutions))
+
+    def __len__(self) -> int:
+        return len(self.solutions)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.columns[key]
+
+    @property
+    def intercepted(self) -> int:
+        return int(np.count_nonzero(self.columns['intercept']))
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Filas como diccionarios (p. ej. para csv.DictWriter)."""
+        return [{k: self.columns[k][i].item() for k in SALVO_FIELDS} for i in range(len(self))]
+
+
+def solve_salvo_launches(launches: Sequence[LaunchState], params: InterceptParams, v0d_max: float,
+                         stats: Optional[SolverStats] = None) -> SalvoTable:
+    """Genera las trayectorias con el paso del barrido y resuelve la salva completa."""
+    t0 = time.perf_counter()
+    salvo = generate_salvo(launches, params.dt_attacker, params.g)
+    if stats is not None:
+        stats.add_time('trajectory', time.perf_counter() - t0)
+    return SalvoTable.from_solutions(solve_salvo(salvo, params, v0d_max, stats))
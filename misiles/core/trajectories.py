@@ -1,46 +1,136 @@
 """Generación de trayectorias paramétricas sin rozamiento."""
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Tuple
 import math
 
-from .physics import position_at, flight_time, GRAVITY_DEFAULT
+import numpy as np
+
+from .physics import flight_time, GRAVITY_DEFAULT
+
+if TYPE_CHECKING:
+    from .drag import DragModel
 
 @dataclass
 class Trajectory:
-    t: List[float]
-    x: List[float]
-    y: List[float]
+    """Muestras (t, x, y) como arrays float64 contiguos.
+
+    Los arrays se pueden pasar tal cual a los solvers y a matplotlib sin copiar.
+    Respecto a las listas de antes, len(), índices, cortes e iteración funcionan igual,
+    pero no el resto:
+      - `a.x + b.x` suma elemento a elemento; para concatenar, np.concatenate((a.x, b.x));
+      - no hay `.append`/`.extend`; se construye otra Trajectory (o np.append);
+      - `if traj.x:` lanza ValueError; use `len(traj)` o `traj.x.size`;
+      - `==` compara elemento a elemento; use np.array_equal.
+    `as_lists()` devuelve listas para el código que aún las necesite.
+    """
+    t: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+
+    def __post_init__(self):
+        self.t = np.ascontiguousarray(self.t, dtype=np.float64)
+        self.x = np.ascontiguousarray(self.x, dtype=np.float64)
+        self.y = np.ascontiguousarray(self.y, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.t.size
+
+    def as_lists(self) -> Tuple[List[float], List[float], List[float]]:
+        return self.t.tolist(), self.x.tolist(), self.y.tolist()
 
 
 def generate_trajectory(x0: float, y0: float, v0: float, theta: float, dt: float,
-                        g: float = GRAVITY_DEFAULT, t_max: float | None = None) -> Trajectory:
+                        g: float = GRAVITY_DEFAULT, t_max: float | None = None,
+                        model: 'DragModel | None' = None) -> Trajectory:
+    """Muestras cada dt hasta el suelo (o t_max); la última se corta en y = 0.
+
+    model: modelo físico opcional (misiles.core.drag.DragModel); sin rozamiento se usa
+    la forma cerrada.
+    """
     if dt <= 0:
         raise ValueError("dt debe ser > 0")
+    if model is not None and not model.closed_form:
+        from .drag import drag_trajectory
+        return drag_trajectory(model, x0, y0, v0, theta, dt, g, t_max)
     tf = flight_time(v0, theta, y0, g)
     if t_max is not None:
         tf = min(tf, t_max)
     n = max(1, int(math.ceil(tf / dt)))
-    t_list: List[float] = []
-    x_list: List[float] = []
-    y_list: List[float] = []
-    for i in range(n + 1):
-        t = i * dt
-        xx, yy = position_at(t, x0, y0, v0, theta, g)
-        if yy < 0:
-            # cortar exactamente al suelo (interpolar linealmente en el último tramo)
+    # mismas operaciones que position_at, en una sola expresión vectorizada
+    vx = v0 * math.cos(theta)
+    vy = v0 * math.sin(theta)
+    t = np.arange(n + 1, dtype=np.float64) * dt
+    x = x0 + vx * t
+    y = y0 + vy * t - 0.5 * g * t * t
+    below = np.flatnonzero(y < 0)
+    if below.size:
+        i = int(below[0])
+        if i == 0:
+            return Trajectory(t[:0], x[:0], y[:0])
+        # cortar exactamente al suelo (interpolar linealmente en el último tramo)
+        t_prev, x_prev, y_prev = t[i - 1], x[i - 1], y[i - 1]
+        alpha = (0 - y_prev) / (y[i] - y_prev)
+        t[i] = t_prev + alpha * dt
+        x[i] = x_prev + alpha * (x[i] - x_prev)
+        y[i] = 0.0
+        t, x, y = t[:i + 1], x[:i + 1], y[:i + 1]
+    return Trajectory(t, x, y)
+
+
+def iter_trajectory(x0: float, y0: float, v0: float, theta: float, dt: float,
+                    g: float = GRAVITY_DEFAULT, t_max: float | None = None,
+                    chunk: int = 1024) -> Iterator[Trajectory]:
+    """Versión perezosa de generate_trajectory: produce bloques de hasta `chunk` muestras.
+
+    Concatenar los bloques da exactamente las mismas muestras que generate_trajectory,
+    pero la memoria queda acotada por `chunk` y el primer bloque está listo enseguida.
+    """
+    if dt <= 0:
+        raise ValueError("dt debe ser > 0")
+    if chunk <= 0:
+        raise ValueError("chunk debe ser > 0")
+    tf = flight_time(v0, theta, y0, g)
+    if t_max is not None:
+        tf = min(tf, t_max)
+    n = max(1, int(math.ceil(tf / dt)))
+    vx = v0 * math.cos(theta)
+    vy = v0 * math.sin(theta)
+    prev = None  # última muestra del bloque anterior, para el corte al suelo
+    for s in range(0, n + 1, chunk):
+        t = np.arange(s, min(s + chunk, n + 1), dtype=np.float64) * dt
+        x = x0 + vx * t
+        y = y0 + vy * t - 0.5 * g * t * t
+        below = np.flatnonzero(y < 0)
+        if below.size:
+            i = int(below[0])
             if i > 0:
-                t_prev = (i - 1) * dt
-                x_prev, y_prev = position_at(t_prev, x0, y0, v0, theta, g)
-                # interpolación lineal para y=0
-                alpha = (0 - y_prev) / (yy - y_prev)
-                t0 = t_prev + alpha * dt
-                x0i = x_prev + alpha * (xx - x_prev)
-                t_list.append(t0)
-                x_list.append(x0i)
-                y_list.append(0.0)
-            break
-        t_list.append(t)
-        x_list.append(xx)
-        y_list.append(yy)
-    return Trajectory(t_list, x_list, y_list)
+                prev = (t[i - 1], x[i - 1], y[i - 1])
+            if prev is not None:
+                t_prev, x_prev, y_prev = prev
+                alpha = (0 - y_prev) / (y[i] - y_prev)
+                t[i] = t_prev + alpha * dt
+                x[i] = x_prev + alpha * (x[i] - x_prev)
+                y[i] = 0.0
+                yield Trajectory(t[:i + 1], x[:i + 1], y[:i + 1])
+            return
+        prev = (t[-1], x[-1], y[-1])
+        yield Trajectory(t, x, y)
+
+
+def defender_trajectory(xd0: float, yd0: float, v0: float, theta: float, delay: float,
+                        impact_time: float, dt: float, g: float = GRAVITY_DEFAULT) -> Trajectory:
+    """Trayectoria del defensor alineada con el reloj del atacante.
+
+    Vuela en su propio tiempo 0..tau (tau = impact_time - delay, sin bajar de y=0) y se
+    antepone el retardo como puntos estáticos en la base, para animarlo junto al atacante.
+    """
+    tau = impact_time - delay
+    n = max(1, int(math.ceil(tau / dt)))
+    t = np.arange(n + 1, dtype=np.float64) * dt
+    x = xd0 + v0 * math.cos(theta) * t
+    y = np.maximum(0.0, yd0 + v0 * math.sin(theta) * t - 0.5 * g * t * t)
+    ndelay = int(math.ceil(delay / dt))
+    return Trajectory(np.arange(ndelay + t.size, dtype=np.float64) * dt,
+                      np.concatenate((np.full(ndelay, xd0), x)),
+                      np.concatenate((np.full(ndelay, yd0), y)))
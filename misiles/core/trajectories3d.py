@@ -0,0 +1,178 @@
+"""Trayectorias e intercepción en 3D (x, y hacia arriba, z lateral) sin rozamiento.
+
+Un lanzamiento tiene elevación theta y azimut phi (medido en el plano x-z desde +x).
+Con phi = 0 y z = 0 todo coincide exactamente con el caso 2D.
+
+El solver barre elevación, azimut y retardo, pero el azimut se poda analíticamente:
+con el defensor disparando en el azimut phi, la distancia lateral a la muestra
+(dx, dz) es |-dx sin phi + dz cos phi| y no depende ni del retardo ni de la elevación,
+así que por cada muestra sólo se conservan los azimuts de la malla con error lateral
+<= eps (normalmente uno o dos, o su opuesto para disparos hacia atrás). Cada par
+(muestra, azimut) se resuelve con el barrido 2D usando la distancia a lo largo del
+azimut y sumando el error lateral en cuadratura.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import dataclasses
+import math
+
+import numpy as np
+
+from .intercept import (InterceptParams, SolverStats, _TIE_TOL, _delay_grid, _sweep_numpy, _theta_grid)
+from .physics import GRAVITY_DEFAULT, flight_time
+
+
+@dataclass
+class Trajectory3D:
+    """Muestras (t, x, y, z) como arrays float64 contiguos."""
+    t: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+
+    def __post_init__(self):
+        self.t = np.ascontiguousarray(self.t, dtype=np.float64)
+        self.x = np.ascontiguousarray(self.x, dtype=np.float64)
+        self.y = np.ascontiguousarray(self.y, dtype=np.float64)
+        self.z = np.ascontiguousarray(self.z, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.t.size
+
+
+def generate_trajectory3d(x0: float, y0: float, z0: float, v0: float, theta: float, phi: float,
+                          dt: float, g: float = GRAVITY_DEFAULT,
+                          t_max: float | None = None) -> Trajectory3D:
+    """Como generate_trajectory, con azimut phi y coordenada lateral z."""
+    if dt <= 0:
+        raise ValueError("dt debe ser > 0")
+    tf = flight_time(v0, theta, y0, g)
+    if t_max is not None:
+        tf = min(tf, t_max)
+    n = max(1, int(math.ceil(tf / dt)))
+    vh = v0 * math.cos(theta)
+    vx = vh * math.cos(phi)
+    vz = vh * math.sin(phi)
+    vy = v0 * math.sin(theta)
+    t = np.arange(n + 1, dtype=np.float64) * dt
+    x = x0 + vx * t
+    z = z0 + vz * t
+    y = y0 + vy * t - 0.5 * g * t * t
+    below = np.flatnonzero(y < 0)
+    if below.size:
+        i = int(below[0])
+        if i == 0:
+            return Trajectory3D(t[:0], x[:0], y[:0], z[:0])
+        # cortar exactamente al suelo (interpolar linealmente en el último tramo)
+        t_prev, x_prev, y_prev, z_prev = t[i - 1], x[i - 1], y[i - 1], z[i - 1]
+        alpha = (0 - y_prev) / (y[i] - y_prev)
+        t[i] = t_prev + alpha * dt
+        x[i] = x_prev + alpha * (x[i] - x_prev)
+        z[i] = z_prev + alpha * (z[i] - z_prev)
+        y[i] = 0.0
+        t, x, y, z = t[:i + 1], x[:i + 1], y[:i + 1], z[:i + 1]
+    return Trajectory3D(t, x, y, z)
+
+
+@dataclass
+class InterceptParams3D(InterceptParams):
+    zd0: float = 0.0
+    # azimuts del defensor (rad); por defecto sólo phi = 0 (caso 2D)
+    phi_min: float = 0.0
+    phi_max: float = 0.0
+    dphi: float = math.radians(1.0)
+
+    @classmethod
+    def from_2d(cls, params: InterceptParams, **kw) -> 'InterceptParams3D':
+        """Parámetros 3D equivalentes a unos 2D (zd0 = 0, azimut 0), con cambios opcionales."""
+        return cls(**{**dataclasses.asdict(params), **kw})
+
+
+@dataclass
+class InterceptSolution3D:
+    theta_d: float
+    phi_d: float
+    delay: float
+    v0_d: float
+    impact_time: float
+    impact_point: Tuple[float, float, float]
+    error: float  # distancia entre defensor y atacante en el impacto (vertical y lateral)
+
+
+def _phi_grid(params: InterceptParams3D) -> np.ndarray:
+    phis = []
+    ph = params.phi_min
+    while ph <= params.phi_max + 1e-12:
+        phis.append(ph)
+        if params.dphi <= 0:
+            break
+        ph += params.dphi
+    return np.asarray(phis, dtype=float)
+
+
+def _along_lateral(dx, dz, phi):
+    """Distancia a lo largo del azimut phi y distancia lateral (>= 0)."""
+    c, s = np.cos(phi), np.sin(phi)
+    return dx * c + dz * s, np.abs(dz * c - dx * s)
+
+
+def solve_intercept_3d(attacker: Trajectory3D, params: InterceptParams3D, v0d_max: float,
+                       stats: Optional[SolverStats] = None) -> Optional[InterceptSolution3D]:
+    """Mejor intercepción (menor error y, a igualdad, menor retardo) en elevación, azimut y retardo.
+
+    El coste es el del barrido 2D sobre los pares (muestra, azimut) que sobreviven a la
+    poda lateral, no N_azimut veces el 2D.
+    """
+    t_a, x_a, y_a, z_a = attacker.t, attacker.x, attacker.y, attacker.z
+    thetas = np.asarray(_theta_grid(params), dtype=float)
+    delays = np.asarray(_delay_grid(params), dtype=float)
+    phis = _phi_grid(params)
+    if t_a.size == 0 or phis.size == 0:
+        return None
+
+    # poda del azimut: sólo (muestra, azimut) con error lateral <= eps
+    dx, lat = _along_lateral((x_a - params.xd0)[:, None], (z_a - params.zd0)[:, None], phis[None, :])
+    keep = lat <= params.eps
+    # primero el azimut de menor error lateral de cada muestra (mínimos locales: hay
+    # uno por sentido de disparo); su mejor error acota el lateral del resto
+    near = np.ones_like(keep)
+    if phis.size > 1:
+        slope = np.sign(np.diff(lat, axis=1))
+        near[:, 1:-1] = (slope[:, :-1] <= 0) & (slope[:, 1:] >= 0)
+        near[:, 0] = slope[:, 0] >= 0
+        near[:, -1] = slope[:, -1] <= 0
+
+    def sweep(mask):
+        ia, ip = np.nonzero(mask)
+        if ia.size == 0:
+            return ia, ip, None
+        along = dx[ia, ip]
+        return ia, ip, _sweep_numpy(t_a[ia], params.xd0 + along, along, y_a[ia], thetas, delays,
+                                    params, v0d_max, stats, lateral=lat[ia, ip])
+
+    first = keep & near
+    ia, ip, best = sweep(first)
+    if best is None:
+        ia, ip, best = sweep(keep & ~first) if (keep & ~first).any() else (ia, ip, None)
+    else:
+        # sólo pueden mejorar (o empatar) azimuts con lateral <= mejor error
+        wider = keep & (lat <= best[0] + _TIE_TOL)
+        if (wider & ~first).any():
+            ia, ip, best = sweep(wider)
+    if stats is not None:
+        # la malla nominal incluye todos los azimuts
+        stats._set_grid(t_a.size, delays.size, thetas.size)
+        stats.full_grid *= phis.size
+    if best is None:
+        return None
+    _, _, _, r, j, k = best
+    i, phi, th, delay = int(ia[r]), float(phis[ip[r]]), float(thetas[k]), float(delays[j])
+    # misma forma que _make_solution, con el error lateral en cuadratura
+    ta, Xa, Ya, Za = float(t_a[i]), float(x_a[i]), float(y_a[i]), float(z_a[i])
+    tau = ta - delay
+    d_along, d_lat = _along_lateral(Xa - params.xd0, Za - params.zd0, phi)
+    v0d = float(d_along) / (tau * math.cos(th))
+    Ypred = params.yd0 + v0d * math.sin(th) * tau - 0.5 * params.g * tau * tau
+    return InterceptSolution3D(theta_d=th, phi_d=phi, delay=delay, v0_d=v0d, impact_time=ta,
+                               impact_point=(Xa, Ya, Za), error=math.hypot(Ya - Ypred, float(d_lat)))
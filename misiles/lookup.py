@@ -0,0 +1,176 @@
+"""Tablas precalculadas de intercepción para un defensor fijo.
+
+Se resuelve una malla de lanzamientos del atacante (x0, theta_deg, v0) con el solver
+normal y se guarda, por punto, el instante de impacto y el retardo elegidos en un .npy
+que se abre con memoria mapeada (más un .json con la malla y los parámetros). Una
+consulta toma la entrada más cercana y recalcula el disparo del defensor de forma exacta
+(required_launch) contra la posición real del atacante en ese instante; si la tabla no
+cubre la consulta o el disparo no es válido, se usa el solver en vivo.
+
+Uso:
+    python -m misiles.lookup tabla.npy --x0 -150 50 41 --theta 10 80 36 --v0 10 45 36
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from .core.physics import deg2rad, position_at
+from .core.springs import Spring
+from .core.trajectories import generate_trajectory
+from .core.intercept import (InterceptParams, InterceptSolution, required_launch,
+                             solve_intercept_enumeration)
+from .solve import BASELINE_PATH, intercept_params, load_scenario_file
+from .ui.params import Scenario
+
+FIELDS = ('impact_time', 'delay', 'theta_d', 'v0_d', 'error')
+_REL_TOL = 1e-9
+
+
+def _close(a: Any, b: Any) -> bool:
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, rel_tol=_REL_TOL, abs_tol=_REL_TOL)
+    return a == b
+
+
+class InterceptTable:
+    """Tabla (x0, theta_deg, v0) -> intercepción, normalmente abierta con np.load(mmap_mode='r')."""
+
+    def __init__(self, data: np.ndarray, meta: Dict[str, Any]):
+        self.data = data
+        self.meta = meta
+        self.axes = [np.asarray(meta['axes'][k], dtype=float) for k in ('x0', 'theta_deg', 'v0')]
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'InterceptTable':
+        path = Path(path)
+        with open(path.with_suffix('.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode='r'), meta)
+
+    def matches(self, y0: float, params: InterceptParams, v0d_max: float) -> bool:
+        """True si la tabla se calculó con este defensor, estos parámetros y esta y0 del atacante."""
+        if not _close(self.meta['y0'], y0) or not _close(self.meta['v0d_max'], v0d_max):
+            return False
+        stored = self.meta['params']
+        return all(_close(stored.get(k), v) for k, v in asdict(params).items())
+
+    def covers(self, x0: float, y0: float, theta_deg: float, v0: float,
+               params: InterceptParams, v0d_max: float) -> bool:
+        inside = all(ax[0] <= v <= ax[-1] for ax, v in zip(self.axes, (x0, theta_deg, v0)))
+        return inside and self.matches(y0, params, v0d_max)
+
+    def _nearest(self, values: Sequence[float]) -> tuple:
+        idx = []
+        for ax, v in zip(self.axes, values):
+            i = int(np.clip(np.searchsorted(ax, v), 1, ax.size - 1)) if ax.size > 1 else 0
+            if ax.size > 1 and abs(ax[i - 1] - v) <= abs(ax[i] - v):
+                i -= 1
+            idx.append(i)
+        return tuple(idx)
+
+    def lookup(self, x0: float, y0: float, theta_deg: float, v0: float,
+               params: InterceptParams, v0d_max: float) -> Optional[InterceptSolution]:
+        """Solución a partir de la entrada más cercana, o None si no sirve (usar el solver)."""
+        if not self.covers(x0, y0, theta_deg, v0, params, v0d_max):
+            return None
+        entry = np.asarray(self.data[self._nearest((x0, theta_deg, v0))])
+        if np.isnan(entry[0]):
+            return None
+        impact_time, delay = float(entry[0]), float(entry[1])
+        tau = impact_time - delay
+        if tau <= 0:
+            return None
+        # disparo exacto contra la posición real del atacante en ese instante
+        Xa, Ya = position_at(impact_time, x0, y0, v0, deg2rad(theta_deg), params.g)
+        th, v0d = required_launch(Xa - params.xd0, Ya - params.yd0, tau, params.g)
+        th, v0d = float(th), float(v0d)
+        if Ya < 0 or not (0 < v0d <= v0d_max) or not (params.theta_min <= th <= params.theta_max):
+            return None
+        Ypred = params.yd0 + v0d * math.sin(th) * tau - 0.5 * params.g * tau * tau
+        return InterceptSolution(theta_d=th, delay=delay, v0_d=v0d, impact_time=impact_time,
+                                 impact_point=(Xa, Ya), error=abs(Ya - Ypred))
+
+
+def _solve_slab(y0: float, thetas_deg: Sequence[float], v0s: Sequence[float],
+                params: InterceptParams, v0d_max: float, x0: float) -> np.ndarray:
+    out = np.full((len(thetas_deg), len(v0s), len(FIELDS)), np.nan)
+    for j, th in enumerate(thetas_deg):
+        for k, v0 in enumerate(v0s):
+            traj = generate_trajectory(x0, y0, v0, deg2rad(th), params.dt_attacker, params.g)
+            sol = solve_intercept_enumeration((traj.t, traj.x, traj.y), params, v0d_max)
+            if sol is not None:
+                out[j, k] = (sol.impact_time, sol.delay, sol.theta_d, sol.v0_d, sol.error)
+    return out
+
+
+def build_table(scen: Scenario, path: str | Path, x0_values: Sequence[float],
+                theta_deg_values: Sequence[float], v0_values: Sequence[float],
+                workers: int = 0) -> InterceptTable:
+    """Resuelve la malla completa y la guarda en path (.npy) + path.json; devuelve la tabla mapeada.
+
+    El defensor y los parámetros de búsqueda salen de `scen`; y0 del atacante también.
+    Con workers > 0 cada valor de x0 se resuelve en un proceso aparte.
+    """
+    path = Path(path)
+    axes = {k: sorted(float(v) for v in vals) for k, vals in
+            (('x0', x0_values), ('theta_deg', theta_deg_values), ('v0', v0_values))}
+    params = intercept_params(scen)
+    sp_d = scen.defender.spring
+    v0d_max = Spring(k=sp_d.k, x=sp_d.x, m=sp_d.m).v0_max
+    y0 = scen.attacker.y0
+
+    data = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64,
+                                     shape=(len(axes['x0']), len(axes['theta_deg']),
+                                            len(axes['v0']), len(FIELDS)))
+    solve_slab = partial(_solve_slab, y0, axes['theta_deg'], axes['v0'], params, v0d_max)
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for i, slab in enumerate(ex.map(solve_slab, axes['x0'])):
+                data[i] = slab
+    else:
+        for i, x0 in enumerate(axes['x0']):
+            data[i] = solve_slab(x0)
+    data.flush()
+    del data
+
+    meta = {'fields': list(FIELDS), 'axes': axes, 'y0': y0, 'v0d_max': v0d_max,
+            'params': asdict(params)}
+    with open(path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return InterceptTable.load(path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog='python -m misiles.lookup',
+                                 description='Precalcula una tabla de intercepción para un defensor fijo.')
+    ap.add_argument('out', help='fichero de salida (.npy; se escribe también el .json)')
+    ap.add_argument('--scenario', default=str(BASELINE_PATH), help='escenario (defensor y globals)')
+    for name, help_ in (('x0', 'x0 del atacante [m]'), ('theta', 'ángulo del atacante [grados]'),
+                        ('v0', 'velocidad del atacante [m/s]')):
+        ap.add_argument(f'--{name}', nargs=3, type=float, required=True,
+                        metavar=('MIN', 'MAX', 'N'), help=help_)
+    ap.add_argument('--workers', type=int, default=0, help='procesos (0 = sin pool)')
+    args = ap.parse_args(argv)
+
+    def axis(spec: List[float]) -> np.ndarray:
+        return np.linspace(spec[0], spec[1], int(spec[2]))
+
+    t0 = time.perf_counter()
+    table = build_table(load_scenario_file(args.scenario), args.out, axis(args.x0),
+                        axis(args.theta), axis(args.v0), workers=args.workers)
+    n = table.data.shape[0] * table.data.shape[1] * table.data.shape[2]
+    hits = int(np.count_nonzero(~np.isnan(table.data[..., 0])))
+    print(f"{n} entradas ({hits} con intercepción) en {time.perf_counter() - t0:.1f} s -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
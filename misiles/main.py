@@ -1,16 +1,22 @@
 from __future__ import annotations
+import argparse
 import json
-from pathlib import Path
 import math
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# sólo núcleo y parámetros: matplotlib y la interfaz se importan al visualizar
+from .core.intercept import SolverStats
+from .core.pareto import OBJECTIVES
+from .core.physics import rad2deg
+from .core.trajectories import defender_trajectory
+from .solve import (BASELINE_PATH, apply_attacker_overrides, load_scenario_file, solve_pareto_scenario,
+                    solve_scenario)
+from .ui.playback import DEFAULT_FPS
 
-from .core.physics import deg2rad, rad2deg, GRAVITY_DEFAULT
-from .core.springs import Spring
-from .core.trajectories import generate_trajectory
-from .core.intercept import InterceptParams, solve_intercept_enumeration
-from .ui.params import load_scenario
-from .ui.viz_matplotlib import TrajData
-from .ui.viz_rich import animate_rich
-from .ui.game_mode import run_game
+if TYPE_CHECKING:
+    from .ui.viz_matplotlib import TrajData
 
 
 def load_json(path: str | Path):
@@ -18,74 +24,60 @@ def load_json(path: str | Path):
         return json.load(f)
 
 
-def main_with_params(attacker_params=None):
-    scen_path = Path(__file__).parent / 'scenarios' / 'baseline.json'
-    data = load_json(scen_path)
-    scen = load_scenario(data)
-    
+def main_with_params(attacker_params=None, table=None, profile=False, fps=DEFAULT_FPS, speed=1.0,
+                     export=None, workers=None, scenario=BASELINE_PATH, cache=None, exact=False):
+    """Simulación del escenario (por defecto el base); `table` es una InterceptTable opcional (misiles.lookup).
+
+    Con profile=True imprime los contadores del solver y los tiempos por fase.
+    fps y speed controlan la reproducción (frames por segundo y x tiempo real).
+    Con export (ruta .gif, .apng o secuencia PNG) se exporta la animación sin ventana,
+    repartiendo los frames entre `workers` procesos.
+    `cache` es una ResultCache opcional (misiles.cache) para reutilizar la solución.
+    Con exact=True se resuelve en tiempo continuo (solve_intercept_continuous).
+    """
+    scen = load_scenario_file(scenario)
+
     # Aplicar parámetros personalizados del atacante si se proporcionan
     if attacker_params:
-        scen.attacker.x0 = attacker_params.get('x0', scen.attacker.x0)
-        scen.attacker.y0 = attacker_params.get('y0', scen.attacker.y0)
-        scen.attacker.theta_deg = attacker_params.get('theta_deg', scen.attacker.theta_deg)
-        
-        # Actualizar parámetros del resorte
-        if 'spring_x' in attacker_params:
-            scen.attacker.spring.x = attacker_params['spring_x']
-        if 'mass' in attacker_params:
-            scen.attacker.spring.m = attacker_params['mass']
-
-    # atacante
-    sp_a = scen.attacker.spring
-    spring_a = Spring(k=sp_a.k, x=sp_a.x, m=sp_a.m)
-    v0_a = spring_a.v0
-    if v0_a <= 0:
-        raise SystemExit('Atacante no despega: v0_a<=0')
-    theta_a = deg2rad(scen.attacker.theta_deg or 45.0)
-
-    # trayectoria atacante
-    traj_a = generate_trajectory(scen.attacker.x0, scen.attacker.y0, v0_a, theta_a,
-                                 dt=scen.globals.dt_sim, g=scen.globals.g)
-
-    # solver intercepción
-    sp_d = scen.defender.spring
-    spring_d = Spring(k=sp_d.k, x=sp_d.x, m=sp_d.m)
-    v0d_max = spring_d.v0_max
-
-    params = InterceptParams(
-        xd0=scen.defender.x0,
-        yd0=scen.defender.y0,
-        theta_min=deg2rad(scen.globals.theta_min_deg),
-        theta_max=deg2rad(scen.globals.theta_max_deg),
-        dtheta=deg2rad(scen.globals.dtheta_deg),
-        dt_attacker=scen.globals.dt_sim,
-        dt_delay=scen.globals.dt_delay,
-        delay_min=scen.globals.delay_min,
-        delay_max=scen.globals.delay_max,
-        eps=scen.globals.eps,
-        g=scen.globals.g,
-    )
-
-    sol = solve_intercept_enumeration((traj_a.t, traj_a.x, traj_a.y), params, v0d_max)
+        apply_attacker_overrides(scen, attacker_params)
+
+    stats = SolverStats(detailed=True) if profile else None
+    res = solve_scenario(scen, table=table, stats=stats, cache=cache, exact=exact)
+    traj_a, sol = res.trajectory, res.solution
+    v0_a, v0d_max = res.v0_a, res.v0d_max
+
+    import matplotlib
+    from .ui.viz_matplotlib import TrajData
+    from .ui.viz_rich import animate_rich
+    is_agg = matplotlib.get_backend().lower().startswith('agg')
 
     if not sol:
         print('No hay solución de intercepción con los parámetros dados.')
         print(f"v0_a={v0_a:.3f} m/s; v0_d,max={v0d_max:.3f} m/s")
-        import matplotlib
-        is_agg = matplotlib.get_backend().lower().startswith('agg')
         out_png = None
         if is_agg:
             out_png = str(Path(__file__).parent / 'sin_intercepcion.png')
+        attacker = TrajData(traj_a.t, traj_a.x, traj_a.y)
+        frame_s = _frame_cost(attacker, None, None) if profile else None
+        t0 = time.perf_counter()
         # Visualización rica también para el caso sin solución
-        animate_rich(
-            TrajData(traj_a.t, traj_a.x, traj_a.y),
-            None,
-            None,
-            title='Sin intercepción posible',
-            show=not is_agg,
-            save_path=out_png,
-            animate=not is_agg,
-        )
+        if export:
+            _export(attacker, None, None, 'Sin intercepción posible', export, workers, fps, speed)
+        else:
+            animate_rich(
+                attacker,
+                None,
+                None,
+                title='Sin intercepción posible',
+                show=not is_agg,
+                save_path=out_png,
+                animate=not is_agg,
+                fps=fps,
+                speed=speed,
+            )
+        if profile:
+            stats.add_time('render', time.perf_counter() - t0)
+            print_profile(stats, sol, frame_s, interactive=not is_agg)
         return
 
     # generar trayectoria del defensor con la solución hallada
@@ -94,45 +86,121 @@ def main_with_params(attacker_params=None):
     theta_d = sol.theta_d
     v0_d = sol.v0_d
 
-    # Construimos la trayectoria del defensor en su propio tiempo (0..tau)
-    from .core.physics import position_at
-    tau = sol.impact_time - sol.delay
-    dt = scen.globals.dt_sim
-    n = max(1, int(math.ceil(tau/dt)))
-    t_d = [i*dt for i in range(n+1)]
-    x_d = []
-    y_d = []
-    for t in t_d:
-        xx, yy = position_at(t, scen.defender.x0, scen.defender.y0, v0_d, theta_d, scen.globals.g)
-        x_d.append(xx)
-        y_d.append(max(0.0, yy))
-
-    # insertar delay (mantener estático hasta disparo)
-    ndelay = int(math.ceil(sol.delay / dt))
-    t_d_aligned = [i*dt for i in range(ndelay + len(t_d))]
-    x_d_aligned = [scen.defender.x0]*ndelay + x_d
-    y_d_aligned = [scen.defender.y0]*ndelay + y_d
+    t0 = time.perf_counter()
+    traj_d = defender_trajectory(scen.defender.x0, scen.defender.y0, v0_d, theta_d,
+                                 sol.delay, sol.impact_time, scen.globals.dt_sim, scen.globals.g)
+    if profile:
+        stats.add_time('defender', time.perf_counter() - t0)
 
     # UI: texto de HUD como título
     title = (f"Intercepción: θ_d={rad2deg(theta_d):.2f}°, Δt={sol.delay:.2f}s, "
              f"v0_a={v0_a:.2f} m/s, v0_d={v0_d:.2f} m/s (max {v0d_max:.2f})")
 
     # Guardado opcional en modo headless
-    import matplotlib
-    is_agg = matplotlib.get_backend().lower().startswith('agg')
     out_png = None
     if is_agg:
         out_png = str(Path(__file__).parent / 'intercepcion.png')
 
-    animate_rich(
-        attacker=TrajData(traj_a.t, traj_a.x, traj_a.y),
-        defender=TrajData(t_d_aligned, x_d_aligned, y_d_aligned),
-        impact=sol.impact_point,
-        title=title,
-        show=not is_agg,
-        save_path=out_png,
-        animate=not is_agg,
-    )
+    attacker = TrajData(traj_a.t, traj_a.x, traj_a.y)
+    defender = TrajData(traj_d.t, traj_d.x, traj_d.y)
+    frame_s = _frame_cost(attacker, defender, sol.impact_point) if profile else None
+    t0 = time.perf_counter()
+    if export:
+        _export(attacker, defender, sol.impact_point, title, export, workers, fps, speed)
+    else:
+        animate_rich(
+            attacker=attacker,
+            defender=defender,
+            impact=sol.impact_point,
+            title=title,
+            show=not is_agg,
+            save_path=out_png,
+            animate=not is_agg,
+            fps=fps,
+            speed=speed,
+        )
+    if profile:
+        stats.add_time('render', time.perf_counter() - t0)
+        print_profile(stats, sol, frame_s, interactive=not is_agg)
+
+
+def _export(attacker, defender, impact, title, path, workers, fps, speed) -> None:
+    from .ui.export import export_animation
+    rep = export_animation(attacker, defender, path, impact, title, fps=fps, speed=speed, workers=workers)
+    print(f"{rep.frames} frames {rep.size[0]}x{rep.size[1]} en {rep.seconds:.2f} s "
+          f"({rep.render_fps:.1f} frames/s dibujando, {rep.fps:.1f} frames/s en total) -> {rep.path}")
+
+
+def _frame_cost(attacker: TrajData, defender, impact, n: int = 30) -> float:
+    """Segundos por frame de animación (actualizar + blit) sobre n frames equiespaciados."""
+    import matplotlib.pyplot as plt
+    from .ui.viz_rich import prepare_animation
+    scene = prepare_animation(attacker, defender, impact)
+    picks = sorted({round(i * (scene.frames - 1) / max(1, n - 1)) for i in range(n)})
+    scene.blit_frame(picks[0])  # fondo fuera de la medida
+    t0 = time.perf_counter()
+    for i in picks:
+        scene.blit_frame(i)
+    dt = (time.perf_counter() - t0) / len(picks)
+    plt.close(scene.fig)
+    return dt
+
+
+def print_profile(stats: SolverStats, sol, frame_s=None, interactive: bool = False):
+    """Resumen de --profile: malla, descartes del solver y tiempos por fase."""
+    print('\n== Perfil ==')
+    print(f"malla: {stats.n_samples} muestras x {stats.n_delays} retardos x {stats.n_thetas} ángulos"
+          f" = {stats.full_grid} puntos")
+    print(f"evaluados: {stats.candidates} ({100 * stats.fraction:.1f}%)")
+    if stats.detailed:
+        for label, n in (('podados (envolvente, Ya<0, tau<=0)', stats.pruned),
+                         ('rechazados v0d <= 0', stats.rejected_sign),
+                         ('rechazados v0d > v0d_max', stats.rejected_vmax),
+                         ('rechazados error > eps', stats.rejected_eps),
+                         ('aceptados error <= eps', stats.accepted)):
+            print(f"  {label:<36} {n:>10}")
+        miss = f"{stats.best_miss:.4g} m" if math.isfinite(stats.best_miss) else '-'
+        print(f"mejor error (aunque supere eps): {miss}")
+    print(f"solución: {'sí' if sol else 'no'}")
+    for phase, seconds in stats.phases.items():
+        note = ' (incluye la ventana abierta)' if phase == 'render' and interactive else ''
+        print(f"  {phase:<12} {1e3 * seconds:9.2f} ms{note}")
+    if frame_s is not None:
+        print(f"  {'frame':<12} {1e3 * frame_s:9.2f} ms/frame")
+
+
+def solve_only(scenario=BASELINE_PATH, as_json: bool = True, cache=None, exact: bool = False,
+               table=None) -> None:
+    """Resuelve sin visualización (sólo misiles.core y parámetros) e imprime el resultado."""
+    t0 = time.perf_counter()
+    res = solve_scenario(load_scenario_file(scenario), table=table, cache=cache, exact=exact)
+    out = {'scenario': str(scenario), **res.as_dict(), 'seconds': time.perf_counter() - t0}
+    if cache is not None:
+        out['cache_hit'] = cache.hits > 0
+    if as_json:
+        print(json.dumps(out, indent=2, ensure_ascii=False))
+        return
+    for key, value in out.items():
+        print(f"{key:<12} {value:.6g}" if isinstance(value, float) else f"{key:<12} {value}")
+
+
+def pareto_only(scenario=BASELINE_PATH, objectives=('error', 'delay'), out=None,
+                as_json: bool = False) -> None:
+    """Frente de Pareto del escenario en `objectives`; con out se guarda (.csv o .jsonl)."""
+    res = solve_pareto_scenario(load_scenario_file(scenario), objectives)
+    if out:
+        res.front.write(out)
+    if as_json:
+        print(json.dumps({'scenario': str(scenario), 'objectives': list(res.objectives),
+                          'feasible': len(res.feasible), 'front': res.front.rows(),
+                          'seconds': res.seconds}, indent=2, ensure_ascii=False))
+        return
+    print(f"{len(res.feasible)} soluciones factibles, {len(res.front)} en el frente "
+          f"({', '.join(res.objectives)}) en {1e3 * res.seconds:.1f} ms" + (f" -> {out}" if out else ''))
+    print(f"  {'θ_d [°]':>8} {'Δt [s]':>7} {'v0_d':>7} {'t_imp':>6} {'x':>8} {'y':>7} {'error':>9}")
+    for r in res.front.rows():
+        print(f"  {rad2deg(r['theta_d']):8.2f} {r['delay']:7.2f} {r['v0_d']:7.2f} {r['impact_time']:6.2f} "
+              f"{r['impact_x']:8.2f} {r['impact_y']:7.2f} {r['error']:9.2e}")
 
 
 def main():
@@ -156,6 +224,7 @@ def main_interactive():
                 break
             elif choice == '2':
                 print("\n🎮 Iniciando Modo Juego...")
+                from .ui.game_mode import run_game
                 run_game()
                 break
             else:
@@ -168,9 +237,86 @@ def main_interactive():
             break
 
 
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m misiles.main',
+                                 description='Simulador de intercepción de misiles.')
+    ap.add_argument('--interactive', action='store_true', help='menú de opciones')
+    ap.add_argument('--scenario', default=str(BASELINE_PATH), help='escenario (JSON)')
+    ap.add_argument('--json', action='store_true',
+                    help='sólo resolver (sin matplotlib) e imprimir la solución en JSON')
+    ap.add_argument('--no-viz', action='store_true',
+                    help='sólo resolver (sin matplotlib) e imprimir la solución como texto')
+    ap.add_argument('--profile', action='store_true',
+                    help='imprime contadores del solver y tiempos por fase')
+    ap.add_argument('--profile-out', metavar='FICHERO',
+                    help='guarda un perfil cProfile (pstats) en FICHERO; implica --profile')
+    ap.add_argument('--fps', type=float, default=DEFAULT_FPS,
+                    help=f'frames por segundo de la animación (por defecto {DEFAULT_FPS:g})')
+    ap.add_argument('--speed', type=float, default=1.0,
+                    help='velocidad de reproducción (x tiempo real, por defecto 1)')
+    ap.add_argument('--export', metavar='FICHERO',
+                    help='exporta la animación sin ventana (.gif, .apng, patrón frame_%%04d.png o directorio)')
+    ap.add_argument('--workers', type=int, default=None,
+                    help='procesos para --export (0 = sin pool; por defecto uno por CPU)')
+    ap.add_argument('--exact', action='store_true',
+                    help='intercepción exacta en tiempo continuo (no depende de dt_sim)')
+    ap.add_argument('--pareto', metavar='OBJ[,OBJ...]',
+                    help='sólo resolver e imprimir el frente de Pareto (error, delay, impact_time, '
+                         'altitude, v0_d)')
+    ap.add_argument('--pareto-out', metavar='FICHERO', help='guarda el frente de --pareto (.csv o .jsonl)')
+    ap.add_argument('--table', metavar='FICHERO',
+                    help='tabla precalculada (.npy de misiles.lookup); si no cubre el caso se resuelve en vivo')
+    ap.add_argument('--cache', metavar='DIR',
+                    help='caché en disco de resultados (se reutiliza entre ejecuciones)')
+    args = ap.parse_args(argv)
+    if args.pareto is not None:
+        args.pareto = [o.strip() for o in args.pareto.split(',') if o.strip()]
+        unknown = [o for o in args.pareto if o not in OBJECTIVES]
+        if unknown or not args.pareto:
+            what = f"objetivos desconocidos {', '.join(unknown)}" if unknown else 'indique algún objetivo'
+            ap.error(f"--pareto: {what} (válidos: {', '.join(OBJECTIVES)})")
+        for flag, value in (('--cache', args.cache), ('--exact', args.exact), ('--table', args.table)):
+            if value:
+                ap.error(f'{flag} no se aplica con --pareto')
+    elif args.pareto_out:
+        ap.error('--pareto-out requiere --pareto')
+    if args.table:
+        table = Path(args.table)
+        if not table.is_file() or not table.with_suffix('.json').is_file():
+            ap.error(f'--table: no existe {table} o su {table.with_suffix(".json").name}')
+    return args
+
+
 if __name__ == '__main__':
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == '--interactive':
+    args = parse_args()
+    cache = None
+    if args.cache:
+        from .cache import ResultCache
+        cache = ResultCache(args.cache)
+    table = None
+    if args.table:
+        from .lookup import InterceptTable
+        table = InterceptTable.load(args.table)
+    if args.pareto:
+        pareto_only(args.scenario, args.pareto, out=args.pareto_out, as_json=args.json)
+    elif args.json or args.no_viz:
+        solve_only(args.scenario, as_json=args.json, cache=cache, exact=args.exact, table=table)
+    elif args.interactive:
         main_interactive()
+    elif args.profile_out:
+        import cProfile
+        import pstats
+        prof = cProfile.Profile()
+        prof.runcall(main_with_params, profile=True, fps=args.fps, speed=args.speed,
+                     export=args.export, workers=args.workers, scenario=args.scenario, cache=cache,
+                     exact=args.exact, table=table)
+        prof.dump_stats(args.profile_out)
+        pstats.Stats(prof).sort_stats('cumulative').print_stats(15)
+        print(f"-> {args.profile_out}")
+    elif args.profile:
+        main_with_params(profile=True, fps=args.fps, speed=args.speed,
+                         export=args.export, workers=args.workers, scenario=args.scenario, cache=cache,
+                         exact=args.exact, table=table)
     else:
-        main()
+        main_with_params(fps=args.fps, speed=args.speed, export=args.export, workers=args.workers,
+                         scenario=args.scenario, cache=cache, exact=args.exact, table=table)
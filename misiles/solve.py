@@ -0,0 +1,193 @@
+"""Resolución de un escenario completo sin visualización (atacante + solver)."""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+import copy
+import json
+import time
+
+from .core.physics import LaunchState, deg2rad, rad2deg
+from .core.springs import Spring
+from .core.trajectories import Trajectory, generate_trajectory
+from .core.intercept import (InterceptParams, InterceptSolution, SolverStats, solve_intercept_continuous,
+                             solve_intercept_enumeration)
+from .core.battery import Battery, BatteryPlan, plan_battery
+from .core.pareto import ParetoResult, solve_intercept_pareto
+from .core.salvo import SalvoTable, solve_salvo_launches
+from .ui.params import Scenario, load_scenario
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+    from .lookup import InterceptTable
+
+BASELINE_PATH = Path(__file__).parent / 'scenarios' / 'baseline.json'
+
+
+@dataclass
+class ScenarioResult:
+    v0_a: float
+    v0d_max: float
+    trajectory: Trajectory  # trayectoria del atacante
+    solution: Optional[InterceptSolution]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Resumen serializable a JSON (mismos nombres que las filas de misiles.batch)."""
+        out: Dict[str, Any] = {'v0_a': self.v0_a, 'v0d_max': self.v0d_max,
+                               'samples': len(self.trajectory),
+                               'flight_time': float(self.trajectory.t[-1]) if len(self.trajectory) else 0.0,
+                               'intercept': self.solution is not None}
+        sol = self.solution
+        if sol is not None:
+            out.update(theta_d_deg=rad2deg(sol.theta_d), delay=sol.delay, v0_d=sol.v0_d,
+                       impact_time=sol.impact_time, impact_x=sol.impact_point[0],
+                       impact_y=sol.impact_point[1], error=sol.error)
+        return out
+
+
+def load_scenario_file(path: str | Path = BASELINE_PATH) -> Scenario:
+    with open(path, 'r', encoding='utf-8') as f:
+        return load_scenario(json.load(f))
+
+
+def apply_attacker_overrides(scen: Scenario, attacker_params: Dict[str, Any]) -> None:
+    """Aplica in situ los parámetros personalizados del atacante (x0, y0, theta_deg, spring_x, mass)."""
+    scen.attacker.x0 = attacker_params.get('x0', scen.attacker.x0)
+    scen.attacker.y0 = attacker_params.get('y0', scen.attacker.y0)
+    scen.attacker.theta_deg = attacker_params.get('theta_deg', scen.attacker.theta_deg)
+
+    # Actualizar parámetros del resorte
+    if 'spring_x' in attacker_params:
+        scen.attacker.spring.x = attacker_params['spring_x']
+    if 'mass' in attacker_params:
+        scen.attacker.spring.m = attacker_params['mass']
+
+
+def intercept_params(scen: Scenario) -> InterceptParams:
+    return InterceptParams(
+        xd0=scen.defender.x0,
+        yd0=scen.defender.y0,
+        theta_min=deg2rad(scen.globals.theta_min_deg),
+        theta_max=deg2rad(scen.globals.theta_max_deg),
+        dtheta=deg2rad(scen.globals.dtheta_deg),
+        dt_attacker=scen.globals.dt_sim,
+        dt_delay=scen.globals.dt_delay,
+        delay_min=scen.globals.delay_min,
+        delay_max=scen.globals.delay_max,
+        eps=scen.globals.eps,
+        g=scen.globals.g,
+    )
+
+
+def attacker_launch(scen: Scenario, attacker_params: Optional[Dict[str, Any]] = None) -> LaunchState:
+    """Lanzamiento del atacante del escenario, con los parámetros personalizados si se dan."""
+    if attacker_params:
+        scen = copy.deepcopy(scen)
+        apply_attacker_overrides(scen, attacker_params)
+    sp_a = scen.attacker.spring
+    v0_a = Spring(k=sp_a.k, x=sp_a.x, m=sp_a.m).v0
+    if v0_a <= 0:
+        raise ValueError('Atacante no despega: v0_a<=0')
+    return LaunchState(scen.attacker.x0, scen.attacker.y0, v0_a, deg2rad(scen.attacker.theta_deg or 45.0))
+
+
+def defender_v0_max(scen: Scenario) -> float:
+    sp_d = scen.defender.spring
+    return Spring(k=sp_d.k, x=sp_d.x, m=sp_d.m).v0_max
+
+
+def scenario_batteries(scen: Scenario) -> List[Battery]:
+    """Baterías defensoras del escenario (scen.defenders) con su v0 máxima."""
+    return [Battery(d.x0, d.y0, Spring(k=d.spring.k, x=d.spring.x, m=d.spring.m).v0_max, d.reload_time)
+            for d in scen.defenders]
+
+
+def solve_scenario(scen: Scenario, attacker_params: Optional[Dict[str, Any]] = None,
+                   table: Optional['InterceptTable'] = None,
+                   stats: Optional[SolverStats] = None,
+                   cache: Optional['ResultCache'] = None,
+                   exact: bool = False) -> ScenarioResult:
+    """Genera la trayectoria del atacante y resuelve la intercepción.
+
+    No modifica `scen`: los parámetros del atacante se aplican sobre una copia.
+    Si se pasa una tabla precalculada se consulta primero y, si no cubre el caso,
+    se usa el solver en vivo. `stats` recibe los contadores del solver y el tiempo
+    de la fase 'trajectory'. Con `cache` (misiles.cache.ResultCache, sólo sin tabla)
+    el resultado se busca en disco y, si no está, se guarda tras resolverlo.
+    Con exact=True se usa solve_intercept_continuous (tiempo continuo, sin depender de
+    dt_sim) en lugar del barrido; la trayectoria se sigue generando para dibujarla.
+    """
+    if attacker_params:
+        scen = copy.deepcopy(scen)
+        apply_attacker_overrides(scen, attacker_params)
+
+    key = None
+    if cache is not None and table is None:
+        from .cache import scenario_key
+        key = scenario_key(scen, solver='continuous' if exact else None)
+        hit = cache.get(key)
+        if hit is not None:
+            traj_a = hit.trajectory
+            if traj_a is None:
+                launch = attacker_launch(scen)
+                t0 = time.perf_counter()
+                traj_a = generate_trajectory(launch.x0, launch.y0, launch.v0, launch.theta,
+                                             dt=scen.globals.dt_sim, g=scen.globals.g)
+                if stats is not None:
+                    stats.add_time('trajectory', time.perf_counter() - t0)
+            return ScenarioResult(v0_a=hit.v0_a, v0d_max=hit.v0d_max, trajectory=traj_a,
+                                  solution=hit.solution)
+
+    # atacante
+    launch = attacker_launch(scen)
+    v0_a = launch.v0
+    theta_deg = scen.attacker.theta_deg or 45.0
+    t0 = time.perf_counter()
+    traj_a = generate_trajectory(launch.x0, launch.y0, v0_a, launch.theta,
+                                 dt=scen.globals.dt_sim, g=scen.globals.g)
+    if stats is not None:
+        stats.add_time('trajectory', time.perf_counter() - t0)
+
+    # solver intercepción
+    v0d_max = defender_v0_max(scen)
+    params = intercept_params(scen)
+    sol = None
+    if table is not None:
+        sol = table.lookup(scen.attacker.x0, scen.attacker.y0, theta_deg, v0_a, params, v0d_max)
+    if sol is None and exact:
+        sol = solve_intercept_continuous(launch, params, v0d_max, stats=stats)
+    elif sol is None:
+        sol = solve_intercept_enumeration((traj_a.t, traj_a.x, traj_a.y), params, v0d_max, stats=stats)
+    if key is not None:
+        cache.put(key, v0_a, v0d_max, sol, traj_a)
+    return ScenarioResult(v0_a=v0_a, v0d_max=v0d_max, trajectory=traj_a, solution=sol)
+
+
+def solve_salvo_scenario(scen: Scenario, attackers: Sequence[Dict[str, Any]],
+                         stats: Optional[SolverStats] = None) -> SalvoTable:
+    """Resuelve una salva contra el defensor del escenario en un único barrido vectorizado.
+
+    attackers: un diccionario de parámetros del atacante (como en solve_scenario) por atacante.
+    La tabla resultante tiene una fila por atacante, en el mismo orden.
+    """
+    launches = [attacker_launch(scen, a) for a in attackers]
+    return solve_salvo_launches(launches, intercept_params(scen), defender_v0_max(scen), stats)
+
+
+def solve_battery_scenario(scen: Scenario, attackers: Sequence[Dict[str, Any]],
+                           cost: str = 'impact_time') -> BatteryPlan:
+    """Asigna las baterías del escenario a una salva de atacantes (ver misiles.core.battery)."""
+    launches = [attacker_launch(scen, a) for a in attackers]
+    return plan_battery(launches, scenario_batteries(scen), intercept_params(scen), cost)
+
+
+def solve_pareto_scenario(scen: Scenario, objectives: Sequence[str],
+                          attacker_params: Optional[Dict[str, Any]] = None,
+                          stats: Optional[SolverStats] = None) -> ParetoResult:
+    """Soluciones factibles y frente de Pareto del escenario (ver misiles.core.pareto)."""
+    launch = attacker_launch(scen, attacker_params)
+    traj_a = generate_trajectory(launch.x0, launch.y0, launch.v0, launch.theta,
+                                 dt=scen.globals.dt_sim, g=scen.globals.g)
+    return solve_intercept_pareto((traj_a.t, traj_a.x, traj_a.y), intercept_params(scen),
+                                  defender_v0_max(scen), objectives, stats)
+
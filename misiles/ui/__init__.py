@@ -1,5 +1,13 @@
-from .game_mode import run_game
+"""Interfaces de usuario; los módulos con matplotlib se importan sólo al usarlos."""
 
 __all__ = [
     'run_game',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # perezoso: importar misiles.ui.params no debe arrastrar matplotlib
+    if name == 'run_game':
+        from .game_mode import run_game
+        return run_game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,175 @@
+"""Exportación headless de la animación (GIF, APNG o secuencia PNG) en paralelo.
+
+Cada tarea dibuja con Agg un rango contiguo de frames de la misma escena que
+animate_rich (blitting sobre el fondo fijo) y devuelve las imágenes ya convertidas al
+formato de salida; el proceso principal las recibe en orden y las escribe con Pillow,
+sin ffmpeg ni otros binarios.
+
+    python -m misiles.main --export animacion.gif --workers 4
+"""
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import collections
+import os
+import time
+import uuid
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from .playback import DEFAULT_FPS
+from .viz_rich import RichScene, TrajData, prepare_animation
+
+FORMATS = ('gif', 'apng', 'png-seq')
+
+
+@dataclass
+class ExportReport:
+    path: str
+    frames: int
+    size: Tuple[int, int]   # (ancho, alto) en píxeles
+    render_seconds: float   # dibujo y conversión de frames
+    seconds: float          # total, incluida la escritura
+
+    @property
+    def render_fps(self) -> float:
+        return self.frames / self.render_seconds if self.render_seconds > 0 else 0.0
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class _Job:
+    token: str  # identifica la escena para reutilizarla entre tareas del mismo proceso
+    attacker: TrajData
+    defender: Optional[TrajData]
+    impact: Optional[Tuple[float, float]]
+    title: str
+    fps: float
+    speed: float
+    dpi: float
+    fmt: str
+
+
+# escena ya montada en este proceso: (token, escena)
+_scene: Dict[str, RichScene] = {}
+
+
+def output_format(path: str | Path) -> str:
+    """'gif', 'apng' o 'png-seq' (ruta con % o directorio) según la ruta de salida."""
+    path = str(path)
+    if '%' in path:
+        return 'png-seq'
+    suffix = Path(path).suffix.lower()
+    if suffix == '.gif':
+        return 'gif'
+    if suffix in ('.apng', '.png'):
+        return 'apng'
+    if not suffix:
+        return 'png-seq'
+    raise ValueError(f"formato de exportación desconocido: {path!r} (.gif, .apng, .png o patrón %d)")
+
+
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _job_scene(job: _Job) -> RichScene:
+    scene = _scene.get(job.token)
+    if scene is None:
+        import matplotlib.pyplot as plt
+        for old in _scene.values():
+            plt.close(old.fig)
+        _scene.clear()
+        scene = prepare_animation(job.attacker, job.defender, job.impact, job.title, job.fps, job.speed)
+        scene.fig.set_dpi(job.dpi)
+        FigureCanvasAgg(scene.fig)  # Agg aunque el backend del proceso sea interactivo
+        _scene[job.token] = scene
+    return scene
+
+
+def _render_range(job: _Job, lo: int, hi: int) -> List[Image.Image]:
+    """Frames [lo, hi) convertidos al modo de salida (P para GIF, RGBA si no)."""
+    scene = _job_scene(job)
+    out = []
+    for i in range(lo, hi):
+        scene.blit_frame(i)
+        rgba = np.asarray(scene.fig.canvas.buffer_rgba())
+        if job.fmt == 'gif':
+            out.append(Image.fromarray(rgba[:, :, :3]).quantize(method=Image.Quantize.FASTOCTREE))
+        else:
+            out.append(Image.fromarray(rgba.copy()))
+    return out
+
+
+def export_animation(attacker: TrajData, defender: Optional[TrajData], path: str | Path,
+                     impact: Optional[Tuple[float, float]] = None,
+                     title: str = "Intercepción 2D",
+                     fps: float = DEFAULT_FPS, speed: float = 1.0, dpi: float = 80,
+                     workers: Optional[int] = None, chunk_size: int = 16) -> ExportReport:
+    """Dibuja todos los frames (como animate_rich) y los guarda en path.
+
+    path: .gif, .apng/.png (PNG animado), o un patrón 'frame_%04d.png' / directorio para
+    una secuencia numerada. Los rangos de chunk_size frames se reparten entre `workers`
+    procesos (0 = en este proceso), con a lo sumo 2 * workers rangos en vuelo.
+    """
+    fmt = output_format(path)
+    path = str(path)
+    if fmt == 'png-seq' and '%' not in path:
+        os.makedirs(path, exist_ok=True)
+        path = os.path.join(path, 'frame_%04d.png')
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    job = _Job(uuid.uuid4().hex, attacker, defender, impact, title, fps, speed, dpi, fmt)
+
+    t0 = time.perf_counter()
+    probe = _job_scene(job)
+    n = probe.frames
+    size = probe.fig.canvas.get_width_height()
+    ranges = [(lo, min(lo + chunk_size, n)) for lo in range(0, n, chunk_size)]
+    frames: List[Image.Image] = []  # GIF/APNG: Pillow los escribe todos al final
+    written = 0
+    write_s = 0.0
+
+    def emit(images: List[Image.Image]) -> None:
+        nonlocal written, write_s
+        if fmt == 'png-seq':
+            t = time.perf_counter()
+            for im in images:
+                im.save(path % written)
+                written += 1
+            write_s += time.perf_counter() - t
+        else:
+            frames.extend(images)
+
+    try:
+        if workers <= 0:
+            for lo, hi in ranges:
+                emit(_render_range(job, lo, hi))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+                pending: collections.deque[Future] = collections.deque()
+                for lo, hi in ranges:
+                    pending.append(ex.submit(_render_range, job, lo, hi))
+                    if len(pending) >= 2 * workers:
+                        emit(pending.popleft().result())
+                while pending:
+                    emit(pending.popleft().result())
+    finally:
+        import matplotlib.pyplot as plt
+        plt.close(probe.fig)
+        _scene.pop(job.token, None)
+    render_s = time.perf_counter() - t0 - write_s
+
+    if fmt != 'png-seq' and frames:
+        duration = 1000.0 / fps
+        frames[0].save(path, format='GIF' if fmt == 'gif' else 'PNG', save_all=True,
+                       append_images=frames[1:], duration=duration, loop=0)
+    return ExportReport(path=path, frames=n, size=size, render_seconds=render_s,
+                        seconds=time.perf_counter() - t0)
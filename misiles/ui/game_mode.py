@@ -2,8 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import json
-import math
-from typing import Optional, Tuple, List
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -11,22 +10,53 @@ from matplotlib.animation import FuncAnimation
 from matplotlib.widgets import Button, Slider
 
 from ..core.springs import Spring
-from ..core.physics import deg2rad, rad2deg, position_at
-from ..core.trajectories import generate_trajectory
-from ..core.intercept import InterceptParams, solve_intercept_enumeration
+from ..core.physics import deg2rad, rad2deg
+from ..core.trajectories import defender_trajectory
+from ..core.anytime import AnytimeResult
+from ..core.intercept import InterceptParams
+from ..core.memo import SolveMemo
 from .params import load_scenario
+from .worker import BackgroundSolver
+
+if TYPE_CHECKING:
+    from ..lookup import InterceptTable
+
+
+# Misiones sencillas (preajustes) - textos más cortos
+MISSIONS = [
+    {
+        'name': 'Misión 1: ¡Detén el cohete rojo!',
+        'hint': 'Clic en mapa para mover rojo. Ajusta Fuerza y Ángulo. ¡Defender!',
+        'att': {'x0': -80.0, 'y0': 0.0, 'theta_deg': 45.0, 'spring_x': 0.45},
+        'def_x0': 0.0,
+    },
+    {
+        'name': 'Misión 2: ¡Viene muy rápido!',
+        'hint': 'Aumenta la Fuerza si no llegas a tiempo.',
+        'att': {'x0': -120.0, 'y0': 0.0, 'theta_deg': 40.0, 'spring_x': 0.65},
+        'def_x0': 10.0,
+    },
+    {
+        'name': 'Misión 3: ¡Apunta alto!',
+        'hint': 'El rojo vuela alto. Prueba ángulos de 30°-60°.',
+        'att': {'x0': -60.0, 'y0': 0.0, 'theta_deg': 55.0, 'spring_x': 0.55},
+        'def_x0': -10.0,
+    },
+]
 
 
 @dataclass
 class UIState:
-    att_t: List[float]
-    att_x: List[float]
-    att_y: List[float]
-    def_t: Optional[List[float]]
-    def_x: Optional[List[float]]
-    def_y: Optional[List[float]]
+    att_t: Sequence[float]
+    att_x: Sequence[float]
+    att_y: Sequence[float]
+    def_t: Optional[Sequence[float]]
+    def_x: Optional[Sequence[float]]
+    def_y: Optional[Sequence[float]]
     impact: Optional[Tuple[float, float]]
     title: str
+    search: Optional[AnytimeResult] = None  # búsqueda sin terminar (se sigue refinando)
+    animate: bool = False  # al llegar del hilo de cálculo, redibujar con animación
 
 
 class GameApp:
@@ -36,7 +66,15 @@ class GameApp:
     y pulsar "¡Defender!". Los números se reducen y se usan indicadores tipo videojuego.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 256, debounce_ms: int = 60,
+                 table: Optional['InterceptTable'] = None, budget: Optional[float] = 0.03):
+        # Caché de trayectorias y soluciones (estados ya probados responden al instante)
+        self.memo = SolveMemo(maxsize=cache_size)
+        # Presupuesto (s) de los cálculos síncronos de los botones; None = siempre exacto
+        self.budget = budget
+        # Tabla precalculada opcional (misiles.lookup); si no cubre el caso se resuelve en vivo
+        self.table = table
+
         # Cargar escenario base
         scen_path = Path(__file__).resolve().parent.parent / 'scenarios' / 'baseline.json'
         with open(scen_path, 'r', encoding='utf-8') as f:
@@ -114,27 +152,8 @@ class GameApp:
             btn.label.set_fontsize(10)
             btn.label.set_weight('bold')
 
-        # Misiones sencillas (preajustes) - textos más cortos
-        self.missions = [
-            {
-                'name': 'Misión 1: ¡Detén el cohete rojo!',
-                'hint': 'Clic en mapa para mover rojo. Ajusta Fuerza y Ángulo. ¡Defender!',
-                'att': {'x0': -80.0, 'y0': 0.0, 'theta_deg': 45.0, 'spring_x': 0.45, 'mass': self.attacker['mass']},
-                'def_x0': 0.0,
-            },
-            {
-                'name': 'Misión 2: ¡Viene muy rápido!',
-                'hint': 'Aumenta la Fuerza si no llegas a tiempo.',
-                'att': {'x0': -120.0, 'y0': 0.0, 'theta_deg': 40.0, 'spring_x': 0.65, 'mass': self.attacker['mass']},
-                'def_x0': 10.0,
-            },
-            {
-                'name': 'Misión 3: ¡Apunta alto!',
-                'hint': 'El rojo vuela alto. Prueba ángulos de 30°-60°.',
-                'att': {'x0': -60.0, 'y0': 0.0, 'theta_deg': 55.0, 'spring_x': 0.55, 'mass': self.attacker['mass']},
-                'def_x0': -10.0,
-            },
-        ]
+        # Misiones sencillas (preajustes); la masa es la del escenario cargado
+        self.missions = [dict(m, att=dict(m['att'], mass=self.attacker['mass'])) for m in MISSIONS]
         self.mission_index = 0
 
         # Estado de animación
@@ -149,6 +168,17 @@ class GameApp:
         self.eps = self.scen.globals.eps
         self.delay_max = self.scen.globals.delay_max
 
+        # Cálculo en segundo plano: los eventos de los sliders se agrupan (debounce) y
+        # sólo se dibuja el resultado de la petición más reciente
+        self.solver = BackgroundSolver()
+        self._debounce = self.fig.canvas.new_timer(interval=debounce_ms)
+        self._debounce.single_shot = True
+        self._debounce.add_callback(self._submit_compute)
+        self._poll = self.fig.canvas.new_timer(interval=30)
+        self._poll.add_callback(self._poll_result)
+        self._poll.start()
+        self.fig.canvas.mpl_connect('close_event', lambda _evt: self.solver.close())
+
         # Eventos
         self.fig.canvas.mpl_connect('button_press_event', self.on_click_place_attacker)
         self.btn_play.on_clicked(self.on_defend)
@@ -161,14 +191,33 @@ class GameApp:
 
         # Primer arranque
         self.load_mission(self.mission_index)
+        self.cancel_pending()
         self.update_scene(self.compute())
 
+    # Cálculo asíncrono
+    def schedule_compute(self):
+        """Reinicia el debounce; al vencer se resuelve el estado actual en segundo plano."""
+        self._debounce.stop()
+        self._debounce.start()
+
+    def cancel_pending(self):
+        """Olvida cálculos en segundo plano pendientes (antes de un cálculo síncrono)."""
+        self._debounce.stop()
+        self.solver.cancel()
+
+    def _submit_compute(self):
+        self.solver.submit(self._solve_state, self._inputs())
+
+    def _poll_result(self):
+        st = self.solver.poll()
+        if st is not None:
+            self.update_scene(st, animate=st.animate)
+
     # Eventos UI
     def on_change_controls(self, _val):
         self.attacker['spring_x'] = float(self.s_power.val)
         self.attacker['theta_deg'] = float(self.s_angle.val)
-        st = self.compute()
-        self.update_scene(st)
+        self.schedule_compute()
 
     def on_click_place_attacker(self, event):
         if event.inaxes != self.ax:
@@ -178,25 +227,33 @@ class GameApp:
         # Colocar atacante donde haga clic (y no bajo el suelo)
         self.attacker['x0'] = float(event.xdata)
         self.attacker['y0'] = max(0.0, float(event.ydata))
-        st = self.compute()
-        self.update_scene(st)
+        self.schedule_compute()
 
     def on_defend(self, _):
         # Cálculo y animación. Si no hay intercepción, probamos ligeras ayudas.
-        st = self.compute()
+        self.cancel_pending()
+        st = self.compute(animate=True)
+        if st.impact is None and st.search is not None:
+            # el fallo puede ser sólo de los niveles gruesos: terminar la búsqueda antes de
+            # cambiar la configuración del jugador
+            self.cancel_pending()
+            st.search.finish()
+            st = self._solve_state(self._inputs())
         if st.impact is None:
             # Ayuda suave: subir potencia defensiva y mover base un poco hacia el atacante
             self.s_defx0.set_val(self.attacker['x0'] + 30.0)
-            st = self.compute(boost_defense=True)
+            st = self.compute(boost_defense=True, animate=True)
         self.update_scene(st, animate=True)
 
     def on_reset(self, _):
         self.load_mission(self.mission_index)
+        self.cancel_pending()
         self.update_scene(self.compute())
 
     def on_next_mission(self, _):
         self.mission_index = (self.mission_index + 1) % len(self.missions)
         self.load_mission(self.mission_index)
+        self.cancel_pending()
         self.update_scene(self.compute())
 
     def on_help(self, _):
@@ -208,7 +265,8 @@ class GameApp:
 
     def on_auto(self, _):
         # Ajuste automático del defensor para favorecer intercepción
-        st = self.compute(boost_defense=True)
+        self.cancel_pending()
+        st = self.compute(boost_defense=True, animate=True)
         self.update_scene(st, animate=True)
 
     # Lógica
@@ -221,7 +279,36 @@ class GameApp:
         # HUD
         self.hud_text.set_text(f"{m['name']}  |  💡 {m['hint']}")
 
-    def compute(self, boost_defense: bool = False) -> UIState:
+    def compute(self, boost_defense: bool = False, animate: bool = False) -> UIState:
+        """Cálculo síncrono dentro de self.budget.
+
+        Si la búsqueda no termina a tiempo se devuelve la mejor solución hallada y se sigue
+        refinando en el hilo de cálculo; si mejora, _poll_result redibuja (animando si
+        animate). Un cálculo posterior cancela ese refinamiento (se para en el siguiente
+        bloque, sin retrasar el nuevo cálculo).
+        """
+        inp = self._inputs(boost_defense)
+        st = self._solve_state(inp, self.budget)
+        if st.search is not None:
+            self.solver.submit(self._refine_state, st.search, inp, animate)
+        return st
+
+    def _inputs(self, boost_defense: bool = False) -> dict:
+        # Copia de las entradas tomada en el hilo de la interfaz (el cálculo puede ir en otro hilo)
+        return {**self.attacker, 'def_x0': float(self.s_defx0.val), 'boost_defense': boost_defense}
+
+    def _refine_state(self, search: AnytimeResult, inp: dict, animate: bool) -> Optional[UIState]:
+        # termina la búsqueda (queda memoizada) y sólo devuelve estado si la solución cambió;
+        # si llega otra petición se abandona entre bloques
+        res = search.finish(stop=self.solver.cancelled)
+        if not res.complete or res.solution == search.solution:
+            return None
+        st = self._solve_state(inp)
+        st.animate = animate
+        return st
+
+    def _solve_state(self, inp: dict, budget: Optional[float] = None) -> UIState:
+        boost_defense = inp['boost_defense']
         g = self.scen.globals.g
         dt_sim = self.scen.globals.dt_sim
         dtheta = deg2rad(self.scen.globals.dtheta_deg)
@@ -233,19 +320,17 @@ class GameApp:
         # Springs de atacante y defensor
         sp_a = self.scen.attacker.spring
         sp_d = self.scen.defender.spring
-        att_sp = type(sp_a)(k=sp_a.k, x=self.attacker['spring_x'], m=self.attacker['mass'])
+        att_sp = type(sp_a)(k=sp_a.k, x=inp['spring_x'], m=inp['mass'])
         def_x_val = sp_d.x if not boost_defense else min(1.0, sp_d.x * 1.15)
         def_sp = type(sp_d)(k=sp_d.k, x=def_x_val, m=sp_d.m)
-        theta_a = deg2rad(self.attacker['theta_deg'])
+        theta_a = deg2rad(inp['theta_deg'])
 
-        # Trayectoria atacante
         v0_a = Spring(k=att_sp.k, x=att_sp.x, m=att_sp.m).v0
-        traj_a = generate_trajectory(self.attacker['x0'], self.attacker['y0'], v0_a, theta_a, dt_sim, g)
 
         # Solver del defensor
         v0d_max = Spring(k=def_sp.k, x=def_sp.x, m=def_sp.m).v0_max
         params = InterceptParams(
-            xd0=float(self.s_defx0.val),
+            xd0=inp['def_x0'],
             yd0=self.scen.defender.y0,
             theta_min=theta_min,
             theta_max=theta_max,
@@ -257,28 +342,32 @@ class GameApp:
             eps=self.eps,
             g=g,
         )
-        sol = solve_intercept_enumeration((traj_a.t, traj_a.x, traj_a.y), params, v0d_max)
+        # Trayectoria atacante e intercepción (tabla si la cubre; si no, solver memoizado)
+        # (con budget, búsqueda anytime: la mejor hallada a tiempo, quizá sin terminar)
+        sol = None
+        search = None
+        if self.table is not None:
+            traj_a = self.memo.trajectory(inp['x0'], inp['y0'], v0_a, theta_a, dt_sim, g)
+            sol = self.table.lookup(inp['x0'], inp['y0'], inp['theta_deg'], v0_a, params, v0d_max)
+        if sol is None and budget is not None:
+            traj_a, res = self.memo.solve_anytime(inp['x0'], inp['y0'], v0_a, theta_a, params,
+                                                  v0d_max, budget)
+            sol = res.solution
+            search = None if res.complete else res
+        elif sol is None:
+            traj_a, sol = self.memo.solve(inp['x0'], inp['y0'], v0_a, theta_a, params, v0d_max)
 
         if not sol:
             title = 'Intenta ajustar Fuerza o Ángulo'
-            return UIState(traj_a.t, traj_a.x, traj_a.y, None, None, None, None, title)
+            return UIState(traj_a.t, traj_a.x, traj_a.y, None, None, None, None, title, search)
 
         # Trayectoria del defensor alineada con delay
-        tau = sol.impact_time - sol.delay
-        n = max(1, int(math.ceil(tau / dt_sim)))
-        t_d = [i * dt_sim for i in range(n + 1)]
-        x_d, y_d = [], []
-        for t in t_d:
-            xx, yy = position_at(t, params.xd0, params.yd0, sol.v0_d, sol.theta_d, g)
-            x_d.append(xx)
-            y_d.append(max(0.0, yy))
-        ndelay = int(math.ceil(sol.delay / dt_sim))
-        t_d_al = [i * dt_sim for i in range(ndelay + len(t_d))]
-        x_d_al = [params.xd0] * ndelay + x_d
-        y_d_al = [params.yd0] * ndelay + y_d
+        traj_d = defender_trajectory(params.xd0, params.yd0, sol.v0_d, sol.theta_d,
+                                     sol.delay, sol.impact_time, dt_sim, g)
 
         title = f"🎯 ¡Bien! Azul intercepta a Rojo"
-        return UIState(traj_a.t, traj_a.x, traj_a.y, t_d_al, x_d_al, y_d_al, sol.impact_point, title)
+        return UIState(traj_a.t, traj_a.x, traj_a.y, traj_d.t, traj_d.x, traj_d.y, sol.impact_point,
+                       title, search)
 
     def update_scene(self, st: UIState, animate: bool = False):
         # Curvas
@@ -327,7 +416,7 @@ class GameApp:
                     self.def_pt.set_data([def_x[i_def]], [def_y[i_def]])
                 return self.att_pt, self.def_pt
 
-            frames = max(len(att_x), len(def_x) if def_x else len(att_x))
+            frames = max(len(att_x), len(def_x) if def_x is not None else len(att_x))
             self.anim = FuncAnimation(self.fig, update, frames=frames, interval=25, blit=True)
 
         # Escala automática
@@ -341,5 +430,6 @@ class GameApp:
         plt.show()
 
 
-def run_game():
-    GameApp().run()
+def run_game(cache_size: int = 256, debounce_ms: int = 60, table: Optional['InterceptTable'] = None,
+             budget: Optional[float] = 0.03):
+    GameApp(cache_size=cache_size, debounce_ms=debounce_ms, table=table, budget=budget).run()
@@ -1,7 +1,10 @@
 """Lectura y validación de parámetros desde JSON para escenarios."""
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import json
+import math
 
 @dataclass
 class SpringSpec:
@@ -15,6 +18,7 @@ class BodySpec:
     theta_deg: float | None  # atacante debe traer theta; defensor None (se resuelve)
     x0: float
     y0: float
+    reload_time: float | None = None  # baterías: segundos entre disparos (None = un solo disparo)
 
 @dataclass
 class Globals:
@@ -33,6 +37,13 @@ class Scenario:
     attacker: BodySpec
     defender: BodySpec
     globals: Globals
+    defenders: List[BodySpec] = field(default_factory=list)  # baterías; por defecto [defender]
+
+    def __post_init__(self):
+        # copia: cambiar defender después no debe alterar la batería (ni al revés)
+        if not self.defenders:
+            d = self.defender
+            self.defenders = [replace(d, spring=replace(d.spring))]
 
 
 def load_scenario(data: Dict[str, Any]) -> Scenario:
@@ -41,7 +52,8 @@ def load_scenario(data: Dict[str, Any]) -> Scenario:
     def body(d: Dict[str, Any]) -> BodySpec:
         return BodySpec(spring=sp(d['spring']),
                         theta_deg=(float(d['theta_deg']) if d.get('theta_deg') is not None else None),
-                        x0=float(d['x0']), y0=float(d['y0']))
+                        x0=float(d['x0']), y0=float(d['y0']),
+                        reload_time=(float(d['reload_time']) if d.get('reload_time') is not None else None))
     g = data['globals']
     glob = Globals(g=float(g.get('g', 9.81)),
                    dt_sim=float(g.get('dt_sim', 0.01)),
@@ -52,6 +64,146 @@ def load_scenario(data: Dict[str, Any]) -> Scenario:
                    delay_min=float(g.get('delay_min', 0.0)),
                    delay_max=float(g.get('delay_max', 5.0)),
                    dt_delay=float(g.get('dt_delay', 0.1)))
+    # "defenders" (lista de baterías) es opcional; "defender" sigue siendo la principal
+    defenders = [body(d) for d in data.get('defenders') or []]
+    if 'defender' in data:
+        defender = body(data['defender'])
+    elif defenders:
+        defender = body(data['defenders'][0])
+    else:
+        raise ValueError("el escenario necesita 'defender' o una lista 'defenders' no vacía")
     return Scenario(attacker=body(data['attacker']),
-                    defender=body(data['defender']),
-                    globals=glob)
+                    defender=defender,
+                    globals=glob,
+                    defenders=defenders)
+
+
+def validate_scenario(scen: Scenario) -> None:
+    """Comprueba que los parámetros tienen sentido físico; ValueError con el primer problema."""
+    g = scen.globals
+    for name in ('g', 'dt_sim', 'dtheta_deg', 'dt_delay'):
+        v = getattr(g, name)
+        if not (math.isfinite(v) and v > 0):
+            raise ValueError(f"globals.{name} debe ser > 0 (es {v!r})")
+    for name in ('eps', 'theta_min_deg', 'theta_max_deg', 'delay_min', 'delay_max'):
+        if not math.isfinite(getattr(g, name)):
+            raise ValueError(f"globals.{name} no es finito")
+    if g.theta_min_deg > g.theta_max_deg:
+        raise ValueError("globals.theta_min_deg > theta_max_deg")
+    if g.delay_min > g.delay_max:
+        raise ValueError("globals.delay_min > delay_max")
+    bodies = [('attacker', scen.attacker), ('defender', scen.defender)]
+    bodies += [(f'defenders[{i}]', d) for i, d in enumerate(scen.defenders)]
+    for name, b in bodies:
+        _validate_body(name, b)
+
+
+def _validate_body(name: str, b: BodySpec) -> None:
+    sp = b.spring
+    if not (math.isfinite(sp.k) and sp.k > 0 and math.isfinite(sp.m) and sp.m > 0):
+        raise ValueError(f"{name}.spring: k y m deben ser > 0")
+    if not math.isfinite(sp.x):
+        raise ValueError(f"{name}.spring.x no es finito")
+    if not (math.isfinite(b.x0) and math.isfinite(b.y0)):
+        raise ValueError(f"{name}: x0/y0 no son finitos")
+    if b.theta_deg is not None and not math.isfinite(b.theta_deg):
+        raise ValueError(f"{name}.theta_deg no es finito")
+
+
+# Lectura en flujo de conjuntos grandes de escenarios ------------------------------------
+
+# Registro plano: sólo parámetros del atacante (como los casos de misiles.batch) sobre un
+# escenario base; se resuelve sin pasar por load_scenario ni revalidar el resto.
+FLAT_KEYS = frozenset(('id', 'x0', 'y0', 'theta_deg', 'spring_x', 'mass'))
+
+
+@dataclass
+class ScenarioRecord:
+    source: str                   # fichero de origen
+    line: int                     # línea (1 = primera) dentro del fichero
+    scenario: Optional[Scenario]  # None si el registro no es válido
+    error: str = ''
+    id: Any = None                # campo 'id' del registro, si lo trae
+
+    @property
+    def ok(self) -> bool:
+        return self.scenario is not None
+
+
+def _flat_scenario(base: Scenario, rec: Dict[str, Any]) -> Scenario:
+    a = base.attacker
+    sp = a.spring
+    spring = SpringSpec(k=sp.k, x=float(rec.get('spring_x', sp.x)), m=float(rec.get('mass', sp.m)))
+    theta = rec.get('theta_deg', a.theta_deg)
+    attacker = BodySpec(spring=spring, theta_deg=(float(theta) if theta is not None else None),
+                        x0=float(rec.get('x0', a.x0)), y0=float(rec.get('y0', a.y0)),
+                        reload_time=a.reload_time)
+    _validate_body('attacker', attacker)
+    # defensor(es) y globales se comparten con el escenario base (no modificarlos)
+    return Scenario(attacker=attacker, defender=base.defender, globals=base.globals,
+                    defenders=base.defenders)
+
+
+def parse_scenario_lines(lines: Iterable[str | bytes], source: str = '<stream>',
+                         base: Optional[Scenario] = None) -> Iterator[ScenarioRecord]:
+    """Un ScenarioRecord por línea JSON no vacía; los errores no interrumpen la lectura.
+
+    Cada línea es un escenario completo (formato de load_scenario) o, si se da `base`, un
+    registro plano con claves de FLAT_KEYS que modifica el atacante de `base`. Las líneas
+    en bytes se decodifican como UTF-8 una a una: un byte inválido sólo invalida su línea.
+    """
+    for n, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        rec_id = None
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            rec = json.loads(line)
+            if not isinstance(rec, dict):
+                raise ValueError("el registro no es un objeto JSON")
+            rec_id = rec.get('id')
+            if base is not None and rec.keys() <= FLAT_KEYS:
+                scen = _flat_scenario(base, rec)
+            else:
+                scen = load_scenario(rec)
+                validate_scenario(scen)
+        except (ValueError, KeyError, TypeError, AttributeError, IndexError) as e:
+            msg = f"falta la clave {e}" if isinstance(e, KeyError) else str(e)
+            yield ScenarioRecord(source, n, None, msg, rec_id)
+            continue
+        yield ScenarioRecord(source, n, scen, '', rec_id)
+
+
+def iter_scenario_records(path: str | Path, base: Optional[Scenario] = None) -> Iterator[ScenarioRecord]:
+    """Recorre perezosamente un .jsonl, un .json (un escenario) o un directorio con ellos.
+
+    Los ficheros de un directorio se leen en orden alfabético; los .jsonl línea a línea,
+    sin cargarlos enteros en memoria. Se leen en binario y cada línea se decodifica en
+    parse_scenario_lines, así que un error de codificación se informa en su línea.
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.suffix.lower() in ('.jsonl', '.json'))
+    else:
+        files = [path]
+    for p in files:
+        try:
+            with open(p, 'rb') as f:
+                if p.suffix.lower() == '.json':
+                    # un escenario por fichero (como scenarios/baseline.json)
+                    yield from parse_scenario_lines([f.read().replace(b'\n', b' ')], str(p), base)
+                else:
+                    yield from parse_scenario_lines(f, str(p), base)
+        except OSError as e:
+            yield ScenarioRecord(str(p), 0, None, str(e))
+
+
+def iter_scenarios(path: str | Path, base: Optional[Scenario] = None,
+                   on_error: Optional[Callable[[ScenarioRecord], None]] = None) -> Iterator[Scenario]:
+    """Como iter_scenario_records pero sólo los escenarios válidos; on_error recibe los fallidos."""
+    for rec in iter_scenario_records(path, base):
+        if rec.scenario is not None:
+            yield rec.scenario
+        elif on_error is not None:
+            on_error(rec)
@@ -0,0 +1,49 @@
+"""Reproducción por tiempo de simulación: frames a fps fijos y posiciones interpoladas.
+
+Cada frame corresponde a un instante t de la simulación (speed segundos simulados por
+segundo real), así que la animación dura lo mismo sea cual sea dt_sim, sólo se dibujan
+los frames que se ven, y atacante y defensor se colocan en el mismo t.
+"""
+from __future__ import annotations
+import math
+
+import numpy as np
+
+DEFAULT_FPS = 50.0
+
+
+def frame_times(t_end: float, fps: float = DEFAULT_FPS, speed: float = 1.0) -> np.ndarray:
+    """Instantes de simulación de los frames: uno cada speed / fps s de 0 a t_end (incluido)."""
+    if fps <= 0:
+        raise ValueError("fps debe ser > 0")
+    if speed <= 0:
+        raise ValueError("speed debe ser > 0")
+    step = speed / fps
+    n = int(math.floor(max(t_end, 0.0) / step + 1e-9)) + 1
+    times = np.arange(n, dtype=np.float64) * step
+    if times[-1] < t_end:
+        times = np.append(times, t_end)
+    return times
+
+
+def frame_interval(fps: float = DEFAULT_FPS) -> float:
+    """Milisegundos entre frames (interval de FuncAnimation)."""
+    return 1000.0 / fps
+
+
+def sample(t: np.ndarray, v: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Valor de v en los instantes times (lineal; fuera de rango se mantiene el extremo)."""
+    if t.size == 0:
+        return np.full(times.shape, np.nan)
+    return np.interp(times, t, v)
+
+
+def sample_index(t: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Última muestra con t <= times (trayectoria ya recorrida en cada frame)."""
+    return np.clip(np.searchsorted(t, times, side='right') - 1, 0, max(t.size - 1, 0))
+
+
+def end_time(*trajs) -> float:
+    """Instante final común de las trayectorias dadas (None se ignora)."""
+    ends = [float(tr.t[-1]) for tr in trajs if tr is not None and len(tr.t)]
+    return max(ends, default=0.0)
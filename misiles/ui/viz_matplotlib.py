@@ -5,9 +5,12 @@ from typing import List, Tuple, Optional
 import math
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.animation import FuncAnimation
 import matplotlib
 
+from .playback import DEFAULT_FPS, end_time, frame_interval, frame_times, sample
+
 @dataclass
 class TrajData:
     t: List[float]
@@ -20,7 +23,13 @@ def plot_and_animate(attacker: TrajData, defender: Optional[TrajData],
                      title: str = "Intercepción 2D",
                      show: bool = True,
                      save_path: Optional[str] = None,
-                     animate: bool = True):
+                     animate: bool = True,
+                     fps: float = DEFAULT_FPS,
+                     speed: float = 1.0):
+    """Trayectorias completas y, opcionalmente, ambos misiles animados en el mismo instante t.
+
+    Cada frame avanza speed / fps segundos de simulación (ver playback).
+    """
     fig, ax = plt.subplots(figsize=(8, 5))
     ax.set_xlabel('x [m]')
     ax.set_ylabel('y [m]')
@@ -35,6 +44,14 @@ def plot_and_animate(attacker: TrajData, defender: Optional[TrajData],
 
     # animación opcional
     if animate:
+        times = frame_times(end_time(attacker, defender), fps, speed)
+        att_t = np.asarray(attacker.t, dtype=float)
+        att_x = sample(att_t, np.asarray(attacker.x, dtype=float), times)
+        att_y = sample(att_t, np.asarray(attacker.y, dtype=float), times)
+        if defender is not None:
+            def_t = np.asarray(defender.t, dtype=float)
+            def_x = sample(def_t, np.asarray(defender.x, dtype=float), times)
+            def_y = sample(def_t, np.asarray(defender.y, dtype=float), times)
         att_line, = ax.plot([], [], 'o', color='tab:blue')
         if defender is not None:
             def_line, = ax.plot([], [], 'o', color='tab:orange')
@@ -48,15 +65,13 @@ def plot_and_animate(attacker: TrajData, defender: Optional[TrajData],
             return (att_line,) if not def_line else (att_line, def_line)
 
         def update(frame):
-            i_att = min(frame, len(attacker.t) - 1)
-            att_line.set_data(attacker.x[i_att], attacker.y[i_att])
+            att_line.set_data([att_x[frame]], [att_y[frame]])
             if defender is not None and def_line is not None:
-                i_def = min(frame, len(defender.t) - 1)
-                def_line.set_data(defender.x[i_def], defender.y[i_def])
+                def_line.set_data([def_x[frame]], [def_y[frame]])
             return (att_line,) if not def_line else (att_line, def_line)
 
-        frames = max(len(attacker.t), len(defender.t) if defender else len(attacker.t))
-        _ani = FuncAnimation(fig, update, frames=frames, init_func=init, interval=20, blit=True)
+        _ani = FuncAnimation(fig, update, frames=times.size, init_func=init,
+                             interval=frame_interval(fps), blit=True)
 
     ax.legend()
     fig.suptitle(title)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
-import math
+from typing import Callable, List, Optional, Tuple
 
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.animation import FuncAnimation
+from matplotlib.figure import Figure
 from matplotlib.patches import Circle, Polygon, Rectangle
 
+from .playback import DEFAULT_FPS, end_time, frame_interval, frame_times, sample, sample_index
+
 @dataclass
 class TrajData:
     t: List[float]
@@ -15,39 +18,137 @@ class TrajData:
     y: List[float]
 
 
-def _heading(x: List[float], y: List[float], i: int) -> float:
-    # ángulo de la velocidad (rad). Usa diferencias finitas.
-    j0 = max(0, i - 1)
-    j1 = min(len(x) - 1, i + 1)
-    dx = x[j1] - x[j0]
-    dy = y[j1] - y[j0]
-    if dx == 0 and dy == 0:
-        return 0.0
-    return math.atan2(dy, dx)
+def _headings(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Ángulo de la velocidad (rad) en cada muestra, por diferencias finitas centradas."""
+    n = x.size
+    idx = np.arange(n)
+    j0 = np.maximum(idx - 1, 0)
+    j1 = np.minimum(idx + 1, n - 1)
+    return np.arctan2(y[j1] - y[j0], x[j1] - x[j0])
 
 
-def animate_rich(attacker: TrajData, defender: Optional[TrajData],
-                 impact: Optional[Tuple[float, float]] = None,
-                 title: str = "Intercepción 2D",
-                 show: bool = True,
-                 save_path: Optional[str] = None,
-                 animate: bool = True):
+def _flames(x: np.ndarray, y: np.ndarray, heading: np.ndarray, size: float) -> np.ndarray:
+    """Vértices (n, 3, 2) de la llama (triángulo detrás del cuerpo) en cada posición."""
+    ux, uy = np.cos(heading), np.sin(heading)
+    L = 4.0 * size
+    W = 2.0 * size
+    back_x = x - ux * 1.2 * L
+    back_y = y - uy * 1.2 * L
+    out = np.empty((x.size, 3, 2))
+    out[:, 0, 0] = back_x - uy * W
+    out[:, 0, 1] = back_y + ux * W
+    out[:, 1, 0] = back_x + uy * W
+    out[:, 1, 1] = back_y - ux * W
+    out[:, 2, 0] = x - ux * 0.6 * L
+    out[:, 2, 1] = y - uy * 0.6 * L
+    return out
+
+
+def _track(t: np.ndarray, x: np.ndarray, y: np.ndarray, times: np.ndarray, size: float):
+    """Por frame: última muestra recorrida, posición interpolada en t y vértices de la llama."""
+    bx, by = sample(t, x, times), sample(t, y, times)
+    heading = sample(t, np.unwrap(_headings(x, y)), times)
+    return sample_index(t, times), bx, by, _flames(bx, by, heading, size)
+
+
+# muestras por tramo de trayectoria: sólo el tramo en curso cambia en cada frame
+_PATH_CHUNK = 256
+
+
+class _GrowingPath:
+    """Trayectoria que crece por tramos de Line2D persistentes.
+
+    Los tramos completos conservan su Path ya calculado; cada frame sólo actualiza
+    el tramo en curso, así que el coste no crece con la longitud recorrida.
+    """
+
+    def __init__(self, ax, x: np.ndarray, y: np.ndarray, **style):
+        self.x, self.y = x, y
+        n_chunks = max(1, -(-(x.size - 1) // _PATH_CHUNK))
+        self.lines = []
+        for c in range(n_chunks):
+            line, = ax.plot([], [], **(style if c == 0 else {k: v for k, v in style.items() if k != 'label'}))
+            self.lines.append(line)
+        self.upto = -1
+
+    def set_index(self, i: int) -> None:
+        i = min(i, self.x.size - 1)
+        if i == self.upto:
+            return
+        # sólo cambian los tramos entre el índice anterior y el nuevo
+        lo, hi = sorted((max(self.upto, 0), i))
+        for c in range(lo // _PATH_CHUNK, min(hi // _PATH_CHUNK, len(self.lines) - 1) + 1):
+            # cada tramo comparte su primer punto con el final del anterior
+            a = c * _PATH_CHUNK
+            b = min(i, (c + 1) * _PATH_CHUNK) + 1
+            if b > a:
+                self.lines[c].set_data(self.x[a:b], self.y[a:b])
+            else:
+                self.lines[c].set_data([], [])
+        self.upto = i
+
+
+@dataclass
+class RichScene:
+    """Figura montada con su actualización por frame y el dibujo estático completo.
+
+    update(i) devuelve los artistas animados (persistentes) para el blitting; el
+    frame i muestra el instante de simulación times[i] y dura interval ms.
+    """
+    fig: Figure
+    update: Callable[[int], list]
+    frames: int
+    draw_static: Callable[[], None]
+    init: Callable[[], list]
+    artists: list
+    times: np.ndarray
+    interval: float
+    _background: object = None
+
+    def blit_frame(self, i: int) -> None:
+        """Dibuja el frame i como FuncAnimation(blit=True): fondo fijo y sólo los artistas."""
+        canvas = self.fig.canvas
+        ax = self.artists[0].axes
+        if self._background is None:
+            for a in self.artists:
+                a.set_animated(True)
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(ax.bbox)
+        canvas.restore_region(self._background)
+        for a in self.update(i):
+            ax.draw_artist(a)
+        canvas.blit(ax.bbox)
+
+
+def prepare_animation(attacker: TrajData, defender: Optional[TrajData],
+                      impact: Optional[Tuple[float, float]] = None,
+                      title: str = "Intercepción 2D",
+                      fps: float = DEFAULT_FPS, speed: float = 1.0) -> RichScene:
+    """Monta la escena; los frames avanzan speed / fps segundos de simulación."""
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.set_xlabel('x [m]')
     ax.set_ylabel('y [m]')
     ax.grid(False)
     ax.set_aspect('equal', adjustable='box')
 
+    # arrays una sola vez: los frames sólo indexan
+    att_t = np.asarray(attacker.t, dtype=float)
+    att_x = np.asarray(attacker.x, dtype=float)
+    att_y = np.asarray(attacker.y, dtype=float)
+    def_t = np.asarray(defender.t, dtype=float) if defender is not None else None
+    def_x = np.asarray(defender.x, dtype=float) if defender is not None else None
+    def_y = np.asarray(defender.y, dtype=float) if defender is not None else None
+
     # Fondo: cielo y suelo
     # Extensión aproximada en base a datos
-    x_all = attacker.x + (defender.x if defender else [])
-    y_all = attacker.y + (defender.y if defender else [])
-    if not x_all:
-        x_all = [0, 1]
-    if not y_all:
-        y_all = [0, 1]
-    xmin, xmax = min(x_all), max(x_all)
-    ymin, ymax = min(0.0, min(y_all)), max(y_all + [0.0])
+    x_all = np.concatenate([att_x] + ([def_x] if defender else []))
+    y_all = np.concatenate([att_y] + ([def_y] if defender else []))
+    if x_all.size == 0:
+        x_all = np.array([0.0, 1.0])
+    if y_all.size == 0:
+        y_all = np.array([0.0, 1.0])
+    xmin, xmax = float(x_all.min()), float(x_all.max())
+    ymin, ymax = min(0.0, float(y_all.min())), max(float(y_all.max()), 0.0)
     dx = xmax - xmin or 1.0
     dy = ymax - ymin or 1.0
     pad_x = 0.05 * dx
@@ -60,21 +161,28 @@ def animate_rich(attacker: TrajData, defender: Optional[TrajData],
     ax.add_patch(ground)
 
     # Trayectorias “completadas hasta frame”
-    att_path, = ax.plot([], [], color='tab:blue', linewidth=2.0, alpha=0.9, label='Atacante')
+    att_path = _GrowingPath(ax, att_x, att_y, color='tab:blue', linewidth=2.0, alpha=0.9, label='Atacante')
     def_path = None
     if defender is not None:
-        def_path, = ax.plot([], [], color='tab:orange', linewidth=2.0, alpha=0.9, linestyle='--', label='Defensor')
+        def_path = _GrowingPath(ax, def_x, def_y, color='tab:orange', linewidth=2.0, alpha=0.9,
+                                linestyle='--', label='Defensor')
 
-    # Misiles: cuerpo (círculo) + llama (triángulo)
-    att_body = Circle((0, 0), radius=0.8*max(dx, dy)/100.0, color='#1f77b4', zorder=5)
+    # Misiles: cuerpo (círculo) + llama (triángulo), precalculados para cada frame en el
+    # mismo instante de simulación (interpolando), no por índice de muestra
+    times = frame_times(end_time(attacker, defender), fps, speed)
+    size = max(dx, dy) / 100.0
+    att_idx, att_bx, att_by, att_flames = _track(att_t, att_x, att_y, times, size)
+    att_body = Circle((0, 0), radius=0.8*size, color='#1f77b4', zorder=5)
     ax.add_patch(att_body)
     att_flame = Polygon([[0,0]], closed=True, color='#f39c12', alpha=0.8, zorder=4)
     ax.add_patch(att_flame)
 
     def_body = None
     def_flame = None
+    def_flames = None
     if defender is not None:
-        def_body = Circle((0, 0), radius=0.8*max(dx, dy)/100.0, color='#e67e22', zorder=5)
+        def_idx, def_bx, def_by, def_flames = _track(def_t, def_x, def_y, times, size)
+        def_body = Circle((0, 0), radius=0.8*size, color='#e67e22', zorder=5)
         def_flame = Polygon([[0,0]], closed=True, color='#f1c40f', alpha=0.8, zorder=4)
         ax.add_patch(def_body)
         ax.add_patch(def_flame)
@@ -82,12 +190,12 @@ def animate_rich(attacker: TrajData, defender: Optional[TrajData],
     # Intersección: explosión (círculo expansivo)
     explosion = None
     exp_frame = None
+    marker = None
     if impact is not None:
-        # localizar frame más cercano del atacante al punto de impacto
-        import numpy as np
-        ax.scatter([impact[0]], [impact[1]], s=30, color='red', zorder=6)  # marcador pequeño permanente
-        dists = np.hypot(np.array(attacker.x) - impact[0], np.array(attacker.y) - impact[1])
-        exp_frame = int(np.argmin(dists))
+        # localizar el instante del atacante más cercano al punto de impacto y su frame
+        marker = ax.scatter([impact[0]], [impact[1]], s=30, color='red', zorder=6)  # marcador pequeño permanente
+        dists = np.hypot(att_x - impact[0], att_y - impact[1])
+        exp_frame = int(np.searchsorted(times, att_t[int(np.argmin(dists))] - 1e-9))
         explosion = Circle((impact[0], impact[1]), radius=0.1, fill=False,
                            edgecolor='#f1c40f', linewidth=3, alpha=0.0, zorder=6)
         ax.add_patch(explosion)
@@ -97,80 +205,105 @@ def animate_rich(attacker: TrajData, defender: Optional[TrajData],
     fig.suptitle(title)
     plt.tight_layout()
 
-    if not animate:
+    artists = att_path.lines + [att_flame, att_body]
+    if def_path is not None:
+        artists += def_path.lines + [def_flame, def_body]
+    if explosion is not None:
+        # el marcador queda por encima de los misiles: se redibuja con ellos
+        artists += [marker, explosion]
+    # orden de dibujo del blitting = orden por zorder del dibujo completo
+    artists.sort(key=lambda a: a.get_zorder())
+
+    def draw_static():
         # Dibujo estático (trayectoria completa)
-        att_path.set_data(attacker.x, attacker.y)
-        if defender is not None and def_path is not None:
-            def_path.set_data(defender.x, defender.y)
-        if save_path:
-            fig.savefig(save_path, dpi=140)
-        if show and not matplotlib.get_backend().lower().startswith('agg'):
-            plt.show()
-        else:
-            plt.close(fig)
-        return
+        att_path.set_index(att_x.size - 1)
+        if def_path is not None:
+            def_path.set_index(def_x.size - 1)
 
-    frames = max(len(attacker.t), len(defender.t) if defender else len(attacker.t))
-
-    def missile_shape(xc: float, yc: float, heading: float, scale: float = 1.0):
-        # llama como triángulo detrás del cuerpo
-        L = 4.0 * scale * max(dx, dy)/100.0
-        W = 2.0 * scale * max(dx, dy)/100.0
-        # vector dirección
-        ux = math.cos(heading)
-        uy = math.sin(heading)
-        # punto detrás del cuerpo
-        back_x = xc - ux * 1.2 * L
-        back_y = yc - uy * 1.2 * L
-        left_x = back_x + (-uy) * W
-        left_y = back_y + (ux) * W
-        right_x = back_x - (-uy) * W
-        right_y = back_y - (ux) * W
-        tip_x = xc - ux * 0.6 * L
-        tip_y = yc - uy * 0.6 * L
-        return [(left_x, left_y), (right_x, right_y), (tip_x, tip_y)]
+    frames = times.size
+    # explosión: crecer y desvanecer durante ~0.8 s de reproducción
+    span = max(1, round(0.8 * fps))
 
     def update(i: int):
-        i_att = min(i, len(attacker.x) - 1)
-        att_path.set_data(attacker.x[:i_att+1], attacker.y[:i_att+1])
-        ha = _heading(attacker.x, attacker.y, i_att)
-        att_body.center = (attacker.x[i_att], attacker.y[i_att])
-        att_flame.set_xy(missile_shape(attacker.x[i_att], attacker.y[i_att], ha, 1.0))
-
-        if defender is not None and def_path is not None:
-            i_def = min(i, len(defender.x) - 1)
-            def_path.set_data(defender.x[:i_def+1], defender.y[:i_def+1])
-            if def_body is not None and def_flame is not None and i_def >= 0:
-                hd = _heading(defender.x, defender.y, i_def)
-                def_body.center = (defender.x[i_def], defender.y[i_def])
-                def_flame.set_xy(missile_shape(defender.x[i_def], defender.y[i_def], hd, 1.0))
-
-        # explosión: crecer y desvanecer durante ~40 frames
+        if att_x.size:
+            att_path.set_index(int(att_idx[i]))
+            att_body.center = (att_bx[i], att_by[i])
+            att_flame.set_xy(att_flames[i])
+
+        if def_path is not None and def_x.size:
+            def_path.set_index(int(def_idx[i]))
+            def_body.center = (def_bx[i], def_by[i])
+            def_flame.set_xy(def_flames[i])
+
         if explosion is not None and exp_frame is not None:
-            span = 40
             k = i - exp_frame
             if 0 <= k < span:
                 r = (k + 1) / span * (0.06 * (dx + dy))
                 explosion.set_alpha(max(0.0, 1.0 - k/span))
                 explosion.set_radius(r)
-            elif k >= span:
+            else:
                 explosion.set_alpha(0.0)
 
-        return []
+        return artists
+
+    def init():
+        return update(0)
+
+    return RichScene(fig=fig, update=update, frames=frames, draw_static=draw_static,
+                     init=init, artists=artists, times=times, interval=frame_interval(fps))
+
+
+def _save_still(scene: RichScene, path: str) -> None:
+    # los artistas animados no salen en savefig: imagen completa sin blitting
+    animated = [a.get_animated() for a in scene.artists]
+    scene.draw_static()
+    for a in scene.artists:
+        a.set_animated(False)
+    scene.fig.savefig(path, dpi=140)
+    for a, flag in zip(scene.artists, animated):
+        a.set_animated(flag)
+
+
+def animate_rich(attacker: TrajData, defender: Optional[TrajData],
+                 impact: Optional[Tuple[float, float]] = None,
+                 title: str = "Intercepción 2D",
+                 show: bool = True,
+                 save_path: Optional[str] = None,
+                 animate: bool = True,
+                 fps: float = DEFAULT_FPS,
+                 speed: float = 1.0):
+    """Anima en tiempo de simulación: fps frames por segundo, speed x tiempo real."""
+    scene = prepare_animation(attacker, defender, impact, title, fps, speed)
+    fig = scene.fig
+
+    if not animate:
+        scene.draw_static()
+        if save_path:
+            fig.savefig(save_path, dpi=140)
+        if show and not matplotlib.get_backend().lower().startswith('agg'):
+            plt.show()
+        else:
+            plt.close(fig)
+        return
 
-    ani = FuncAnimation(fig, update, frames=frames, interval=20, blit=False)
+    ani = FuncAnimation(fig, scene.update, frames=scene.frames, init_func=scene.init,
+                        interval=scene.interval, blit=True)
 
     non_interactive = matplotlib.get_backend().lower().startswith('agg')
     if save_path is not None:
-        # Intentar guardar como PNG si extensión es .png, o como mp4 si .mp4 y hay writer
+        # Intentar guardar como PNG si extensión es .png, como mp4 si .mp4 y hay writer, o GIF/APNG
         try:
             if save_path.lower().endswith('.mp4'):
-                ani.save(save_path, writer='ffmpeg', fps=50)
+                ani.save(save_path, writer='ffmpeg', fps=fps)
+            elif save_path.lower().endswith(('.gif', '.apng')):
+                # sin binarios externos (ver misiles.ui.export)
+                from .export import export_animation
+                export_animation(attacker, defender, save_path, impact, title, fps=fps, speed=speed)
             else:
-                fig.savefig(save_path, dpi=140)
+                _save_still(scene, save_path)
         except Exception:
             # Fallback silencioso
-            fig.savefig(save_path if save_path.lower().endswith('.png') else save_path + '.png', dpi=140)
+            _save_still(scene, save_path if save_path.lower().endswith('.png') else save_path + '.png')
     if show and not non_interactive:
         plt.show()
     else:
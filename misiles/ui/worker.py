@@ -0,0 +1,93 @@
+"""Cálculo en segundo plano para la interfaz: un hilo que atiende sólo la petición más reciente."""
+from __future__ import annotations
+from typing import Any, Callable, Optional, Tuple
+import threading
+
+
+class BackgroundSolver:
+    """Ejecuta trabajos en un hilo aparte, coalesciendo y descartando los obsoletos.
+
+    Cada submit() invalida lo anterior: si aún no había empezado se sustituye, y si ya
+    estaba en marcha su resultado se descarta al terminar. Un trabajo en marcha no se
+    interrumpe: sigue ocupando el hilo hasta acabar, salvo que consulte cancelled() y
+    salga antes por su cuenta. poll(), llamado desde el hilo de la interfaz, entrega sólo
+    el resultado de la última petición.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._job: Optional[Tuple[int, Callable[..., Any], tuple]] = None
+        self._result: Optional[Tuple[int, Any, Optional[BaseException]]] = None
+        self._running = 0  # generación del trabajo en curso (0 = ninguno)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='misiles-solver', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> int:
+        with self._cond:
+            self._generation += 1
+            self._job = (self._generation, fn, args)
+            self._result = None
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Descarta la petición pendiente y cualquier resultado aún no entregado."""
+        with self._cond:
+            self._generation += 1
+            self._job = None
+            self._result = None
+
+    def cancelled(self) -> bool:
+        """True si el trabajo en curso ya es obsoleto (hay otra petición, cancel o close).
+
+        Pensado para consultarse desde el propio trabajo, entre pasos, y abandonar antes.
+        """
+        with self._cond:
+            return self._closed or self._running != self._generation
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._job is not None
+
+    def poll(self) -> Optional[Any]:
+        """Resultado de la última petición si ya está listo (y vigente); si no, None."""
+        with self._cond:
+            res = self._result
+            self._result = None
+        if res is None:
+            return None
+        _, value, exc = res
+        if exc is not None:
+            raise exc
+        return value
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._job = None
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._job is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                gen, fn, args = self._job
+                self._running = gen
+            value, exc = None, None
+            try:
+                value = fn(*args)
+            except Exception as e:  # se re-lanza en poll() desde el hilo de la interfaz
+                exc = e
+            with self._cond:
+                self._running = 0
+                if self._job is not None and self._job[0] == gen:
+                    self._job = None
+                if gen == self._generation:
+                    self._result = (gen, value, exc)